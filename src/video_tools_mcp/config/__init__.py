@@ -1,6 +1,7 @@
 """Configuration management for video tools."""
 
 from .models import (
+    QWEN_VL_MODEL_ID,
     ParakeetConfig,
     PyannoteConfig,
     QwenVLConfig,
@@ -24,6 +25,7 @@ from .prompts import (
 
 __all__ = [
     # Configuration models
+    "QWEN_VL_MODEL_ID",
     "ParakeetConfig",
     "PyannoteConfig",
     "QwenVLConfig",
@@ -5,14 +5,45 @@ This module defines all configuration classes for the different models
 and processing settings used in the video tools MCP server.
 """
 
+import functools
 import os
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+# Model loaded by QwenVLModel (models/qwen_vl.py); kept here so callers can
+# refer to it without importing mlx-vlm
+QWEN_VL_MODEL_ID = "lmstudio-community/Qwen3-VL-8B-Instruct-MLX-8bit"
 
-class ParakeetConfig(BaseModel):
+
+@functools.lru_cache(maxsize=1)
+def _home() -> str:
+    """Home directory, resolved once (Path.home() may fall back to a pwd lookup)."""
+    return str(Path.home())
+
+
+@functools.lru_cache(maxsize=64)
+def _expand_path(path: str) -> str:
+    """Expand ~ in a path; configs repeat the same few paths, so results are cached."""
+    if path == "~" or path.startswith("~/"):
+        path = _home() + path[1:]
+    # Still expands ~user forms; a no-op for everything else
+    return str(Path(path).expanduser())
+
+
+class _ConfigModel(BaseModel):
+    """
+    Base for all config models.
+
+    Validator schemas are built on first use rather than at import, so
+    importing this module (e.g. via the server or test collection) stays cheap.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class ParakeetConfig(_ConfigModel):
     """Configuration for Parakeet MLX transcription model."""
 
     model_id: str = Field(
@@ -41,7 +72,7 @@ class ParakeetConfig(BaseModel):
         return v
 
 
-class PyannoteConfig(BaseModel):
+class PyannoteConfig(_ConfigModel):
     """Configuration for Pyannote speaker diarization model."""
 
     model_id: str = Field(
@@ -70,7 +101,7 @@ class PyannoteConfig(BaseModel):
         return v
 
 
-class QwenVLConfig(BaseModel):
+class QwenVLConfig(_ConfigModel):
     """Configuration for Qwen VL vision-language model."""
 
     model_id: str = Field(
@@ -115,7 +146,7 @@ class QwenVLConfig(BaseModel):
         return v
 
 
-class ProcessingConfig(BaseModel):
+class ProcessingConfig(_ConfigModel):
     """Configuration for general processing settings."""
 
     keep_temp_files: bool = Field(
@@ -137,10 +168,10 @@ class ProcessingConfig(BaseModel):
         """Expand ~ in paths to home directory."""
         if v is None:
             return v
-        return str(Path(v).expanduser())
+        return _expand_path(v)
 
 
-class ScreenshotConfig(BaseModel):
+class ScreenshotConfig(_ConfigModel):
     """Configuration for screenshot extraction."""
 
     default_interval: int = Field(
@@ -181,7 +212,7 @@ class ScreenshotConfig(BaseModel):
         return v
 
 
-class TranscriptionConfig(BaseModel):
+class TranscriptionConfig(_ConfigModel):
     """Configuration for transcription output."""
 
     default_format: str = Field(
@@ -199,7 +230,7 @@ class TranscriptionConfig(BaseModel):
         return v.lower()
 
 
-class VideoToolsConfig(BaseModel):
+class VideoToolsConfig(_ConfigModel):
     """Main configuration class that combines all settings."""
 
     parakeet: ParakeetConfig = Field(default_factory=ParakeetConfig)
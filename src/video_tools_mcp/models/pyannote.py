@@ -3,6 +3,7 @@
 import gc
 import logging
 import os
+import numpy as np
 import torch
 from typing import Dict, Any, Optional
 from video_tools_mcp.models.model_manager import ModelManager
@@ -10,6 +11,163 @@ from video_tools_mcp.config import load_config
 
 logger = logging.getLogger(__name__)
 
+# Accepted values for PyannoteModel.diarize(embedding_precision=...)
+EMBEDDING_PRECISIONS = ("fp16", "fp32")
+
+# Accepted values for PyannoteModel.diarize(clustering=...)
+CLUSTERING_METHODS = ("agglomerative", "spectral")
+
+# Sample rate the diarization pipeline works at (mono)
+PIPELINE_SAMPLE_RATE = 16000
+
+# Accepted values for PyannoteModel.diarize(embedding_backend=...)
+EMBEDDING_BACKENDS = ("torch", "onnx")
+
+# ONNX Runtime execution providers to try per device type, best first
+ONNX_PROVIDERS = {
+    "cuda": ["CUDAExecutionProvider", "CPUExecutionProvider"],
+    "mps": ["CoreMLExecutionProvider", "CPUExecutionProvider"],
+    "cpu": ["OpenVINOExecutionProvider", "CPUExecutionProvider"],
+}
+
+
+class _Float16Embedding:
+    """
+    Run a pyannote speaker-embedding model under float16 autocast.
+
+    Wraps the pipeline's embedding callable for the duration of a diarize()
+    call. Embeddings are returned as float32 so clustering is unaffected.
+    """
+
+    def __init__(self, embedding, device_type: str):
+        self._embedding = embedding
+        self._device_type = device_type
+
+    def __call__(self, *args, **kwargs):
+        with torch.autocast(device_type=self._device_type, dtype=torch.float16):
+            embeddings = self._embedding(*args, **kwargs)
+        return embeddings.astype("float32") if hasattr(embeddings, "astype") else embeddings.float()
+
+    def __getattr__(self, name):
+        return getattr(self._embedding, name)
+
+
+class _OnnxEmbedding:
+    """
+    Run a pyannote speaker-embedding model through ONNX Runtime.
+
+    Takes the place of the pipeline's embedding callable; the session is
+    built once per model load by PyannoteModel._get_onnx_session().
+    """
+
+    def __init__(self, embedding, session):
+        self._embedding = embedding
+        self._session = session
+
+    def __call__(self, waveforms, masks=None):
+        if masks is None:
+            return self._embedding(waveforms)
+
+        (embeddings,) = self._session.run(None, {
+            "waveforms": waveforms.cpu().numpy().astype(np.float32, copy=False),
+            "weights": masks.cpu().numpy().astype(np.float32, copy=False),
+        })
+        return embeddings
+
+    def __getattr__(self, name):
+        return getattr(self._embedding, name)
+
+
+class _FrameCachedEmbedding:
+    """
+    Run the embedding backbone once per chunk instead of once per speaker.
+
+    Pyannote embeds every local speaker of a segmentation chunk separately,
+    so each chunk waveform arrives once per speaker, in consecutive rows of a
+    batch (sometimes split across batches). Backbone frames are computed
+    once per distinct waveform and only the mask-weighted pooling runs per
+    speaker. The last chunk's frames are kept for the next batch.
+
+    Requires a model split into forward_frames() and forward_embedding(),
+    as pyannote's WeSpeaker ResNet is.
+    """
+
+    def __init__(self, embedding):
+        self._embedding = embedding
+        self._cached_waveform = None
+        self._cached_frames = None
+
+    @staticmethod
+    def supports(embedding) -> bool:
+        model = getattr(embedding, "model_", None)
+        return hasattr(model, "forward_frames") and hasattr(model, "forward_embedding")
+
+    def __call__(self, waveforms, masks=None):
+        if masks is None:
+            return self._embedding(waveforms)
+
+        model = self._embedding.model_
+        device = self._embedding.device
+
+        # Map each row to a distinct waveform; slot -1 is the cached one
+        slots = []
+        starts = []
+        previous = self._cached_waveform
+        for i, waveform in enumerate(waveforms):
+            if previous is None or not torch.equal(waveform, previous):
+                starts.append(i)
+            slots.append(len(starts) - 1)
+            previous = waveform
+
+        with torch.inference_mode():
+            frames = []
+            if slots[0] == -1:
+                frames.append(self._cached_frames)
+            if starts:
+                frames.append(model.forward_frames(waveforms[starts].to(device)))
+            frames = torch.cat(frames)
+
+            offset = 1 if slots[0] == -1 else 0
+            index = torch.tensor(slots, device=frames.device) + offset
+            embeddings = model.forward_embedding(frames[index], weights=masks.to(device))
+
+        self._cached_waveform = waveforms[-1]
+        self._cached_frames = frames[-1:]
+        return embeddings.cpu().numpy()
+
+    def __getattr__(self, name):
+        return getattr(self._embedding, name)
+
+
+class _ActiveMaskEmbedding:
+    """
+    Skip speaker-embedding forward passes for all-zero activity masks.
+
+    Most (chunk, speaker) pairs in a segmentation window are silent. Their
+    embeddings are returned as NaN, which is what pyannote already produces
+    for masks too short to embed and which its clustering filters out.
+    """
+
+    def __init__(self, embedding):
+        self._embedding = embedding
+
+    def __call__(self, waveforms, masks=None):
+        if masks is None:
+            return self._embedding(waveforms)
+
+        active = masks.reshape(len(masks), -1).any(dim=1)
+        if bool(active.all()):
+            return self._embedding(waveforms, masks=masks)
+
+        embeddings = np.full((len(masks), self._embedding.dimension), np.nan, dtype=np.float32)
+        if bool(active.any()):
+            index = active.nonzero().squeeze(1)
+            embeddings[index.cpu().numpy()] = self._embedding(waveforms[index], masks=masks[index])
+        return embeddings
+
+    def __getattr__(self, name):
+        return getattr(self._embedding, name)
+
 
 class PyannoteModel(ModelManager):
     """
@@ -27,10 +185,13 @@ class PyannoteModel(ModelManager):
         super().__init__()
         self.model_id = "pyannote/speaker-diarization-3.1"
         self._pipeline = None
+        self._default_batch_sizes = None
+        self._onnx_session = None
 
         # Load configuration
         config = load_config()
         self._model_config = config.pyannote
+        self._cache_dir = config.processing.cache_dir
 
         # Get HuggingFace token from config
         self._hf_token = config.pyannote.hf_token
@@ -98,13 +259,40 @@ class PyannoteModel(ModelManager):
             token=hf_token
         )
 
+        # Remember the pipeline's own batch sizes so per-call overrides can be undone
+        self._default_batch_sizes = (
+            self._pipeline.embedding_batch_size,
+            self._pipeline.segmentation_batch_size
+        )
+
         # Set device (mps for Apple Silicon, cuda for NVIDIA, cpu fallback)
         device = self._model_config.device
         self._pipeline.to(torch.device(device))
 
+        # Opt-in INT8 embedding weights for CPU-only machines (e.g. CI runners)
+        if device.split(":")[0] == "cpu" and os.getenv("VIDEO_TOOLS_QUANTIZE_EMBEDDING") == "1":
+            self._quantize_embedding()
+
         self.is_loaded = True
         logger.info(f"Pyannote model loaded successfully on device: {device}")
 
+    def _quantize_embedding(self) -> None:
+        """
+        Apply INT8 dynamic quantization to the speaker-embedding model in place.
+
+        Dynamic quantization covers nn.Linear layers; the convolutional
+        backbone stays fp32. CPU only, enabled by VIDEO_TOOLS_QUANTIZE_EMBEDDING=1.
+        """
+        model = getattr(getattr(self._pipeline, "_embedding", None), "model_", None)
+        if model is None:
+            logger.warning("Pipeline has no torch embedding model; skipping quantization")
+            return
+
+        torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+        logger.info("Quantized speaker-embedding model to INT8 dynamic weights")
+
     def unload(self) -> None:
         """Unload model and free memory."""
         if not self.is_loaded:
@@ -112,6 +300,7 @@ class PyannoteModel(ModelManager):
 
         logger.info("Unloading Pyannote model")
         self._pipeline = None
+        self._onnx_session = None
 
         # Clear GPU cache
         if torch.cuda.is_available():
@@ -128,7 +317,15 @@ class PyannoteModel(ModelManager):
         audio_path: str,
         num_speakers: Optional[int] = None,
         min_speakers: Optional[int] = None,
-        max_speakers: Optional[int] = None
+        max_speakers: Optional[int] = None,
+        embedding_batch_size: Optional[int] = None,
+        segmentation_batch_size: Optional[int] = None,
+        embedding_precision: Optional[str] = None,
+        chunk_duration: Optional[float] = None,
+        clustering: Optional[str] = None,
+        skip_inactive_pairs: bool = True,
+        chunk_cache: bool = True,
+        embedding_backend: str = "torch"
     ) -> Dict[str, Any]:
         """
         Perform speaker diarization on audio file.
@@ -138,6 +335,27 @@ class PyannoteModel(ModelManager):
             num_speakers: Exact number of speakers (if known)
             min_speakers: Minimum number of speakers
             max_speakers: Maximum number of speakers
+            embedding_batch_size: Speaker-embedding batch size (None = pipeline default).
+                Small values (e.g. 4) avoid memory thrashing on GPUs with little VRAM
+            segmentation_batch_size: Segmentation batch size (None = pipeline default)
+            embedding_precision: "fp16" or "fp32" for the speaker-embedding forward pass
+                (None = fp16 on cuda/mps, fp32 on cpu)
+            chunk_duration: Diarize audio longer than this many seconds in
+                consecutive chunks and link speakers across chunks by embedding
+                similarity (None = one pass over the whole file). Bounds the
+                memory and quadratic clustering cost on long recordings
+            clustering: "agglomerative" (pipeline default) or "spectral" to cluster
+                speaker embeddings by eigengap-selected spectral clustering.
+                When only min_speakers and max_speakers are given, the count in
+                that range is chosen by GMM-BIC for either method
+            skip_inactive_pairs: Skip the embedding forward pass for (chunk, speaker)
+                pairs whose activity mask is all zero
+            chunk_cache: Compute embedding backbone frames once per segmentation
+                chunk and share them across the chunk's speakers (needs a
+                backbone split into forward_frames/forward_embedding)
+            embedding_backend: "torch" or "onnx" to run the speaker-embedding model
+                through ONNX Runtime (exported once and cached on disk; needs
+                onnxruntime). embedding_precision and chunk_cache apply to torch only
 
         Returns:
             Dict containing:
@@ -155,6 +373,24 @@ class PyannoteModel(ModelManager):
                 "num_speakers": 2
             }
         """
+        if embedding_precision is not None and embedding_precision not in EMBEDDING_PRECISIONS:
+            raise ValueError(
+                f"Unknown embedding precision: {embedding_precision}. "
+                f"Must be one of {EMBEDDING_PRECISIONS}"
+            )
+
+        if embedding_backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend: {embedding_backend}. "
+                f"Must be one of {EMBEDDING_BACKENDS}"
+            )
+
+        if clustering is not None and clustering not in CLUSTERING_METHODS:
+            raise ValueError(
+                f"Unknown clustering method: {clustering}. "
+                f"Must be one of {CLUSTERING_METHODS}"
+            )
+
         self.ensure_loaded()
 
         logger.info(f"Performing diarization on: {audio_path}")
@@ -162,52 +398,256 @@ class PyannoteModel(ModelManager):
         # Pre-load audio using soundfile to avoid torchcodec dependency
         # Pyannote accepts audio as {'waveform': tensor, 'sample_rate': int}
         import soundfile as sf
-        import numpy as np
 
-        # Load audio with soundfile (returns numpy array)
-        audio_data, sample_rate = sf.read(audio_path)
+        # Read straight into float32 (channels, samples); no float64 copy or cast
+        audio_data, sample_rate = sf.read(audio_path, dtype="float32", always_2d=True)
+        waveform = torch.from_numpy(audio_data.T)
 
-        # Convert to torch tensor and ensure shape is (channels, samples)
-        waveform = torch.from_numpy(audio_data).float()
-        if waveform.ndim == 1:
-            # Mono audio - add channel dimension
-            waveform = waveform.unsqueeze(0)
-        else:
-            # Stereo/multi-channel - transpose to (channels, samples)
-            waveform = waveform.T
+        # Downmix and resample once up front. Pyannote otherwise repeats both in
+        # every per-chunk crop; in the pipeline's own format each crop is a view
+        if waveform.shape[0] > 1:
+            waveform = waveform.mean(dim=0, keepdim=True)
+        if sample_rate != PIPELINE_SAMPLE_RATE:
+            import torchaudio.functional
+
+            waveform = torchaudio.functional.resample(waveform, sample_rate, PIPELINE_SAMPLE_RATE)
+            sample_rate = PIPELINE_SAMPLE_RATE
+        waveform = waveform.contiguous()
 
         audio_dict = {
             "waveform": waveform,
             "sample_rate": sample_rate
         }
 
-        # Run diarization with pre-loaded audio
-        diarization = self._pipeline(
-            audio_dict,
-            num_speakers=num_speakers,
-            min_speakers=min_speakers,
-            max_speakers=max_speakers
+        # Apply batch sizes for this call (defaults restore earlier overrides)
+        default_embedding, default_segmentation = self._default_batch_sizes
+        self._pipeline.embedding_batch_size = embedding_batch_size or default_embedding
+        self._pipeline.segmentation_batch_size = segmentation_batch_size or default_segmentation
+
+        # Half-precision embeddings on GPU (the embedding model dominates runtime)
+        device_type = self._model_config.device.split(":")[0]
+        if embedding_precision is None:
+            embedding_precision = "fp32" if device_type == "cpu" else "fp16"
+        embedding = getattr(self._pipeline, "_embedding", None)
+
+        use_onnx = embedding_backend == "onnx" and embedding is not None
+        if use_onnx:
+            self._pipeline._embedding = _OnnxEmbedding(embedding, self._get_onnx_session(embedding))
+
+        # Innermost torch wrapper: it calls the backbone directly
+        use_cache = (
+            chunk_cache and not use_onnx and embedding is not None
+            and _FrameCachedEmbedding.supports(embedding)
         )
+        if use_cache:
+            self._pipeline._embedding = _FrameCachedEmbedding(embedding)
+
+        use_fp16 = embedding_precision == "fp16" and not use_onnx and embedding is not None
+        if use_fp16:
+            self._pipeline._embedding = _Float16Embedding(self._pipeline._embedding, device_type)
+
+        # Silent (chunk, speaker) pairs need no embedding; outermost so they never reach the model
+        use_skip = skip_inactive_pairs and embedding is not None
+        if use_skip:
+            self._pipeline._embedding = _ActiveMaskEmbedding(self._pipeline._embedding)
+
+        # Replace the clustering step's cluster() on the instance; the pipeline's
+        # embedding filtering and constrained assignment around it are kept
+        pipeline_clustering = self._pipeline.clustering
+        if clustering == "spectral":
+            from video_tools_mcp.processing.speaker_clustering import spectral_cluster_embeddings
+
+            def base_cluster(embeddings, min_clusters, max_clusters, num_clusters=None):
+                return spectral_cluster_embeddings(
+                    embeddings,
+                    num_clusters=num_clusters,
+                    min_clusters=min_clusters,
+                    max_clusters=max_clusters
+                )
+        else:
+            base_cluster = pipeline_clustering.cluster
 
-        # Convert pyannote 4.0 output to our format
-        # Pyannote 4.0 returns DiarizeOutput object with serialize() method
-        serialized = diarization.serialize()
+        # Pick the count in a speaker range by GMM-BIC instead of a distance threshold
+        estimate_count = num_speakers is None and min_speakers is not None and max_speakers is not None
+        if estimate_count:
+            from video_tools_mcp.processing.speaker_clustering import estimate_num_speakers_bic
 
-        # Use 'diarization' key (non-overlapping segments)
-        segments = serialized.get('diarization', [])
+            def cluster(embeddings, min_clusters, max_clusters, num_clusters=None):
+                if num_clusters is None:
+                    num_clusters = estimate_num_speakers_bic(embeddings, min_clusters, max_clusters)
+                return base_cluster(embeddings, min_clusters, max_clusters, num_clusters=num_clusters)
+        else:
+            cluster = base_cluster
 
-        # Extract unique speakers
-        speakers = set(seg['speaker'] for seg in segments)
+        override_cluster = clustering == "spectral" or estimate_count
+        if override_cluster:
+            # object.__setattr__ bypasses pyannote Pipeline attribute registration
+            object.__setattr__(pipeline_clustering, "cluster", cluster)
 
-        result = {
-            "segments": segments,  # Already in correct format with start, end, speaker
-            "speakers": sorted(list(speakers)),
-            "num_speakers": len(speakers)
-        }
+        chunk_samples = int(chunk_duration * sample_rate) if chunk_duration else 0
+
+        # Run diarization with pre-loaded audio
+        try:
+            if chunk_samples and waveform.shape[1] > chunk_samples:
+                result = self._diarize_chunked(
+                    waveform,
+                    sample_rate,
+                    chunk_samples,
+                    max_speakers=num_speakers or max_speakers
+                )
+            else:
+                diarization = self._pipeline(
+                    audio_dict,
+                    num_speakers=num_speakers,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers
+                )
+
+                # Convert pyannote 4.0 output to our format
+                # Pyannote 4.0 returns DiarizeOutput object with serialize() method
+                serialized = diarization.serialize()
+
+                # Use 'diarization' key (non-overlapping segments)
+                segments = serialized.get('diarization', [])
+
+                # Extract unique speakers
+                speakers = set(seg['speaker'] for seg in segments)
+
+                result = {
+                    "segments": segments,  # Already in correct format with start, end, speaker
+                    "speakers": sorted(list(speakers)),
+                    "num_speakers": len(speakers)
+                }
+        finally:
+            if use_onnx or use_cache or use_fp16 or use_skip:
+                self._pipeline._embedding = embedding
+            if override_cluster:
+                vars(pipeline_clustering).pop("cluster", None)
+
+        segments = result["segments"]
 
         logger.info(f"Diarization complete: {result['num_speakers']} speakers, {len(segments)} segments")
         return result
 
+    def _get_onnx_session(self, embedding):
+        """
+        Get an ONNX Runtime session for the pipeline's speaker-embedding model.
+
+        The model is exported to <cache_dir>/onnx (default ~/.cache/video_tools/onnx)
+        on first use and reused afterwards; the session lives until unload().
+
+        Args:
+            embedding: The pipeline's pretrained speaker-embedding wrapper
+
+        Returns:
+            onnxruntime.InferenceSession taking "waveforms" (batch, 1, samples)
+            and "weights" (batch, frames), returning (batch, dimension)
+
+        Raises:
+            ImportError: If onnxruntime is not installed
+        """
+        if self._onnx_session is not None:
+            return self._onnx_session
+
+        import onnxruntime as ort
+        from pathlib import Path
+
+        cache_dir = Path(self._cache_dir) if self._cache_dir else Path.home() / ".cache" / "video_tools"
+        model_name = str(getattr(embedding, "embedding", "embedding")).replace("/", "--")
+        onnx_path = cache_dir / "onnx" / f"{model_name}.onnx"
+
+        if not onnx_path.exists():
+            logger.info(f"Exporting speaker-embedding model to ONNX: {onnx_path}")
+            onnx_path.parent.mkdir(parents=True, exist_ok=True)
+
+            model = embedding.model_
+
+            class _Export(torch.nn.Module):
+                def __init__(self):
+                    super().__init__()
+                    self.model = model
+
+                def forward(self, waveforms, weights):
+                    return self.model(waveforms, weights=weights)
+
+            device = next(model.parameters()).device
+            tmp_path = onnx_path.with_suffix(".onnx.tmp")
+            torch.onnx.export(
+                _Export().eval(),
+                (
+                    torch.zeros(2, 1, 10 * PIPELINE_SAMPLE_RATE, device=device),
+                    torch.ones(2, 589, device=device)
+                ),
+                str(tmp_path),
+                input_names=["waveforms", "weights"],
+                output_names=["embeddings"],
+                dynamic_axes={
+                    "waveforms": {0: "batch", 2: "samples"},
+                    "weights": {0: "batch", 1: "frames"},
+                    "embeddings": {0: "batch"}
+                },
+                opset_version=17
+            )
+            os.replace(tmp_path, onnx_path)
+
+        device_type = self._model_config.device.split(":")[0]
+        available = set(ort.get_available_providers())
+        providers = [p for p in ONNX_PROVIDERS.get(device_type, ["CPUExecutionProvider"]) if p in available]
+
+        self._onnx_session = ort.InferenceSession(str(onnx_path), providers=providers)
+        logger.info(f"ONNX embedding session ready ({', '.join(self._onnx_session.get_providers())})")
+        return self._onnx_session
+
+    def _diarize_chunked(
+        self,
+        waveform: torch.Tensor,
+        sample_rate: int,
+        chunk_samples: int,
+        max_speakers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Diarize consecutive chunks of a waveform and link speakers across them.
+
+        Each chunk is a view of the loaded waveform (no copy). Chunk speakers
+        are matched to earlier ones by their pipeline embedding centroids.
+
+        Args:
+            waveform: (channels, samples) audio tensor
+            sample_rate: Sample rate of waveform
+            chunk_samples: Samples per chunk
+            max_speakers: Upper bound on speakers, per chunk and overall
+
+        Returns:
+            Dict in the same format as diarize()
+        """
+        from video_tools_mcp.processing.diarization_merge import merge_chunk_diarizations
+
+        total_samples = waveform.shape[1]
+        chunk_results = []
+
+        for start in range(0, total_samples, chunk_samples):
+            chunk = waveform[:, start:start + chunk_samples]
+            offset = start / sample_rate
+            logger.info(
+                f"Diarizing chunk {len(chunk_results) + 1} "
+                f"({offset:.0f}s-{(start + chunk.shape[1]) / sample_rate:.0f}s)"
+            )
+
+            diarization = self._pipeline(
+                {"waveform": chunk, "sample_rate": sample_rate},
+                max_speakers=max_speakers
+            )
+
+            chunk_results.append({
+                "offset": offset,
+                "segments": diarization.serialize().get('diarization', []),
+                # speaker_embeddings rows follow the annotation's label order
+                "labels": diarization.speaker_diarization.labels(),
+                "embeddings": diarization.speaker_embeddings
+            })
+
+        return merge_chunk_diarizations(chunk_results, max_speakers=max_speakers)
+
     def verify_token(self) -> bool:
         """
         Verify HuggingFace token is available.
@@ -6,7 +6,7 @@ from typing import Dict, Any, List, Optional
 from mlx_vlm import load, generate
 from mlx_vlm.utils import load_image
 from video_tools_mcp.models.model_manager import ModelManager
-from video_tools_mcp.config import load_config
+from video_tools_mcp.config import QWEN_VL_MODEL_ID, load_config
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +26,7 @@ class QwenVLModel(ModelManager):
     def __init__(self):
         """Initialize Qwen VL model configuration."""
         super().__init__()
-        self.model_id = "lmstudio-community/Qwen3-VL-8B-Instruct-MLX-8bit"
+        self.model_id = QWEN_VL_MODEL_ID
         self._model = None
         self._processor = None
 
@@ -79,12 +79,28 @@ class QwenVLModel(ModelManager):
         self.is_loaded = False
         logger.info("Qwen VL model unloaded and memory freed")
 
+    def load_image(self, image_path: str) -> Any:
+        """
+        Decode an image file for analyze_frame().
+
+        Safe to call from a worker thread, so the next frame can be decoded
+        while the model is busy generating for the current one.
+
+        Args:
+            image_path: Path to image file (JPG, PNG, etc.)
+
+        Returns:
+            Loaded image, ready to pass as analyze_frame(image=...)
+        """
+        return load_image(image_path)
+
     def analyze_frame(
         self,
         image_path: str,
         prompt: str,
         max_tokens: int = 512,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        image: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Analyze a video frame using Qwen2-VL vision-language model.
@@ -97,6 +113,7 @@ class QwenVLModel(ModelManager):
             prompt: Question or instruction about the image
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0.0 to 1.0)
+            image: Image already decoded by load_image() (skips re-decoding image_path)
 
         Returns:
             Dict containing:
@@ -123,7 +140,8 @@ class QwenVLModel(ModelManager):
 
         try:
             # Load image using mlx_vlm utility
-            image = load_image(image_path)
+            if image is None:
+                image = load_image(image_path)
 
             # Prepare prompt in Qwen2-VL format
             formatted_prompt = f"<|im_start|>user\n<image>\n{prompt}<|im_end|>\n<|im_start|>assistant\n"
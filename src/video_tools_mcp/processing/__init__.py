@@ -1,6 +1,6 @@
 """Core video and audio processing utilities."""
 
-from .transcription import transcribe_video_file
+from .transcription import transcribe_audio_file, transcribe_video_file
 from .diarization_merge import (
     merge_transcription_with_diarization,
     find_speaker_for_segment,
@@ -9,6 +9,7 @@ from .diarization_merge import (
 from .frame_extraction import FrameExtractor, FrameMetadata
 
 __all__ = [
+    'transcribe_audio_file',
     'transcribe_video_file',
     'merge_transcription_with_diarization',
     'find_speaker_for_segment',
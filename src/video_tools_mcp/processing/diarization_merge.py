@@ -2,14 +2,20 @@
 Diarization merge utilities for combining transcription and speaker diarization results.
 
 This module provides functions to merge speaker diarization data with transcription
-segments, using temporal overlap to assign speakers to transcribed text.
+segments, using temporal overlap to assign speakers to transcribed text, and to
+stitch together diarization runs over consecutive chunks of long audio.
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Minimum cosine similarity for a chunk speaker to be matched to a known speaker
+CHUNK_SPEAKER_MIN_SIMILARITY = 0.5
+
 
 def find_speaker_for_segment(
     segment_start: float,
@@ -138,3 +144,127 @@ def format_speaker_transcript(segments: List[Dict[str, Any]]) -> List[Dict[str,
 
     logger.debug(f"Formatted {len(formatted_segments)} segments with speaker prefixes")
     return formatted_segments
+
+
+def assign_chunk_speakers(
+    known_centroids: np.ndarray,
+    chunk_centroids: np.ndarray,
+    min_similarity: float = CHUNK_SPEAKER_MIN_SIMILARITY,
+    max_speakers: Optional[int] = None
+) -> List[int]:
+    """
+    Map the speakers of one diarization chunk onto the speakers seen so far.
+
+    Speakers are matched one-to-one by maximizing total cosine similarity of
+    their embedding centroids (Hungarian assignment). A chunk speaker whose
+    best match is below min_similarity becomes a new speaker, unless that
+    would exceed max_speakers, in which case it joins its closest speaker.
+
+    Args:
+        known_centroids: (n_known, dim) centroids of speakers found so far
+        chunk_centroids: (n_chunk, dim) centroids of this chunk's speakers
+        min_similarity: Cosine similarity needed to reuse a known speaker
+        max_speakers: Upper bound on the total number of speakers
+
+    Returns:
+        Speaker index for each chunk speaker; indices >= n_known are new
+        speakers, numbered consecutively in chunk order
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    n_known = len(known_centroids)
+    n_chunk = len(chunk_centroids)
+    if n_known == 0:
+        return list(range(n_chunk))
+
+    def _normalize(x: np.ndarray) -> np.ndarray:
+        x = np.nan_to_num(np.asarray(x, dtype=np.float64))
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        return x / np.where(norms == 0, 1.0, norms)
+
+    similarity = _normalize(chunk_centroids) @ _normalize(known_centroids).T
+
+    assignment: List[Optional[int]] = [None] * n_chunk
+    rows, cols = linear_sum_assignment(similarity, maximize=True)
+    for row, col in zip(rows, cols):
+        if similarity[row, col] >= min_similarity:
+            assignment[row] = int(col)
+
+    next_index = n_known
+    for row in range(n_chunk):
+        if assignment[row] is None:
+            if max_speakers is not None and next_index >= max_speakers:
+                assignment[row] = int(np.argmax(similarity[row]))
+            else:
+                assignment[row] = next_index
+                next_index += 1
+
+    return assignment
+
+
+def merge_chunk_diarizations(
+    chunk_results: List[Dict[str, Any]],
+    min_similarity: float = CHUNK_SPEAKER_MIN_SIMILARITY,
+    max_speakers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Combine diarization runs over consecutive audio chunks into one result.
+
+    Each chunk labels its speakers independently; speakers are linked
+    across chunks with assign_chunk_speakers() against running-mean
+    centroids, then relabeled SPEAKER_00, SPEAKER_01, ... in order of
+    first appearance.
+
+    Args:
+        chunk_results: One dict per chunk, in time order, with keys:
+            offset: Chunk start time in seconds
+            segments: Chunk-relative segments with 'start', 'end', 'speaker'
+            labels: Chunk speaker labels, in the row order of embeddings
+            embeddings: (len(labels), dim) speaker embedding centroids
+        min_similarity: Cosine similarity needed to reuse a known speaker
+        max_speakers: Upper bound on the total number of speakers
+
+    Returns:
+        Dict with segments, speakers and num_speakers (as PyannoteModel.diarize)
+    """
+    sums: List[np.ndarray] = []
+    counts: List[int] = []
+    segments = []
+
+    for chunk in chunk_results:
+        labels = list(chunk["labels"])
+        if not labels:
+            continue
+
+        embeddings = np.nan_to_num(np.asarray(chunk["embeddings"], dtype=np.float64))
+        known = (
+            np.stack([total / count for total, count in zip(sums, counts)])
+            if sums else np.empty((0, embeddings.shape[1]))
+        )
+        mapping = assign_chunk_speakers(known, embeddings, min_similarity, max_speakers)
+
+        for index, embedding in zip(mapping, embeddings):
+            if index == len(sums):
+                sums.append(embedding.copy())
+                counts.append(1)
+            else:
+                sums[index] += embedding
+                counts[index] += 1
+
+        speaker_for = {label: f"SPEAKER_{index:02d}" for label, index in zip(labels, mapping)}
+        offset = chunk["offset"]
+        for seg in chunk["segments"]:
+            segments.append({
+                "start": seg["start"] + offset,
+                "end": seg["end"] + offset,
+                "speaker": speaker_for[seg["speaker"]]
+            })
+
+    speakers = sorted({seg["speaker"] for seg in segments})
+    logger.info(f"Merged {len(chunk_results)} diarization chunks: {len(speakers)} speakers")
+
+    return {
+        "segments": segments,
+        "speakers": speakers,
+        "num_speakers": len(speakers)
+    }
@@ -5,7 +5,9 @@ This module provides utilities for extracting frames from video files at regular
 intervals or specific timestamps. Frames are saved as JPEG images with metadata.
 """
 
+import functools
 import logging
+import sys
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 import tempfile
@@ -14,6 +16,90 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Above this sample interval (seconds), per-timestamp seeking is cheaper
+# than decoding the whole video in one pass
+FAST_SEEK_INTERVAL = 30.0
+
+# Decoder backends accepted by FrameExtractor
+DECODER_BACKENDS = ("auto", "cpu", "videotoolbox")
+
+# Thumbnail size used to scan for content changes in adaptive sampling
+SCAN_WIDTH = 64
+SCAN_HEIGHT = 36
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Run ffprobe; mtime and size in the key invalidate modified files."""
+    return ffmpeg.probe(path)
+
+
+def probe_video(video_path: Path) -> Dict[str, Any]:
+    """
+    Probe a video with ffprobe, reusing the result while the file is unchanged.
+
+    Repeated extractions from the same video (e.g. several screenshot runs)
+    skip the ffprobe subprocess. Treat the returned dict as read-only.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        ffprobe output as returned by ffmpeg.probe()
+
+    Raises:
+        ffmpeg.Error: If ffprobe fails
+    """
+    st = video_path.stat()
+    return _probe_cached(str(video_path), st.st_mtime_ns, st.st_size)
+
+
+def select_adaptive_timestamps(
+    diffs: List[float],
+    step: float,
+    min_gap: float,
+    max_gap: float,
+    sensitivity: float = 1.5,
+    window: int = 8,
+) -> List[float]:
+    """
+    Pick sample timestamps where the picture changes, from a thumbnail scan.
+
+    A scan position is selected when its difference from the previous
+    thumbnail exceeds ``sensitivity`` times the rolling mean of recent
+    differences, at least ``min_gap`` seconds after the last selection.
+    A position is always selected once ``max_gap`` seconds pass without one.
+
+    Args:
+        diffs: Mean absolute difference between consecutive thumbnails;
+            diffs[i] compares the thumbnail at (i + 1) * step with the one before
+        step: Seconds between scanned thumbnails
+        min_gap: Minimum seconds between selected timestamps
+        max_gap: Maximum seconds between selected timestamps
+        sensitivity: Multiple of the rolling mean that counts as a change
+        window: Number of recent differences in the rolling mean
+
+    Returns:
+        Selected timestamps in seconds, always starting with 0.0
+    """
+    timestamps = [0.0]
+    recent: List[float] = []
+
+    for i, diff in enumerate(diffs):
+        t = (i + 1) * step
+        gap = t - timestamps[-1]
+        baseline = sum(recent) / len(recent) if recent else 0.0
+
+        changed = diff > sensitivity * baseline if recent else diff > 0
+        if (gap >= min_gap and changed) or gap >= max_gap:
+            timestamps.append(t)
+
+        recent.append(diff)
+        if len(recent) > window:
+            recent.pop(0)
+
+    return timestamps
+
 
 @dataclass
 class FrameMetadata:
@@ -24,18 +110,52 @@ class FrameMetadata:
     frame_number: int  # Sequential frame number (0-indexed)
 
 
+def resolve_decoder_backend(decoder_backend: str = "auto") -> str:
+    """
+    Validate a decoder backend name and resolve "auto" for this platform.
+
+    Args:
+        decoder_backend: One of DECODER_BACKENDS
+
+    Returns:
+        "cpu" or "videotoolbox"
+
+    Raises:
+        ValueError: If decoder_backend is not recognised
+    """
+    if decoder_backend not in DECODER_BACKENDS:
+        raise ValueError(
+            f"Unknown decoder backend: {decoder_backend} "
+            f"(expected one of {', '.join(DECODER_BACKENDS)})"
+        )
+    if decoder_backend == "auto":
+        return "videotoolbox" if sys.platform == "darwin" else "cpu"
+    return decoder_backend
+
+
 class FrameExtractor:
     """Extract frames from video files using FFmpeg."""
 
-    def __init__(self, quality: int = 90):
+    def __init__(self, quality: int = 90, decoder_backend: str = "auto"):
         """
         Initialize frame extractor.
 
         Args:
             quality: JPEG quality (1-100, higher is better). Default: 90
+            decoder_backend: "cpu", "videotoolbox" (Apple hardware decoder),
+                or "auto" to use VideoToolbox on macOS. Default: "auto"
+
+        Raises:
+            ValueError: If decoder_backend is not recognised
         """
+        decoder_backend = resolve_decoder_backend(decoder_backend)
+
         self.quality = quality
-        logger.info(f"Initialized FrameExtractor with quality={quality}")
+        self.decoder_backend = decoder_backend
+        logger.info(
+            f"Initialized FrameExtractor with quality={quality}, "
+            f"decoder_backend={decoder_backend}"
+        )
 
     def extract_frames_at_interval(
         self,
@@ -76,7 +196,7 @@ class FrameExtractor:
 
         # Get video duration
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe = probe_video(video_path)
             duration = float(probe["format"]["duration"])
             logger.debug(f"Video duration: {duration:.2f}s")
         except Exception as e:
@@ -93,7 +213,87 @@ class FrameExtractor:
 
         logger.info(f"Extracting {len(timestamps)} frames")
 
-        # Extract frames
+        if sample_interval > FAST_SEEK_INTERVAL:
+            # Sparse sampling: seeking to each timestamp beats decoding everything
+            frames = self._extract_by_seeking(video_path, output_dir, timestamps)
+        else:
+            try:
+                try:
+                    frames = self._extract_single_pass(
+                        video_path, output_dir, timestamps, sample_interval
+                    )
+                except ffmpeg.Error as e:
+                    if self.decoder_backend == "cpu":
+                        raise
+                    logger.warning(
+                        f"{self.decoder_backend} decode failed, retrying on CPU: {e.stderr}"
+                    )
+                    self.decoder_backend = "cpu"
+                    frames = self._extract_single_pass(
+                        video_path, output_dir, timestamps, sample_interval
+                    )
+            except ffmpeg.Error as e:
+                logger.warning(
+                    f"Single-pass extraction failed, falling back to seeking: {e.stderr}"
+                )
+                frames = self._extract_by_seeking(video_path, output_dir, timestamps)
+
+        logger.info(f"Successfully extracted {len(frames)} frames to {output_dir}")
+        return frames
+
+    def _extract_single_pass(
+        self,
+        video_path: Path,
+        output_dir: Path,
+        timestamps: List[float],
+        sample_interval: float,
+    ) -> List[FrameMetadata]:
+        """
+        Extract frames with one linear FFmpeg decode using the fps filter.
+
+        Raises:
+            ffmpeg.Error: If FFmpeg fails
+        """
+        input_kwargs = {}
+        if self.decoder_backend == "videotoolbox":
+            input_kwargs["hwaccel"] = "videotoolbox"
+
+        (
+            ffmpeg.input(str(video_path), **input_kwargs)
+            # round="up" takes the first frame at or after each slot, as seeking does
+            .filter("fps", fps=1.0 / sample_interval, round="up")
+            .output(
+                str(output_dir / "frame_%06d.jpg"),
+                vframes=len(timestamps),
+                start_number=0,
+                **{"q:v": self.quality},
+            )
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True, quiet=True)
+        )
+
+        frames = []
+        for idx, timestamp in enumerate(timestamps):
+            frame_path = output_dir / f"frame_{idx:06d}.jpg"
+            if not frame_path.exists():
+                # fps filter may emit fewer frames than estimated near the end
+                break
+            frames.append(
+                FrameMetadata(
+                    frame_path=frame_path,
+                    timestamp=timestamp,
+                    frame_number=idx,
+                )
+            )
+        return frames
+
+    def _extract_by_seeking(
+        self,
+        video_path: Path,
+        output_dir: Path,
+        timestamps: List[float],
+    ) -> List[FrameMetadata]:
+        """Extract frames with one input-seeking FFmpeg call per timestamp."""
         frames = []
         for idx, timestamp in enumerate(timestamps):
             try:
@@ -126,9 +326,76 @@ class FrameExtractor:
                 logger.warning(f"Failed to extract frame at {timestamp:.2f}s: {e.stderr}")
                 continue
 
-        logger.info(f"Successfully extracted {len(frames)} frames to {output_dir}")
         return frames
 
+    def extract_frames_adaptive(
+        self,
+        video_path: Path,
+        output_dir: Optional[Path] = None,
+        sample_interval: float = 5.0,
+        max_frames: Optional[int] = None,
+        sensitivity: float = 1.5,
+    ) -> List[FrameMetadata]:
+        """
+        Extract frames at content changes instead of a fixed interval.
+
+        Scans the video at four times the sample rate as tiny grayscale
+        thumbnails. Full-size frames are then extracted only where the
+        picture changes (see select_adaptive_timestamps()). Selections are
+        at least sample_interval / 4 and at most sample_interval * 4 apart.
+        Static scenes cost little, and fast cuts are not skipped.
+
+        Args:
+            video_path: Path to input video file
+            output_dir: Directory to save extracted frames (default: temp directory)
+            sample_interval: Nominal time between frames in seconds (default: 5.0)
+            max_frames: Maximum number of frames to extract (default: None = all)
+            sensitivity: Change threshold as a multiple of the recent mean difference
+
+        Returns:
+            List of FrameMetadata objects with frame paths and metadata
+
+        Raises:
+            FileNotFoundError: If video file doesn't exist
+            RuntimeError: If the thumbnail scan fails
+        """
+        import numpy as np
+
+        if not video_path.exists():
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+
+        step = sample_interval / 4
+        logger.info(f"Scanning {video_path} for content changes (every {step:.2f}s)")
+
+        try:
+            out, _ = (
+                ffmpeg.input(str(video_path))
+                .filter("fps", fps=1.0 / step)
+                .filter("scale", SCAN_WIDTH, SCAN_HEIGHT)
+                .output("pipe:", format="rawvideo", pix_fmt="gray")
+                .run(capture_stdout=True, capture_stderr=True, quiet=True)
+            )
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"Failed to scan video: {e.stderr}")
+
+        thumbs = np.frombuffer(out, np.uint8).reshape(-1, SCAN_HEIGHT, SCAN_WIDTH)
+        diffs = np.abs(np.diff(thumbs.astype(np.int16), axis=0)).mean(axis=(1, 2))
+
+        timestamps = select_adaptive_timestamps(
+            diffs.tolist(),
+            step=step,
+            min_gap=step,
+            max_gap=sample_interval * 4,
+            sensitivity=sensitivity,
+        )
+        if max_frames:
+            timestamps = timestamps[:max_frames]
+
+        logger.info(
+            f"Adaptive sampling selected {len(timestamps)} of {len(thumbs)} scanned positions"
+        )
+        return self.extract_specific_frames(video_path, timestamps, output_dir)
+
     def extract_specific_frames(
         self,
         video_path: Path,
@@ -212,7 +479,7 @@ class FrameExtractor:
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe = probe_video(video_path)
             video_stream = next(
                 (s for s in probe["streams"] if s["codec_type"] == "video"), None
             )
@@ -0,0 +1,159 @@
+"""
+Speaker embedding clustering and speaker count estimation.
+
+spectral_cluster_embeddings() is an alternative to pyannote's agglomerative
+clustering step: builds a pruned cosine affinity matrix, picks the speaker
+count from the largest eigengap of its graph Laplacian and runs k-means on
+the leading eigenvectors. The whole stage is a handful of matrix operations
+instead of a greedy merge loop, and has no distance threshold to tune.
+
+estimate_num_speakers_bic() picks a speaker count within a known range by
+fitting a Gaussian mixture per candidate count and keeping the lowest BIC.
+Embeddings are projected onto a few principal components first, since with
+only a few dozen segments the parameter penalty of a full-dimensional
+mixture always favours the smallest count.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fraction of each affinity row zeroed out, keeping only the strongest links
+SPECTRAL_PRUNE_PERCENTILE = 0.9
+
+# Never keep fewer neighbours per row than this, so small graphs stay connected
+SPECTRAL_MIN_NEIGHBOURS = 2
+
+# Principal components kept before GMM-BIC scoring (raised to
+# max_speakers - 1 when more are needed to separate that many speakers)
+BIC_PCA_DIMS = 4
+
+
+def _farthest_point_init(points: np.ndarray, k: int) -> np.ndarray:
+    """Deterministic k-means seeding: start at row 0, then add the farthest point."""
+    centers = [points[0]]
+    distances = np.linalg.norm(points - points[0], axis=1)
+
+    for _ in range(1, k):
+        centers.append(points[int(np.argmax(distances))])
+        distances = np.minimum(distances, np.linalg.norm(points - centers[-1], axis=1))
+
+    return np.stack(centers)
+
+
+def spectral_cluster_embeddings(
+    embeddings: np.ndarray,
+    num_clusters: Optional[int] = None,
+    min_clusters: int = 1,
+    max_clusters: Optional[int] = None,
+    prune_percentile: float = SPECTRAL_PRUNE_PERCENTILE
+) -> np.ndarray:
+    """
+    Cluster speaker embeddings with pruned-affinity spectral clustering.
+
+    Args:
+        embeddings: (n, dim) speaker embeddings
+        num_clusters: Exact number of clusters (None = pick by eigengap)
+        min_clusters: Lower bound when picking by eigengap
+        max_clusters: Upper bound when picking by eigengap (None = n)
+        prune_percentile: Fraction of each affinity row to zero out
+
+    Returns:
+        (n,) integer cluster labels numbered from 0
+    """
+    from scipy.cluster.vq import kmeans2
+
+    n = embeddings.shape[0]
+    if n < 2:
+        return np.zeros(n, dtype=int)
+
+    # Cosine affinity in [0, 1]
+    normed = np.nan_to_num(embeddings.astype(np.float64))
+    normed /= np.maximum(np.linalg.norm(normed, axis=1, keepdims=True), 1e-12)
+    affinity = (normed @ normed.T + 1.0) / 2.0
+
+    # Keep the strongest links of each row, then symmetrize
+    keep = max(SPECTRAL_MIN_NEIGHBOURS, int(np.ceil((1.0 - prune_percentile) * n)))
+    if keep < n:
+        weakest = np.argpartition(affinity, n - keep, axis=1)[:, :n - keep]
+        np.put_along_axis(affinity, weakest, 0.0, axis=1)
+    affinity = (affinity + affinity.T) / 2.0
+    np.fill_diagonal(affinity, 0.0)
+
+    # Unnormalized graph Laplacian; eigenvalues come back in ascending order
+    laplacian = np.diag(affinity.sum(axis=1)) - affinity
+    eigenvalues, eigenvectors = np.linalg.eigh(laplacian)
+
+    if num_clusters is None:
+        max_k = min(max_clusters or n, n - 1)
+        min_k = max(1, min(min_clusters, max_k))
+        # gaps[i] is the gap after the (i + 1)-th smallest eigenvalue
+        gaps = np.diff(eigenvalues[:max_k + 1])
+        num_clusters = min_k + int(np.argmax(gaps[min_k - 1:max_k]))
+
+    num_clusters = max(1, min(num_clusters, n))
+    if num_clusters == 1:
+        return np.zeros(n, dtype=int)
+
+    features = eigenvectors[:, :num_clusters]
+    _, labels = kmeans2(
+        features,
+        _farthest_point_init(features, num_clusters),
+        minit="matrix"
+    )
+
+    # Renumber so labels are consecutive even if k-means emptied a cluster
+    _, labels = np.unique(labels, return_inverse=True)
+    logger.debug(f"Spectral clustering: {n} embeddings -> {labels.max() + 1} clusters")
+    return labels
+
+
+def estimate_num_speakers_bic(
+    embeddings: np.ndarray,
+    min_speakers: int,
+    max_speakers: int
+) -> int:
+    """
+    Estimate the number of speakers in [min_speakers, max_speakers] by GMM-BIC.
+
+    Projects the L2-normalized embeddings onto their leading principal
+    components, fits a diagonal-covariance Gaussian mixture for each
+    candidate count and returns the count with the lowest Bayesian
+    information criterion.
+
+    Args:
+        embeddings: (n, dim) speaker embeddings
+        min_speakers: Smallest candidate count
+        max_speakers: Largest candidate count
+
+    Returns:
+        Chosen speaker count (clamped to the number of embeddings)
+    """
+    from sklearn.mixture import GaussianMixture
+
+    n = embeddings.shape[0]
+    max_speakers = min(max_speakers, n)
+    min_speakers = max(1, min(min_speakers, max_speakers))
+    if min_speakers == max_speakers:
+        return min_speakers
+
+    normed = np.nan_to_num(embeddings.astype(np.float64))
+    normed /= np.maximum(np.linalg.norm(normed, axis=1, keepdims=True), 1e-12)
+
+    # PCA via SVD of the centred embeddings
+    dims = min(max(BIC_PCA_DIMS, max_speakers - 1), n - 1, normed.shape[1])
+    centred = normed - normed.mean(axis=0)
+    _, _, components = np.linalg.svd(centred, full_matrices=False)
+    projected = centred @ components[:dims].T
+
+    bics = [
+        GaussianMixture(k, covariance_type="diag", random_state=0).fit(projected).bic(projected)
+        for k in range(min_speakers, max_speakers + 1)
+    ]
+
+    num_speakers = min_speakers + int(np.argmin(bics))
+    logger.debug(f"GMM-BIC speaker count: {num_speakers} (range {min_speakers}-{max_speakers})")
+    return num_speakers
@@ -3,6 +3,7 @@ Video transcription processing with chunking support.
 
 This module provides utilities for:
 - Transcribing video files with automatic audio extraction
+- Transcribing pre-extracted audio files
 - Chunking long audio files for processing
 - Merging chunk transcriptions with overlap handling
 """
@@ -144,6 +145,39 @@ def merge_chunk_transcriptions(
     }
 
 
+def transcribe_audio_file(audio_path: str, language: str = "en") -> Dict[str, Any]:
+    """Transcribe an already-extracted audio file with Parakeet.
+
+    Args:
+        audio_path: Path to audio file (16 kHz mono WAV preferred)
+        language: Language code (default: "en")
+
+    Returns:
+        Dict with text, segments, language and duration (see transcribe_video_file)
+    """
+    # Load configuration
+    config = load_config()
+    chunk_duration = config.parakeet.chunk_duration
+    overlap_duration = config.parakeet.overlap_duration
+
+    # Load Parakeet model
+    model = ParakeetModel()
+    model.ensure_loaded()
+
+    # Transcribe audio (Parakeet handles chunking internally)
+    logger.info(f"Transcribing audio with Parakeet (chunking: {chunk_duration}s, overlap: {overlap_duration}s)")
+    result = model.transcribe(
+        audio_path,
+        language=language,
+        chunk_duration=chunk_duration,
+        overlap_duration=overlap_duration
+    )
+
+    logger.info(f"Transcription complete: {result['duration']:.1f}s, {len(result['segments'])} segments")
+
+    return result
+
+
 def transcribe_video_file(
     video_path: str,
     language: str = "en",
@@ -178,32 +212,12 @@ def transcribe_video_file(
     if not validate_video_path(video_path):
         raise VideoProcessingError(f"Invalid video file: {video_path}")
 
-    # Load configuration
-    config = load_config()
-    chunk_duration = config.parakeet.chunk_duration
-    overlap_duration = config.parakeet.overlap_duration
-
     # Extract audio
     logger.info(f"Extracting audio from video: {video_path}")
     audio_path = extract_audio(video_path)
 
     try:
-        # Load Parakeet model
-        model = ParakeetModel()
-        model.ensure_loaded()
-
-        # Transcribe audio (Parakeet handles chunking internally)
-        logger.info(f"Transcribing audio with Parakeet (chunking: {chunk_duration}s, overlap: {overlap_duration}s)")
-        result = model.transcribe(
-            audio_path,
-            language=language,
-            chunk_duration=chunk_duration,
-            overlap_duration=overlap_duration
-        )
-
-        logger.info(f"Transcription complete: {result['duration']:.1f}s, {len(result['segments'])} segments")
-
-        return result
+        return transcribe_audio_file(audio_path, language=language)
 
     finally:
         # Clean up temporary audio file
@@ -13,23 +13,44 @@ Phase 2+: Real integrations with Parakeet, Qwen VL, etc.
 """
 
 import logging
+import os
+import re
 import tempfile
 import shutil
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from pathlib import Path
 
 from fastmcp import FastMCP
+from video_tools_mcp.config import QWEN_VL_MODEL_ID, load_config
 from video_tools_mcp.config.prompts import (
     DEFAULT_ANALYSIS_PROMPT,
     DEFAULT_SCREENSHOT_EXTRACTION_PROMPT
 )
+from video_tools_mcp.utils.file_utils import write_json
 from video_tools_mcp.utils.image_utils import deduplicate_frames
+from video_tools_mcp.utils.screenshot_cache import (
+    cache_enabled,
+    load_cached_screenshots,
+    screenshot_cache_key,
+    store_screenshots
+)
 
 # Set up module logger
 logger = logging.getLogger(__name__)
 
+# Read/write buffer for streaming SRT rewrites (rename_speakers)
+SRT_IO_BUFFER_SIZE = 1 << 20
+
+# Qwen VL generation settings for screenshot KEEP/SKIP evaluation and captions
+SCREENSHOT_EVAL_MAX_TOKENS = 256
+SCREENSHOT_EVAL_TEMPERATURE = 0.5
+SCREENSHOT_CAPTION_PROMPT = "Describe this image in one concise sentence suitable as a caption."
+SCREENSHOT_CAPTION_MAX_TOKENS = 128
+SCREENSHOT_CAPTION_TEMPERATURE = 0.7
+
 # Initialize FastMCP application
 mcp = FastMCP(
     "video-tools",
@@ -81,7 +102,16 @@ def transcribe_with_speakers(
     min_speakers: Optional[int] = None,
     max_speakers: Optional[int] = None,
     language: str = "en",
-    cleanup_temp_files: bool = True
+    cleanup_temp_files: bool = True,
+    embedding_batch_size: Optional[int] = None,
+    segmentation_batch_size: Optional[int] = None,
+    audio_path: Optional[str] = None,
+    embedding_precision: Optional[str] = None,
+    chunk_duration: Optional[float] = None,
+    clustering: Optional[str] = None,
+    skip_inactive_pairs: bool = True,
+    chunk_cache: bool = True,
+    embedding_backend: str = "torch"
 ) -> Dict[str, Any]:
     """
     Transcribe video with speaker diarization.
@@ -91,9 +121,27 @@ def transcribe_with_speakers(
         output_format: Output format (srt, json, txt)
         num_speakers: Exact number of speakers (if known)
         min_speakers: Minimum number of speakers
-        max_speakers: Maximum number of speakers
+        max_speakers: Maximum number of speakers (num_speakers=1 or max_speakers=1
+            labels everything SPEAKER_00 without running Pyannote)
         language: Language code for transcription
         cleanup_temp_files: Whether to delete temporary files
+        embedding_batch_size: Pyannote speaker-embedding batch size (default: pipeline's).
+            Lower it (e.g. 4) on GPUs with little memory
+        segmentation_batch_size: Pyannote segmentation batch size (default: pipeline's)
+        audio_path: Already-extracted 16 kHz mono WAV of the video; skips audio
+            extraction when given (the file is never deleted)
+        embedding_precision: "fp16" or "fp32" for Pyannote's speaker embeddings
+            (default: fp16 on cuda/mps, fp32 on cpu)
+        chunk_duration: Diarize long audio in chunks of this many seconds (e.g. 300),
+            linking speakers across chunks; bounds memory on long videos
+        clustering: Speaker clustering method, "agglomerative" or "spectral"
+            (default: pipeline's agglomerative clustering)
+        skip_inactive_pairs: Skip speaker embeddings for silent (chunk, speaker) pairs
+            (default: True)
+        chunk_cache: Run the speaker-embedding backbone once per audio chunk and
+            share it across that chunk's speakers (default: True)
+        embedding_backend: "torch" or "onnx" to run speaker embeddings on ONNX Runtime
+            (requires onnxruntime; default: torch)
 
     Returns:
         {
@@ -104,95 +152,169 @@ def transcribe_with_speakers(
             "speakers": List[str]
         }
     """
-    from video_tools_mcp.processing import transcribe_video_file
-    from video_tools_mcp.processing.diarization_merge import (
-        merge_transcription_with_diarization,
-        format_speaker_transcript
-    )
-    from video_tools_mcp.processing.audio_extraction import extract_audio
-    from video_tools_mcp.models.pyannote import PyannoteModel
-    from video_tools_mcp.utils.srt_utils import write_srt_file
-
     logger.info(f"Starting speaker diarization for: {video_path}")
 
     # 1. Validate video file
     video_path = Path(video_path)
     if not video_path.exists():
         raise ValueError(f"Video file not found: {video_path}")
+    if audio_path is not None and not Path(audio_path).exists():
+        raise ValueError(f"Audio file not found: {audio_path}")
+
+    # 2-6. Transcribe, diarize and merge
+    diarized = _diarize_video(
+        str(video_path),
+        num_speakers=num_speakers,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        language=language,
+        cleanup_temp_files=cleanup_temp_files,
+        embedding_batch_size=embedding_batch_size,
+        segmentation_batch_size=segmentation_batch_size,
+        audio_path=audio_path,
+        embedding_precision=embedding_precision,
+        chunk_duration=chunk_duration,
+        clustering=clustering,
+        skip_inactive_pairs=skip_inactive_pairs,
+        chunk_cache=chunk_cache,
+        embedding_backend=embedding_backend
+    )
+
+    # 7. Generate output file
+    output_path = video_path.with_suffix(f".speakers.{output_format}")
+    _write_speaker_transcript(diarized, output_path, output_format)
 
-    # 2. Extract audio (temporary file)
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_audio:
-        audio_path = tmp_audio.name
+    logger.info(f"Speaker diarization complete: {output_path}")
+
+    return {
+        "transcript_path": str(output_path),
+        "speakers_detected": diarized["num_speakers"],
+        "speakers": diarized["speakers"],
+        "duration": diarized["duration"],
+        "num_segments": len(diarized["segments"]),
+        "output_format": output_format
+    }
+
+
+def _diarize_video(
+    video_path: str,
+    num_speakers: Optional[int] = None,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+    language: str = "en",
+    cleanup_temp_files: bool = True,
+    embedding_batch_size: Optional[int] = None,
+    segmentation_batch_size: Optional[int] = None,
+    audio_path: Optional[str] = None,
+    embedding_precision: Optional[str] = None,
+    chunk_duration: Optional[float] = None,
+    clustering: Optional[str] = None,
+    skip_inactive_pairs: bool = True,
+    chunk_cache: bool = True,
+    embedding_backend: str = "torch"
+) -> Dict[str, Any]:
+    """
+    Transcribe and diarize a video, returning speaker-prefixed segments.
+
+    Output-format independent, so callers (and tests) can render the same
+    run as several formats via _write_speaker_transcript(). The audio is
+    extracted once and shared by transcription and diarization, unless
+    audio_path already points at an extracted WAV.
+
+    Returns:
+        {"segments": [...], "speakers": [...], "num_speakers": int, "duration": float}
+    """
+    from video_tools_mcp.processing import transcribe_audio_file
+    from video_tools_mcp.processing.diarization_merge import (
+        merge_transcription_with_diarization,
+        format_speaker_transcript
+    )
+    from video_tools_mcp.processing.audio_extraction import extract_audio
+
+    # Extract audio (temporary file) unless the caller already did
+    temp_audio = None
+    if audio_path is None:
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_audio:
+            temp_audio = audio_path = tmp_audio.name
 
     try:
-        extract_audio(str(video_path), audio_path)
+        if temp_audio is not None:
+            extract_audio(video_path, temp_audio)
 
-        # 3. Run transcription
+        # Run transcription
         logger.info("Running transcription with Parakeet...")
-        transcription_result = transcribe_video_file(
-            str(video_path),
-            language=language,
-            cleanup=False  # We'll manage cleanup
-        )
-
-        # 4. Run diarization
-        logger.info("Running speaker diarization with Pyannote...")
-        pyannote = PyannoteModel()
-        pyannote.ensure_loaded()
-        diarization_result = pyannote.diarize(
-            audio_path,
-            num_speakers=num_speakers,
-            min_speakers=min_speakers,
-            max_speakers=max_speakers
-        )
+        transcription_result = transcribe_audio_file(audio_path, language=language)
+
+        # Run diarization
+        if num_speakers == 1 or max_speakers == 1:
+            # A single speaker needs no segmentation, embeddings or clustering
+            logger.info("Single speaker requested, skipping Pyannote")
+            diarization_result = {
+                "segments": [{
+                    "start": 0.0,
+                    "end": transcription_result["duration"],
+                    "speaker": "SPEAKER_00"
+                }],
+                "speakers": ["SPEAKER_00"],
+                "num_speakers": 1
+            }
+        else:
+            from video_tools_mcp.models.pyannote import PyannoteModel
+
+            logger.info("Running speaker diarization with Pyannote...")
+            pyannote = PyannoteModel()
+            pyannote.ensure_loaded()
+            diarization_result = pyannote.diarize(
+                audio_path,
+                num_speakers=num_speakers,
+                min_speakers=min_speakers,
+                max_speakers=max_speakers,
+                embedding_batch_size=embedding_batch_size,
+                segmentation_batch_size=segmentation_batch_size,
+                embedding_precision=embedding_precision,
+                chunk_duration=chunk_duration,
+                clustering=clustering,
+                skip_inactive_pairs=skip_inactive_pairs,
+                chunk_cache=chunk_cache,
+                embedding_backend=embedding_backend
+            )
 
-        # 5. Merge transcription with diarization
+        # Merge transcription with diarization
         logger.info("Merging transcription with speaker labels...")
         merged_segments = merge_transcription_with_diarization(
             transcription_result,
             diarization_result
         )
 
-        # 6. Format with speaker prefixes
-        formatted_segments = format_speaker_transcript(merged_segments)
-
-        # 7. Generate output file
-        output_path = video_path.with_suffix(f".speakers.{output_format}")
-
-        if output_format == "srt":
-            write_srt_file(formatted_segments, str(output_path))
-        elif output_format == "json":
-            with open(output_path, 'w') as f:
-                json.dump({
-                    "segments": formatted_segments,
-                    "speakers": diarization_result["speakers"],
-                    "num_speakers": diarization_result["num_speakers"],
-                    "duration": transcription_result["duration"]
-                }, f, indent=2)
-        elif output_format == "txt":
-            with open(output_path, 'w') as f:
-                for seg in formatted_segments:
-                    f.write(f"{seg['text']}\n")
-
-        # 8. Cleanup
-        if cleanup_temp_files:
-            Path(audio_path).unlink(missing_ok=True)
-
-        logger.info(f"Speaker diarization complete: {output_path}")
-
         return {
-            "transcript_path": str(output_path),
-            "speakers_detected": diarization_result["num_speakers"],
+            # Speaker-prefixed text ("SPEAKER_00: ...")
+            "segments": format_speaker_transcript(merged_segments),
             "speakers": diarization_result["speakers"],
-            "duration": transcription_result["duration"],
-            "num_segments": len(formatted_segments),
-            "output_format": output_format
+            "num_speakers": diarization_result["num_speakers"],
+            "duration": transcription_result["duration"]
         }
 
     finally:
         # Ensure cleanup even if errors occur
-        if cleanup_temp_files and Path(audio_path).exists():
-            Path(audio_path).unlink(missing_ok=True)
+        if cleanup_temp_files and temp_audio is not None:
+            Path(temp_audio).unlink(missing_ok=True)
+
+
+def _write_speaker_transcript(diarized: Dict[str, Any], output_path: Path, output_format: str) -> None:
+    """Write _diarize_video() output as srt, json or txt."""
+    from video_tools_mcp.utils.srt_utils import write_srt_file
+
+    segments = diarized["segments"]
+
+    if output_format == "srt":
+        write_srt_file(segments, str(output_path))
+    elif output_format == "json":
+        with open(output_path, 'w') as f:
+            json.dump(diarized, f, indent=2)
+    elif output_format == "txt":
+        with open(output_path, 'w') as f:
+            for seg in segments:
+                f.write(f"{seg['text']}\n")
 
 
 @mcp.tool()
@@ -245,7 +367,8 @@ def extract_smart_screenshots(
     sample_interval: int = 5,
     similarity_threshold: float = 0.90,
     max_screenshots: int = 50,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    adaptive_sampling: bool = False
 ) -> dict:
     """
     AI-driven screenshot extraction with deduplication and auto-captioning.
@@ -257,23 +380,52 @@ def extract_smart_screenshots(
         similarity_threshold: pHash similarity % (default: 0.90)
         max_screenshots: Maximum to extract (default: 50)
         output_dir: Output directory (default: same as video)
+        adaptive_sampling: Sample at content changes instead of every
+            sample_interval seconds (default: False)
 
     Returns:
-        Dict with screenshots list, metadata_path, total_extracted, duplicates_removed, processing_time
+        Dict with screenshots list, metadata_path, total_extracted, duplicates_removed,
+        processing_time, decoder_backend ("cache" when restored from the
+        screenshot cache, which is enabled with VIDEO_TOOLS_SCREENSHOT_CACHE=1)
     """
-    from video_tools_mcp.processing.frame_extraction import FrameExtractor
-    from video_tools_mcp.models.qwen_vl import QwenVLModel
+    return _extract_smart_screenshots(
+        video_path,
+        extraction_prompt=extraction_prompt,
+        sample_interval=sample_interval,
+        similarity_threshold=similarity_threshold,
+        max_screenshots=max_screenshots,
+        output_dir=output_dir,
+        adaptive_sampling=adaptive_sampling
+    )
+
 
+def _extract_smart_screenshots(
+    video_path: str,
+    extraction_prompt: Optional[str] = None,
+    sample_interval: int = 5,
+    similarity_threshold: float = 0.90,
+    max_screenshots: int = 50,
+    output_dir: Optional[str] = None,
+    adaptive_sampling: bool = False,
+    precomputed_frames: Optional[list] = None
+) -> dict:
+    """
+    Implementation of extract_smart_screenshots.
+
+    precomputed_frames lets callers (the integration tests) supply FrameMetadata
+    already extracted at sample_interval, skipping the decode step. Those frames
+    are not deleted afterwards.
+    """
     start_time = time.time()
     video_path_obj = Path(video_path)
 
-    logger.info(f"Starting smart screenshot extraction: {video_path}")
-    logger.info(f"  interval={sample_interval}s, threshold={similarity_threshold}, max={max_screenshots}")
-
-    # Validate video file
+    # Validate video file before importing the model stack, so a bad path fails fast
     if not video_path_obj.exists():
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
+    logger.info(f"Starting smart screenshot extraction: {video_path}")
+    logger.info(f"  interval={sample_interval}s, threshold={similarity_threshold}, max={max_screenshots}")
+
     # Setup output directory
     if output_dir is None:
         output_dir_obj = video_path_obj.parent / f"{video_path_obj.stem}_screenshots"
@@ -286,15 +438,60 @@ def extract_smart_screenshots(
     prompt = extraction_prompt or DEFAULT_SCREENSHOT_EXTRACTION_PROMPT
     logger.info(f"  Using extraction prompt: {prompt[:80]}...")
 
-    # Step 1: Extract frames from video
-    logger.info("Extracting frames from video...")
-    frame_extractor = FrameExtractor(quality=95)  # Higher quality for screenshots
-    frames = frame_extractor.extract_frames_at_interval(
-        video_path_obj,
-        sample_interval=float(sample_interval),
-        max_frames=max_screenshots * 3  # Extract more to account for deduplication
-    )
-    logger.info(f"Extracted {len(frames)} initial frames")
+    # Frame decoding is cheap to import; MLX is only needed when the cache misses
+    from video_tools_mcp.processing.frame_extraction import FrameExtractor, resolve_decoder_backend
+
+    # Reuse a previous extraction of the same video with the same settings,
+    # model and generation parameters
+    cache_key = None
+    if cache_enabled():
+        cache_key = screenshot_cache_key(
+            video_path_obj,
+            extraction_prompt=prompt,
+            sample_interval=sample_interval,
+            similarity_threshold=similarity_threshold,
+            max_screenshots=max_screenshots,
+            adaptive_sampling=adaptive_sampling,
+            model_id=QWEN_VL_MODEL_ID,
+            model_config=load_config().qwen_vl.model_dump(),
+            eval_max_tokens=SCREENSHOT_EVAL_MAX_TOKENS,
+            eval_temperature=SCREENSHOT_EVAL_TEMPERATURE,
+            caption_prompt=SCREENSHOT_CAPTION_PROMPT,
+            caption_max_tokens=SCREENSHOT_CAPTION_MAX_TOKENS,
+            caption_temperature=SCREENSHOT_CAPTION_TEMPERATURE,
+            decoder_backend=(
+                "precomputed" if precomputed_frames is not None
+                else resolve_decoder_backend()
+            )
+        )
+        metadata = load_cached_screenshots(cache_key, output_dir_obj)
+        if metadata is not None:
+            metadata["video_path"] = str(video_path_obj)
+            metadata["processing_time"] = time.time() - start_time
+            return _write_screenshot_metadata(metadata, output_dir_obj, decoder_backend="cache")
+
+    from video_tools_mcp.models.qwen_vl import QwenVLModel
+
+    # Step 1: Extract frames from video (extra frames to account for deduplication)
+    max_frames = max_screenshots * 3
+    if precomputed_frames is not None:
+        frames = precomputed_frames[:max_frames]
+        decoder_backend = "precomputed"
+        logger.info(f"Using {len(frames)} precomputed frames")
+    else:
+        logger.info("Extracting frames from video...")
+        frame_extractor = FrameExtractor(quality=95)  # Higher quality for screenshots
+        extract = (
+            frame_extractor.extract_frames_adaptive if adaptive_sampling
+            else frame_extractor.extract_frames_at_interval
+        )
+        frames = extract(
+            video_path_obj,
+            sample_interval=float(sample_interval),
+            max_frames=max_frames
+        )
+        decoder_backend = frame_extractor.decoder_backend
+        logger.info(f"Extracted {len(frames)} initial frames ({decoder_backend} decode)")
 
     # Step 2: Deduplicate frames using pHash
     logger.info(f"Deduplicating frames (threshold={similarity_threshold})...")
@@ -323,58 +520,74 @@ def extract_smart_screenshots(
 
     screenshots_metadata = []
     kept_count = 0
+    timestamps_by_path = {f.frame_path: f.timestamp for f in frames}
 
-    for i, frame_path in enumerate(unique_paths):
-        logger.debug(f"Evaluating frame {i+1}/{len(unique_paths)}: {frame_path.name}")
+    # Temp frames are deleted afterwards, so kept ones can be moved (a rename on
+    # the same filesystem) instead of copied; caller-owned frames are copied
+    save_frame = shutil.copy2 if precomputed_frames is not None else shutil.move
 
-        try:
-            # Get AI decision
-            evaluation = qwen_model.analyze_frame(
-                str(frame_path),
-                evaluation_prompt,
-                max_tokens=256,
-                temperature=0.5
-            )
+    # Decode the next frame on a worker thread while Qwen VL runs on the current one
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        pending_images = [prefetcher.submit(qwen_model.load_image, str(unique_paths[0]))] if unique_paths else []
 
-            ai_response = evaluation["analysis"]
-            should_keep = "KEEP" in ai_response.upper()[:50]  # Check first 50 chars for decision
+        for i, frame_path in enumerate(unique_paths):
+            logger.debug(f"Evaluating frame {i+1}/{len(unique_paths)}: {frame_path.name}")
 
-            if should_keep:
-                # Generate caption
-                caption_result = qwen_model.analyze_frame(
+            image_future, pending_images[i] = pending_images[i], None
+            if i + 1 < len(unique_paths):
+                pending_images.append(prefetcher.submit(qwen_model.load_image, str(unique_paths[i + 1])))
+
+            try:
+                image = image_future.result()
+
+                # Get AI decision
+                evaluation = qwen_model.analyze_frame(
                     str(frame_path),
-                    "Describe this image in one concise sentence suitable as a caption.",
-                    max_tokens=128,
-                    temperature=0.7
+                    evaluation_prompt,
+                    max_tokens=SCREENSHOT_EVAL_MAX_TOKENS,
+                    temperature=SCREENSHOT_EVAL_TEMPERATURE,
+                    image=image
                 )
-                caption = caption_result["analysis"].strip()
-
-                # Copy frame to output directory
-                screenshot_filename = f"screenshot_{kept_count+1:05d}.jpg"
-                screenshot_path = output_dir_obj / screenshot_filename
-                shutil.copy2(frame_path, screenshot_path)
-
-                # Find original timestamp
-                frame_meta = next((f for f in frames if f.frame_path == frame_path), None)
-                timestamp = frame_meta.timestamp if frame_meta else 0.0
-
-                screenshots_metadata.append({
-                    "filename": screenshot_filename,
-                    "path": str(screenshot_path),
-                    "timestamp": timestamp,
-                    "caption": caption,
-                    "ai_reasoning": ai_response,
-                    "confidence": evaluation.get("confidence", 0.0)
-                })
-
-                kept_count += 1
-                logger.info(f"  KEPT: {caption[:60]}...")
-            else:
-                logger.debug(f"  SKIPPED: {ai_response[:80]}...")
 
-        except Exception as e:
-            logger.error(f"Failed to evaluate frame {frame_path}: {e}")
-            continue
+                ai_response = evaluation["analysis"]
+                should_keep = "KEEP" in ai_response.upper()[:50]  # Check first 50 chars for decision
+
+                if should_keep:
+                    # Generate caption from the same decoded image
+                    caption_result = qwen_model.analyze_frame(
+                        str(frame_path),
+                        SCREENSHOT_CAPTION_PROMPT,
+                        max_tokens=SCREENSHOT_CAPTION_MAX_TOKENS,
+                        temperature=SCREENSHOT_CAPTION_TEMPERATURE,
+                        image=image
+                    )
+                    caption = caption_result["analysis"].strip()
+
+                    # Save frame to output directory
+                    screenshot_filename = f"screenshot_{kept_count+1:05d}.jpg"
+                    screenshot_path = output_dir_obj / screenshot_filename
+                    save_frame(frame_path, screenshot_path)
+
+                    # Find original timestamp
+                    timestamp = timestamps_by_path.get(frame_path, 0.0)
+
+                    screenshots_metadata.append({
+                        "filename": screenshot_filename,
+                        "path": str(screenshot_path),
+                        "timestamp": timestamp,
+                        "caption": caption,
+                        "ai_reasoning": ai_response,
+                        "confidence": evaluation.get("confidence", 0.0)
+                    })
+
+                    kept_count += 1
+                    logger.info(f"  KEPT: {caption[:60]}...")
+                else:
+                    logger.debug(f"  SKIPPED: {ai_response[:80]}...")
+
+            except Exception as e:
+                logger.error(f"Failed to evaluate frame {frame_path}: {e}")
+                continue
 
     # Unload model
     qwen_model.unload()
@@ -397,14 +610,13 @@ def extract_smart_screenshots(
         "screenshots": screenshots_metadata
     }
 
-    metadata_path = output_dir_obj / "metadata.json"
-    with open(metadata_path, "w") as f:
-        json.dump(metadata, f, indent=2)
-    logger.info(f"Metadata saved to: {metadata_path}")
+    result = _write_screenshot_metadata(metadata, output_dir_obj, decoder_backend=decoder_backend)
+    if cache_key is not None:
+        store_screenshots(cache_key, metadata)
 
-    # Step 6: Cleanup temp frames
-    logger.info("Cleaning up temporary frames...")
-    if frames:
+    # Step 6: Cleanup temp frames (precomputed frames belong to the caller)
+    if frames and precomputed_frames is None:
+        logger.info("Cleaning up temporary frames...")
         temp_frame_dir = frames[0].frame_path.parent
         try:
             shutil.rmtree(temp_frame_dir)
@@ -414,12 +626,22 @@ def extract_smart_screenshots(
 
     logger.info(f"Smart screenshot extraction complete: {kept_count} screenshots saved in {processing_time:.1f}s")
 
+    return result
+
+
+def _write_screenshot_metadata(metadata: dict, output_dir: Path, decoder_backend: str) -> dict:
+    """Save screenshot metadata.json and build the extract_smart_screenshots result."""
+    metadata_path = output_dir / "metadata.json"
+    write_json(str(metadata_path), metadata)
+    logger.info(f"Metadata saved to: {metadata_path}")
+
     return {
-        "screenshots": [str(s["path"]) for s in screenshots_metadata],
+        "screenshots": [str(s["path"]) for s in metadata["screenshots"]],
         "metadata_path": str(metadata_path),
-        "total_extracted": kept_count,
-        "duplicates_removed": duplicates_removed,
-        "processing_time": processing_time
+        "total_extracted": metadata["screenshots_kept"],
+        "duplicates_removed": metadata["duplicates_removed"],
+        "processing_time": metadata["processing_time"],
+        "decoder_backend": decoder_backend
     }
 
 
@@ -447,8 +669,6 @@ def rename_speakers(
             "speakers_renamed": List[str]
         }
     """
-    from video_tools_mcp.utils.srt_utils import parse_srt_file, write_srt_file
-
     logger.info(f"Renaming speakers in: {srt_path}")
 
     # 1. Validate input file
@@ -456,33 +676,50 @@ def rename_speakers(
     if not srt_path.exists():
         raise ValueError(f"SRT file not found: {srt_path}")
 
-    # 2. Parse SRT file
-    segments = parse_srt_file(str(srt_path))
-
-    # 3. Create backup if requested
+    # 2. Create backup if requested
     backup_path = None
     if create_backup:
         backup_path = str(srt_path) + ".bak"
         shutil.copy(str(srt_path), backup_path)
         logger.info(f"Created backup: {backup_path}")
 
-    # 4. Apply speaker name replacements
+    # 3. Match a speaker prefix (e.g., "SPEAKER_00:") with one compiled regex;
+    # SRT files are UTF-8, so match and replace on bytes without decoding lines
+    new_names = {old.encode(): new.encode() for old, new in speaker_map.items()}
+    pattern = None
+    if new_names:
+        pattern = re.compile(
+            b"(" + b"|".join(re.escape(name) for name in sorted(new_names, key=len, reverse=True)) + b"):"
+        )
+
+    # 4. Stream the file line by line, renaming the first text line of each
+    # subtitle (the line after its timestamp), into a temp file beside the output
     replacements_made = 0
     speakers_renamed = set()
-
-    for segment in segments:
-        text = segment["text"]
-        for old_name, new_name in speaker_map.items():
-            # Match speaker prefix (e.g., "SPEAKER_00: ")
-            if text.startswith(f"{old_name}:"):
-                segment["text"] = text.replace(f"{old_name}:", f"{new_name}:", 1)
-                replacements_made += 1
-                speakers_renamed.add(old_name)
-                break
-
-    # 5. Write updated SRT file
     output = output_path or str(srt_path)
-    write_srt_file(segments, output)
+    tmp_output = output + ".tmp"
+
+    try:
+        with open(srt_path, "rb", buffering=SRT_IO_BUFFER_SIZE) as src, \
+                open(tmp_output, "wb", buffering=SRT_IO_BUFFER_SIZE) as dst:
+            after_timestamp = False
+            for line in src:
+                if after_timestamp and pattern is not None:
+                    match = pattern.match(line)
+                    if match:
+                        old_name = match.group(1)
+                        line = new_names[old_name] + line[match.end(1):]
+                        replacements_made += 1
+                        speakers_renamed.add(old_name.decode())
+                after_timestamp = b" --> " in line
+                dst.write(line)
+
+        # 5. Replace the output (may be the input file itself)
+        os.replace(tmp_output, output)
+    except BaseException:
+        # Never leave a partial temp file beside the user's file
+        Path(tmp_output).unlink(missing_ok=True)
+        raise
 
     logger.info(f"Speaker renaming complete: {replacements_made} replacements made")
 
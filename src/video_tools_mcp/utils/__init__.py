@@ -9,6 +9,7 @@ from .file_utils import (
     generate_temp_filename,
     get_video_duration,
     validate_video_path,
+    write_json,
 )
 from .srt_utils import (
     generate_srt,
@@ -18,12 +19,23 @@ from .srt_utils import (
     parse_timestamp,
 )
 from .image_utils import (
+    HammingBKTree,
     compute_phash,
     calculate_similarity,
+    hash_to_int,
+    hamming_cutoff,
+    hamming_distances,
     is_duplicate,
     deduplicate_frames,
     get_unique_frames_with_metadata,
 )
+from .screenshot_cache import (
+    cache_enabled,
+    get_screenshot_cache_dir,
+    load_cached_screenshots,
+    screenshot_cache_key,
+    store_screenshots,
+)
 
 __all__ = [
     'AudioExtractionError',
@@ -34,14 +46,24 @@ __all__ = [
     'generate_temp_filename',
     'get_video_duration',
     'validate_video_path',
+    'write_json',
     'generate_srt',
     'write_srt_file',
     'parse_srt_file',
     'format_timestamp',
     'parse_timestamp',
+    'HammingBKTree',
     'compute_phash',
     'calculate_similarity',
+    'hash_to_int',
+    'hamming_cutoff',
+    'hamming_distances',
     'is_duplicate',
     'deduplicate_frames',
     'get_unique_frames_with_metadata',
+    'cache_enabled',
+    'get_screenshot_cache_dir',
+    'load_cached_screenshots',
+    'screenshot_cache_key',
+    'store_screenshots',
 ]
@@ -7,20 +7,31 @@ This module provides utilities for:
 - Video duration extraction
 - Disk space checks
 - Temporary file management
+- JSON output files
 """
 
+import json
 import logging
+import os
 import shutil
 import time
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import ffmpeg
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 # Set up module logger
 logger = logging.getLogger(__name__)
 
+# Lowercase suffixes accepted by validate_video_path()
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'})
+
 
 # Custom Exceptions
 class VideoProcessingError(Exception):
@@ -49,8 +60,6 @@ def validate_video_path(path: str) -> bool:
         >>> validate_video_path("/path/to/missing.mp4")
         False
     """
-    video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'}
-
     try:
         file_path = Path(path)
 
@@ -70,7 +79,7 @@ def validate_video_path(path: str) -> bool:
             return False
 
         # Check for valid video extension
-        if file_path.suffix.lower() not in video_extensions:
+        if file_path.suffix.lower() not in VIDEO_EXTENSIONS:
             logger.warning(f"File does not have a valid video extension: {path}")
             return False
 
@@ -207,6 +216,11 @@ def check_disk_space(path: str, required_gb: float) -> bool:
         return False
 
 
+def _new_id() -> str:
+    """Random 8-character hex id for temp filenames."""
+    return uuid.uuid4().hex[:8]
+
+
 def generate_temp_filename(
     prefix: str,
     suffix: str,
@@ -231,8 +245,8 @@ def generate_temp_filename(
         >>> # Returns: /tmp/audio_a1b2c3d4.wav
     """
     try:
-        # Generate unique identifier using uuid4
-        unique_id = str(uuid.uuid4()).replace('-', '')[:8]
+        # Generate unique identifier
+        unique_id = _new_id()
 
         # Ensure suffix starts with dot
         if not suffix.startswith('.'):
@@ -259,6 +273,28 @@ def generate_temp_filename(
         return filename
 
 
+def write_json(path: str, data: Any) -> None:
+    """
+    Write data to a JSON file with 2-space indentation.
+
+    Uses orjson when it is installed (several times faster than the
+    pure-Python indenting encoder in the json module), otherwise json.
+
+    Args:
+        path: Output file path
+        data: JSON-serializable data
+
+    Example:
+        >>> write_json("/tmp/out/metadata.json", {"screenshots": []})
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
 def cleanup_temp_files(directory: str, max_age_hours: int = 24) -> int:
     """
     Delete temporary files older than specified age.
@@ -294,27 +330,26 @@ def cleanup_temp_files(directory: str, max_age_hours: int = 24) -> int:
         max_age_seconds = max_age_hours * 3600
         cutoff_time = current_time - max_age_seconds
 
-        # Iterate through files in directory
-        for file_path in dir_path.iterdir():
-            try:
-                # Skip directories
-                if not file_path.is_file():
+        # Iterate through files in directory; scandir entries carry their
+        # file type, so only files are stat()ed
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    # Skip directories
+                    if not entry.is_file():
+                        continue
+
+                    if entry.stat().st_mtime < cutoff_time:
+                        # Delete old file
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                        logger.info(f"Deleted old temporary file: {entry.path}")
+
+                except Exception as e:
+                    logger.error(f"Error deleting file {entry.path}: {e}")
+                    # Continue with other files even if one fails
                     continue
 
-                # Check file age
-                file_mtime = file_path.stat().st_mtime
-
-                if file_mtime < cutoff_time:
-                    # Delete old file
-                    file_path.unlink()
-                    deleted_count += 1
-                    logger.info(f"Deleted old temporary file: {file_path}")
-
-            except Exception as e:
-                logger.error(f"Error deleting file {file_path}: {e}")
-                # Continue with other files even if one fails
-                continue
-
         logger.info(f"Cleanup completed: {deleted_count} files deleted from {directory}")
         return deleted_count
 
@@ -6,13 +6,99 @@ and detecting duplicate or similar frames in video processing.
 """
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional
+import numpy as np
 from PIL import Image
 import imagehash
 
 logger = logging.getLogger(__name__)
 
+# Thumbnail side is hash_size * PHASH_HIGHFREQ_FACTOR, as in imagehash.phash
+PHASH_HIGHFREQ_FACTOR = 4
+
+# Kept-frame count at which deduplication switches from a linear scan to a BK-tree
+BKTREE_MIN_SIZE = 64
+
+
+class HammingBKTree:
+    """
+    BK-tree over integer hashes with Hamming distance as the metric.
+
+    Finds stored hashes within a distance of a query without comparing
+    against every entry: the triangle inequality limits the search to
+    children whose edge distance is within the cutoff of the node distance.
+    """
+
+    def __init__(self):
+        """Initialize an empty tree."""
+        self._root = None  # [hash, index, {distance: child}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, index: int) -> None:
+        """
+        Insert a hash.
+
+        Args:
+            value: Packed hash (see hash_to_int())
+            index: Caller's identifier returned by find()
+        """
+        self._size += 1
+        if self._root is None:
+            self._root = [value, index, {}]
+            return
+
+        node = self._root
+        while True:
+            distance = (value ^ node[0]).bit_count()
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, index, {}]
+                return
+            node = child
+
+    def find(self, value: int, max_distance: int) -> Optional[int]:
+        """
+        Find the earliest-inserted hash within max_distance of value.
+
+        Args:
+            value: Packed hash to look up
+            max_distance: Largest Hamming distance that counts as a match
+
+        Returns:
+            Index of the matching entry with the lowest index, or None
+        """
+        best = None
+        stack = [self._root] if self._root is not None else []
+
+        while stack:
+            node = stack.pop()
+            distance = (value ^ node[0]).bit_count()
+            if distance <= max_distance and (best is None or node[1] < best):
+                best = node[1]
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        return best
+
+
+@lru_cache(maxsize=8)
+def _dct_basis(size: int, hash_size: int) -> np.ndarray:
+    """
+    Rows of the unnormalized DCT-II matrix for the lowest hash_size frequencies.
+
+    Matches scipy.fftpack.dct(type=2, norm=None), so basis @ x equals the
+    first hash_size coefficients of dct(x).
+    """
+    k = np.arange(hash_size)[:, None]
+    n = np.arange(size)[None, :]
+    return 2.0 * np.cos(np.pi * k * (2 * n + 1) / (2 * size))
+
 
 def compute_phash(image_path: Path, hash_size: int = 8) -> imagehash.ImageHash:
     """
@@ -34,7 +120,21 @@ def compute_phash(image_path: Path, hash_size: int = 8) -> imagehash.ImageHash:
 
     try:
         image = Image.open(image_path)
-        phash = imagehash.phash(image, hash_size=hash_size)
+        # pHash only looks at a (hash_size * 4)^2 grayscale thumbnail, so let
+        # the JPEG decoder produce a downscaled grayscale image directly
+        # (no-op for other formats)
+        thumb_size = hash_size * PHASH_HIGHFREQ_FACTOR
+        image.draft("L", (thumb_size, thumb_size))
+        pixels = np.asarray(
+            image.convert("L").resize((thumb_size, thumb_size), Image.LANCZOS),
+            dtype=np.float64
+        )
+
+        # Same result as imagehash.phash, but only the low-frequency block of
+        # the 2D DCT is computed (two small matrix products, no full DCT)
+        basis = _dct_basis(thumb_size, hash_size)
+        dct_low = basis @ pixels @ basis.T
+        phash = imagehash.ImageHash(dct_low > np.median(dct_low))
         logger.debug(f"Computed pHash for {image_path.name}: {phash}")
         return phash
     except Exception as e:
@@ -66,6 +166,61 @@ def calculate_similarity(hash1: imagehash.ImageHash, hash2: imagehash.ImageHash)
     return similarity
 
 
+def hash_to_int(image_hash: imagehash.ImageHash) -> int:
+    """
+    Pack a perceptual hash into a Python int (64 bits for hash_size=8).
+
+    Args:
+        image_hash: Image hash from compute_phash()
+
+    Returns:
+        Integer whose set bits are the hash bits
+    """
+    return int(str(image_hash), 16)
+
+
+def hamming_cutoff(threshold: float, hash_size: int = 8) -> int:
+    """
+    Convert a similarity threshold into a maximum Hamming distance.
+
+    Uses the same arithmetic as calculate_similarity(), so
+    ``hamming(a, b) <= hamming_cutoff(t)`` holds exactly when
+    ``calculate_similarity(a, b) >= t``. For 64-bit hashes, 0.90 maps to 6 bits.
+
+    Args:
+        threshold: Similarity threshold (0.0 to 1.0)
+        hash_size: Hash size used for pHash computation
+
+    Returns:
+        Largest Hamming distance still counted as a duplicate (-1 if none)
+    """
+    max_distance = hash_size * hash_size
+    cutoff = -1
+    for distance in range(max_distance + 1):
+        if 1.0 - (distance / max_distance) < threshold:
+            break
+        cutoff = distance
+    return cutoff
+
+
+def hamming_distances(hashes: np.ndarray, value: int) -> np.ndarray:
+    """
+    Compute Hamming distances from one 64-bit hash to an array of hashes.
+
+    Args:
+        hashes: 1-D np.uint64 array of packed hashes
+        value: Packed hash to compare against (see hash_to_int())
+
+    Returns:
+        Array of bit distances, one per entry in hashes
+    """
+    xors = np.bitwise_xor(hashes, np.uint64(value))
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xors)
+    # NumPy < 2.0 has no popcount ufunc
+    return np.unpackbits(xors.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
 def is_duplicate(
     image_path1: Path,
     image_path2: Path,
@@ -125,47 +280,58 @@ def deduplicate_frames(
 
     logger.info(f"Deduplicating {len(frame_paths)} frames (threshold={threshold})")
 
-    # Compute hashes for all frames
-    frame_hashes = []
+    cutoff = hamming_cutoff(threshold, hash_size)
+
+    # Hashes up to 64 bits are compared in one vectorized pass per frame
+    vectorized = hash_size * hash_size <= 64
+    kept_array = np.empty(len(frame_paths), dtype=np.uint64)
+
+    kept = []
+    removed = []
+    kept_hashes = []  # (frame_path, hash as int) for hashed kept frames
+    tree = None  # built once enough frames are kept for it to beat a scan
+
     for frame_path in frame_paths:
         try:
-            phash = compute_phash(frame_path, hash_size)
-            frame_hashes.append((frame_path, phash))
+            frame_hash = hash_to_int(compute_phash(frame_path, hash_size))
         except Exception as e:
             logger.warning(f"Failed to compute hash for {frame_path}: {e}")
             # Keep frames we can't hash
-            frame_hashes.append((frame_path, None))
-
-    kept = []
-    removed = []
-
-    for i, (frame_path, frame_hash) in enumerate(frame_hashes):
-        if frame_hash is None:
-            # Keep frames without hashes
             kept.append(frame_path)
             continue
 
-        is_duplicate = False
-
-        # Check against all kept frames
-        for kept_path, kept_hash in [(p, h) for p, h in frame_hashes[:i] if p in kept]:
-            if kept_hash is None:
-                continue
-
-            similarity = calculate_similarity(frame_hash, kept_hash)
-
-            if similarity >= threshold:
-                is_duplicate = True
-                logger.debug(
-                    f"Frame {frame_path.name} is duplicate of {kept_path.name} "
-                    f"(similarity={similarity:.3f})"
-                )
-                break
+        if tree is None and len(kept_hashes) >= BKTREE_MIN_SIZE:
+            tree = HammingBKTree()
+            for index, (_, kept_hash) in enumerate(kept_hashes):
+                tree.add(kept_hash, index)
+
+        # Check against all kept frames (first match wins)
+        duplicate_of = None
+        if tree is not None:
+            match = tree.find(frame_hash, cutoff)
+            if match is not None:
+                duplicate_of = kept_hashes[match][0]
+        elif vectorized:
+            distances = hamming_distances(kept_array[:len(kept_hashes)], frame_hash)
+            matches = np.flatnonzero(distances <= cutoff)
+            if matches.size:
+                duplicate_of = kept_hashes[matches[0]][0]
+        else:
+            for kept_path, kept_hash in kept_hashes:
+                if (frame_hash ^ kept_hash).bit_count() <= cutoff:
+                    duplicate_of = kept_path
+                    break
 
-        if is_duplicate:
+        if duplicate_of is not None:
             removed.append(frame_path)
+            logger.debug(f"Frame {frame_path.name} is duplicate of {duplicate_of.name}")
         else:
             kept.append(frame_path)
+            if tree is not None:
+                tree.add(frame_hash, len(kept_hashes))
+            elif vectorized:
+                kept_array[len(kept_hashes)] = frame_hash
+            kept_hashes.append((frame_path, frame_hash))
 
     logger.info(
         f"Deduplication complete: kept {len(kept)}/{len(frame_paths)} frames "
@@ -0,0 +1,182 @@
+"""
+On-disk cache for smart screenshot extraction results.
+
+Extraction (frame decode, deduplication, Qwen VL evaluation and captioning)
+is keyed on a cheap fingerprint of the video plus the extraction parameters,
+model and generation settings. A cache hit hard-links the stored screenshots
+into the requested output directory instead of re-running the pipeline.
+
+The cache is opt-in: set VIDEO_TOOLS_SCREENSHOT_CACHE=1 to enable it.
+VIDEO_TOOLS_NO_CACHE=1 always bypasses it. Only the MAX_CACHE_ENTRIES most
+recently stored sets are kept.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from video_tools_mcp.utils.file_utils import write_json
+
+# Set up module logger
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from the start of the video for the cache key
+FINGERPRINT_BYTES = 1 << 20
+
+# Cached screenshot sets kept on disk; older ones are evicted on store
+MAX_CACHE_ENTRIES = 32
+
+
+def cache_enabled() -> bool:
+    """Return True when VIDEO_TOOLS_SCREENSHOT_CACHE=1 and VIDEO_TOOLS_NO_CACHE is not 1."""
+    return (
+        os.getenv("VIDEO_TOOLS_SCREENSHOT_CACHE") == "1"
+        and os.getenv("VIDEO_TOOLS_NO_CACHE") != "1"
+    )
+
+
+def get_screenshot_cache_dir() -> Path:
+    """
+    Get the directory holding cached screenshot sets.
+
+    Uses <VIDEO_TOOLS_CACHE_DIR>/screenshots when configured,
+    otherwise ~/.cache/video_tools/screenshots.
+
+    Returns:
+        Path to the cache directory (may not exist yet)
+    """
+    cache_dir = os.getenv("VIDEO_TOOLS_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir).expanduser() / "screenshots"
+    return Path.home() / ".cache" / "video_tools" / "screenshots"
+
+
+def screenshot_cache_key(video_path: Path, **params: Any) -> str:
+    """
+    Build a cache key for a video and its extraction parameters.
+
+    Hashes the first 1 MiB of the video together with its size and mtime,
+    so the whole file never has to be read.
+
+    Args:
+        video_path: Path to video file
+        **params: Extraction parameters that affect the result
+
+    Returns:
+        Hex digest identifying this extraction
+    """
+    st = video_path.stat()
+    digest = hashlib.sha1()
+
+    with open(video_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+
+    digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Hard-link src to dst, copying when linking is not possible.
+
+    Links fail across devices and on filesystems without hard-link support.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        dst.unlink()
+        _link_or_copy(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def load_cached_screenshots(key: str, output_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Restore a cached screenshot set into output_dir.
+
+    Screenshots are hard-linked from the cache where possible, so a hit
+    does not copy any image data.
+
+    Args:
+        key: Key from screenshot_cache_key()
+        output_dir: Directory to place the screenshots in
+
+    Returns:
+        Cached metadata with paths rewritten to output_dir, or None on a miss
+    """
+    entry_dir = get_screenshot_cache_dir() / key
+    metadata_path = entry_dir / "metadata.json"
+
+    if not metadata_path.exists():
+        return None
+
+    try:
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+
+        for screenshot in metadata["screenshots"]:
+            screenshot_path = output_dir / screenshot["filename"]
+            _link_or_copy(entry_dir / screenshot["filename"], screenshot_path)
+            screenshot["path"] = str(screenshot_path)
+
+    except (OSError, KeyError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable screenshot cache entry {key}: {e}")
+        return None
+
+    metadata["output_dir"] = str(output_dir)
+    logger.info(f"Restored {len(metadata['screenshots'])} cached screenshots ({key[:12]})")
+    return metadata
+
+
+def _evict_old_entries(cache_root: Path, keep: int) -> None:
+    """Delete all but the `keep` most recently stored cache entries."""
+    with os.scandir(cache_root) as it:
+        entries = [
+            entry for entry in it
+            if entry.is_dir() and not entry.name.endswith(".tmp")
+        ]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+        logger.debug(f"Evicted cached screenshots ({entry.name[:12]})")
+
+
+def store_screenshots(key: str, metadata: Dict[str, Any]) -> None:
+    """
+    Save a screenshot set and its metadata in the cache.
+
+    Failures are logged and otherwise ignored; caching is best effort.
+    Storing evicts the oldest entries beyond MAX_CACHE_ENTRIES.
+
+    Args:
+        key: Key from screenshot_cache_key()
+        metadata: Extraction metadata whose screenshots point at saved files
+    """
+    entry_dir = get_screenshot_cache_dir() / key
+    tmp_dir = entry_dir.with_name(f"{key}.tmp")
+
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        for screenshot in metadata["screenshots"]:
+            shutil.copy2(screenshot["path"], tmp_dir / screenshot["filename"])
+
+        write_json(str(tmp_dir / "metadata.json"), metadata)
+
+        # Publish atomically so readers never see a partial entry
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        logger.debug(f"Cached {len(metadata['screenshots'])} screenshots ({key[:12]})")
+
+        _evict_old_entries(entry_dir.parent, MAX_CACHE_ENTRIES)
+
+    except OSError as e:
+        logger.warning(f"Failed to cache screenshots: {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -1,38 +1,103 @@
+import argparse
+import atexit
+import errno
 import os
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 import shutil
 import logging
-from typing import Optional, List
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, Optional, Tuple
 import sys
+import queue
+import threading
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
+# Sentinel pushed by the scanner thread once the DCIM walk is finished
+_SCAN_DONE = object()
+
+# Lowercased extension -> media type, checked once per scanned file
+_EXT_TYPE = (
+    {ext: 'video' for ext in ('.mp4', '.mov', '.avi', '.mkv', '.m4v', '.3gp')}
+    | {ext: 'photo' for ext in ('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.heic', '.heif')}
+)
+
+# Linux FICLONE ioctl: reflink the whole file on btrfs/XFS (no data copied)
+_FICLONE = 0x40049409
+
+
+def _copy_linux(src: str, dst: str, size: Optional[int] = None) -> None:
+    """Copy src to dst entirely in the kernel (reflink, else copy_file_range)."""
+    import fcntl
+
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            remaining = size if size is not None else os.fstat(s.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    shutil.copystat(src, dst)
+
+
+def copy_file(src: str, dst: str, size: Optional[int] = None) -> None:
+    """Copy a file with its metadata, using the in-kernel path when available.
+
+    Pass the size already known from the scan to skip re-stat'ing src.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            _copy_linux(src, dst, size)
+            return
+        except OSError as e:
+            # Older kernels / filesystems without support: use the portable path
+            if e.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+    shutil.copy2(src, dst)
+
+
 class CameraSync:
-    def __init__(self, dcim_path: str, output_base: str, max_workers: int = 4):
+    def __init__(self, dcim_path: str, output_base: str, max_workers: int = 4, move_files: bool = False):
         self.dcim_path = Path(dcim_path)
         self.output_base = Path(output_base)
         self.max_workers = max_workers
+        self.move_files = move_files
         self.setup_logging()
 
     def setup_logging(self):
+        # Workers only enqueue records; a single listener thread does the
+        # actual file/console writes so copies never block on log I/O
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler('sync.log'),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        self.log_listener = QueueListener(log_queue, *handlers)
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('sync.log'),
-                logging.StreamHandler()
-            ]
+            format='%(message)s',
+            handlers=[QueueHandler(log_queue)]
         )
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)
         self.logger = logging.getLogger(__name__)
 
-    def get_file_date(self, file_path: Path) -> Optional[datetime]:
+    def get_file_date(self, entry: os.DirEntry) -> Optional[tuple[float, int]]:
+        """Return (timestamp, size) from the entry's single cached stat."""
+        stat = entry.stat()
         try:
-            stat = file_path.stat()
-            return datetime.fromtimestamp(stat.st_birthtime)
+            return stat.st_birthtime, stat.st_size
         except AttributeError:
-            return datetime.fromtimestamp(file_path.stat().st_mtime)
+            return stat.st_mtime, stat.st_size
 
     def get_day_suffix(self, day: int) -> str:
         if 10 <= day % 100 <= 20:
@@ -41,7 +106,7 @@ class CameraSync:
             suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
         return str(day) + suffix
 
-    def create_date_folder(self, date: datetime, file_type: str = 'video') -> Path:
+    def create_date_folder(self, date: date, file_type: str = 'video') -> Path:
         year_folder = str(date.year)
         month_folder = date.strftime("%B")
         day_folder = self.get_day_suffix(date.day)
@@ -54,45 +119,76 @@ class CameraSync:
         folder.mkdir(parents=True, exist_ok=True)
         return folder
 
-    def get_media_files(self) -> List[tuple[Path, datetime, str]]:
-        video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.m4v', '.3gp'}
-        photo_extensions = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.heic', '.heif'}
-        media_files = []
+    def get_media_files(self) -> Iterator[tuple[str, float, int, str]]:
+        """Yield media files as (path str, timestamp, size, type) tuples while scanning.
+
+        Directories are walked in name order so per-day numbering follows the
+        camera's own file numbering.
+        """
+        pending_dirs = [str(self.dcim_path)]
+        while pending_dirs:
+            with os.scandir(pending_dirs.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+
+                name = entry.name
+                dot = name.rfind('.')
+                if dot < 0:
+                    continue
+                file_type = _EXT_TYPE.get(name[dot:].lower())
+                if file_type is None:
+                    continue
 
-        for file_path in self.dcim_path.rglob('*'):
-            if file_path.is_file():
-                suffix_lower = file_path.suffix.lower()
-                file_type = None
-                if suffix_lower in video_extensions:
-                    file_type = 'video'
-                elif suffix_lower in photo_extensions:
-                    file_type = 'photo'
+                file_stat = self.get_file_date(entry)
+                if file_stat:
+                    yield (entry.path, file_stat[0], file_stat[1], file_type)
 
-                if file_type:
-                    file_date = self.get_file_date(file_path)
-                    if file_date:
-                        media_files.append((file_path, file_date, file_type))
+            pending_dirs.extend(reversed(subdirs))
 
-        return sorted(media_files, key=lambda x: x[1])
+    def scan_into_queue(self, file_queue: queue.Queue) -> None:
+        """Producer: push scanned files onto the queue, then _SCAN_DONE (or the scan error)."""
+        try:
+            for file_info in self.get_media_files():
+                file_queue.put(file_info)
+            file_queue.put(_SCAN_DONE)
+        except Exception as e:
+            file_queue.put(e)
 
-    def generate_new_filename(self, index: int, date: datetime, file_type: str, original_ext: str) -> str:
+    def get_filename_template(self, date: date, file_type: str) -> str:
+        """Build the per-day filename template, e.g. 'video-{idx:03d}-2024-03-01'."""
         if file_type == 'video':
-            return f"video-{index:03d}-{date.strftime('%Y-%m-%d')}{original_ext}"
+            return f"video-{{idx:03d}}-{date.strftime('%Y-%m-%d')}"
         else:  # photo
-            return f"photo-{index:03d}-{date.strftime('%Y-%m-%d')}{original_ext}"
+            return f"photo-{{idx:03d}}-{date.strftime('%Y-%m-%d')}"
 
-    def process_file(self, file_info: tuple[Path, datetime, str], idx: int, processed_count: int, total_files: int) -> tuple[bool, bool]:
-        file_path, file_date, file_type = file_info
-        dest_folder = self.create_date_folder(file_date, file_type)
-        new_filename = self.generate_new_filename(idx, file_date, file_type, file_path.suffix.lower())
+    def process_file(self, file_path: str, file_size: int, idx: int, dest_folder: Path, name_template: str, total_files: int) -> tuple[bool, bool]:
+        new_filename = name_template.format(idx=idx) + os.path.splitext(file_path)[1].lower()
         dest_file = dest_folder / new_filename
 
         if dest_file.exists():
             self.logger.info(f"File already exists: {dest_file}")
             return (False, True)
+        elif self.move_files:
+            try:
+                # Same filesystem: a rename is a metadata-only operation
+                os.rename(file_path, str(dest_file))
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Cross-device: fall back to copy + unlink
+                shutil.move(file_path, str(dest_file))
+            self.logger.info(f"Moved: {os.path.basename(file_path)} -> {new_filename}")
+            return (True, False)
         else:
-            shutil.copy2(str(file_path), str(dest_file))
-            self.logger.info(f"Copied: {file_path.name} -> {new_filename}")
+            copy_file(file_path, str(dest_file), file_size)
+            self.logger.info(f"Copied: {os.path.basename(file_path)} -> {new_filename}")
             return (True, False)
 
     def sync_files(self) -> bool:
@@ -101,64 +197,79 @@ class CameraSync:
             return False
 
         try:
-            files_to_process = self.get_media_files()
-            if not files_to_process:
-                self.logger.info("No media files found to process.")
-                return True
-
-            total_files = len(files_to_process)
             files_moved = 0
             skipped = 0
 
             self.logger.info("\nStarting file sync...")
             print("-" * 50)
 
-            date_groups = {}
-            for file_path, file_date, file_type in files_to_process:
-                date_key = file_date.date()
-                if date_key not in date_groups:
-                    date_groups[date_key] = {'video': [], 'photo': []}
-                date_groups[date_key][file_type].append((file_path, file_date, file_type))
+            # Scan on a producer thread so copying starts with the first file
+            # found instead of waiting for the whole tree to be walked
+            file_queue = queue.Queue(maxsize=1024)
+            scanner = threading.Thread(target=self.scan_into_queue, args=(file_queue,), daemon=True)
+            scanner.start()
 
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # (date, type) -> files seen so far; each type keeps its own counter
+            day_counts: Dict[Tuple[date, str], int] = {}
+            # (date, type) -> (dest folder, filename template)
+            day_targets: Dict[Tuple[date, str], Tuple[Path, str]] = {}
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                    tqdm(total=None, desc="Syncing files", unit="file") as progress:
                 futures = []
 
-                for date_key, day_files_by_type in date_groups.items():
-                    # Process videos with their own counter
-                    for idx, file_info in enumerate(day_files_by_type['video'], 1):
-                        future = executor.submit(
-                            self.process_file,
-                            file_info,
-                            idx,
-                            0,  # We don't need processed_count anymore
-                            total_files
-                        )
-                        futures.append(future)
-
-                    # Process photos with their own counter
-                    for idx, file_info in enumerate(day_files_by_type['photo'], 1):
-                        future = executor.submit(
-                            self.process_file,
-                            file_info,
-                            idx,
-                            0,  # We don't need processed_count anymore
-                            total_files
+                while True:
+                    file_info = file_queue.get()
+                    if file_info is _SCAN_DONE:
+                        break
+                    if isinstance(file_info, Exception):
+                        raise file_info
+
+                    file_path, timestamp, file_size, file_type = file_info
+                    date_key = datetime.fromtimestamp(timestamp).date()
+
+                    target_key = (date_key, file_type)
+                    idx = day_counts.get(target_key, 0) + 1
+                    day_counts[target_key] = idx
+                    if idx == 1:
+                        # Folder and filename template are built once per date
+                        # rather than once per file
+                        day_targets[target_key] = (
+                            self.create_date_folder(date_key, file_type),
+                            self.get_filename_template(date_key, file_type)
                         )
-                        futures.append(future)
+                    dest_folder, name_template = day_targets[target_key]
+
+                    future = executor.submit(
+                        self.process_file,
+                        file_path,
+                        file_size,
+                        idx,
+                        dest_folder,
+                        name_template,
+                        0  # Total is unknown until the scan finishes
+                    )
+                    future.add_done_callback(lambda _: progress.update(1))
+                    futures.append(future)
+
+                total_files = len(futures)
+                progress.total = total_files
+                progress.refresh()
 
-                # Using tqdm to track the completion of futures
-                for future in tqdm(concurrent.futures.as_completed(futures),
-                                 total=len(futures),
-                                 desc="Syncing files",
-                                 unit="file"):
+                for future in concurrent.futures.as_completed(futures):
                     was_moved, was_skipped = future.result()
                     if was_moved:
                         files_moved += 1
                     if was_skipped:
                         skipped += 1
 
+            if total_files == 0:
+                self.logger.info("No media files found to process.")
+                return True
+
             self.logger.info("\nSync complete:")
-            self.logger.info(f"Files copied: {files_moved}")
+            action = "moved" if self.move_files else "copied"
+            self.logger.info(f"Files {action}: {files_moved}")
             self.logger.info(f"Files skipped: {skipped}")
             self.logger.info(f"Total processed: {files_moved + skipped}")
             return True
@@ -169,9 +280,33 @@ class CameraSync:
 
 
 def main():
-    dcim_path = "/Volumes/MicroSD/DCIM"
-    output_base = "/Volumes/External"
-    syncer = CameraSync(dcim_path, output_base)
+    parser = argparse.ArgumentParser(
+        description="Sort camera media into dated folders on an external drive"
+    )
+    parser.add_argument(
+        "--dcim",
+        default="/Volumes/MicroSD/DCIM",
+        help="Camera DCIM directory to read from"
+    )
+    parser.add_argument(
+        "--output",
+        default="/Volumes/External",
+        help="Base directory for the dated folders"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files transferred concurrently"
+    )
+    parser.add_argument(
+        "--move",
+        action="store_true",
+        help="Move files instead of copying them (removes them from the card)"
+    )
+    args = parser.parse_args()
+
+    syncer = CameraSync(args.dcim, args.output, max_workers=args.workers, move_files=args.move)
     success = syncer.sync_files()
     return 0 if success else 1
 
@@ -3,28 +3,70 @@ Pytest configuration and shared fixtures for video-tools-mcp tests.
 
 This module provides common fixtures used across unit and integration tests:
 - Temporary directory management
-- Mock video files
+- Mock video files (session-scoped, read-only)
 - Environment variable mocking
 - Configuration fixtures
 """
 
+import functools
 import os
+import re
+import sys
 import tempfile
+import time
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, FrozenSet
 
 import pytest
 
 
+# Extensions used by the sample_video_files fixture
+VIDEO_EXTS = frozenset({"mp4", "mov", "avi", "mkv", "webm"})
+
+# Environment used by mock_env_vars; clean_env_vars removes the same keys
+_MOCK_ENV = (
+    ("HF_TOKEN", "test_token_123"),
+    ("VIDEO_TOOLS_CACHE_DIR", "/tmp/test_cache"),
+    ("VIDEO_TOOLS_TEMP_DIR", "/tmp/test_temp"),
+    ("VIDEO_TOOLS_KEEP_TEMP", "true"),
+)
+_CLEAN_VARS = tuple(key for key, _ in _MOCK_ENV)
+
+# Contents of the mock_srt_path fixture file
+_MOCK_SRT_BYTES = (
+    b"1\n"
+    b"00:00:00,000 --> 00:00:05,000\n"
+    b"Speaker 1: Hello, this is a test.\n"
+    b"\n"
+    b"2\n"
+    b"00:00:05,000 --> 00:00:10,000\n"
+    b"Speaker 2: Yes, I agree.\n"
+    b"\n"
+    b"3\n"
+    b"00:00:10,000 --> 00:00:15,000\n"
+    b"Speaker 1: Great, let's continue.\n"
+)
+
+
+@pytest.fixture(scope="session")
+def _session_tmp(tmp_path_factory):
+    """Session-wide parent of the per-test ``temp_dir`` directories."""
+    return tmp_path_factory.mktemp("tests")
+
+
 @pytest.fixture
-def temp_dir():
+def temp_dir(_session_tmp, request):
     """
     Create a temporary directory for tests.
 
-    Automatically cleaned up after test completion.
+    Each test gets its own fresh subdirectory of one session-scoped base
+    directory. Nothing is removed per test; pytest prunes old base
+    directories between sessions, so tests avoid a mkdtemp/rmtree round
+    trip each.
 
-    Yields:
-        Path: Temporary directory path
+    Returns:
+        Path: Temporary directory path, empty and unique to this test
 
     Example:
         >>> def test_file_creation(temp_dir):
@@ -32,21 +74,58 @@ def temp_dir():
         ...     test_file.write_text("hello")
         ...     assert test_file.exists()
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    name = re.sub(r"[^\w.-]", "_", request.node.name)[:40]
+    return Path(tempfile.mkdtemp(prefix=f"{name}-", dir=_session_tmp))
 
 
 @pytest.fixture
-def mock_video_path(temp_dir):
+def fake_temp_dir(fs):
+    """
+    Create a temporary directory on a pyfakefs in-memory filesystem.
+
+    For tests that only create, stat and delete small files: nothing
+    touches the disk, so they are fast and need no cleanup. Tests that
+    hand paths to subprocesses (ffmpeg) must use ``temp_dir`` instead.
+
+    Returns:
+        Path: Empty directory on the fake filesystem
+    """
+    return Path(fs.create_dir("/tmp/t").path)
+
+
+@pytest.fixture(scope="session")
+def home_dir():
+    """The user's home directory as a string, resolved once per session."""
+    return str(Path.home())
+
+
+@pytest.fixture(scope="session")
+def shared_temp_dir(tmp_path_factory):
+    """
+    Create a temporary directory shared by the whole test session.
+
+    Backs the read-only mock file fixtures below so they are created
+    once per session instead of once per test. Tests that write files
+    should use the function-scoped ``temp_dir`` instead.
+
+    Returns:
+        Path: Session-wide temporary directory path
+    """
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture(scope="session")
+def mock_video_path(shared_temp_dir):
     """
     Create a mock video file for testing.
 
-    Creates an empty .mp4 file in temp directory.
+    Creates an empty .mp4 file once per session.
     Note: This is just an empty file with video extension,
-    not a real video file with encoded data.
+    not a real video file with encoded data. It is shared
+    across tests, so treat it as read-only.
 
     Args:
-        temp_dir: Temporary directory fixture
+        shared_temp_dir: Session-wide temporary directory fixture
 
     Returns:
         str: Path to mock video file
@@ -56,56 +135,45 @@ def mock_video_path(temp_dir):
         ...     assert Path(mock_video_path).exists()
         ...     assert mock_video_path.endswith(".mp4")
     """
-    video_file = temp_dir / "test_video.mp4"
+    video_file = shared_temp_dir / "test_video.mp4"
     video_file.touch()  # Create empty file
     return str(video_file)
 
 
-@pytest.fixture
-def mock_audio_path(temp_dir):
+@pytest.fixture(scope="session")
+def mock_audio_path(shared_temp_dir):
     """
     Create a mock audio file for testing.
 
-    Creates an empty .wav file in temp directory.
+    Creates an empty .wav file once per session (read-only).
 
     Args:
-        temp_dir: Temporary directory fixture
+        shared_temp_dir: Session-wide temporary directory fixture
 
     Returns:
         str: Path to mock audio file
     """
-    audio_file = temp_dir / "test_audio.wav"
+    audio_file = shared_temp_dir / "test_audio.wav"
     audio_file.touch()  # Create empty file
     return str(audio_file)
 
 
-@pytest.fixture
-def mock_srt_path(temp_dir):
+@pytest.fixture(scope="session")
+def mock_srt_path(shared_temp_dir):
     """
     Create a mock SRT subtitle file for testing.
 
-    Creates a simple SRT file with speaker labels.
+    Creates a simple SRT file with speaker labels once per
+    session (read-only).
 
     Args:
-        temp_dir: Temporary directory fixture
+        shared_temp_dir: Session-wide temporary directory fixture
 
     Returns:
         str: Path to mock SRT file
     """
-    srt_file = temp_dir / "test_subtitles.srt"
-    srt_content = """1
-00:00:00,000 --> 00:00:05,000
-Speaker 1: Hello, this is a test.
-
-2
-00:00:05,000 --> 00:00:10,000
-Speaker 2: Yes, I agree.
-
-3
-00:00:10,000 --> 00:00:15,000
-Speaker 1: Great, let's continue.
-"""
-    srt_file.write_text(srt_content)
+    srt_file = shared_temp_dir / "test_subtitles.srt"
+    srt_file.write_bytes(_MOCK_SRT_BYTES)
     return str(srt_file)
 
 
@@ -128,17 +196,11 @@ def mock_env_vars(monkeypatch):
         ...     assert os.getenv("HF_TOKEN") == "test_token_123"
         ...     assert os.getenv("VIDEO_TOOLS_CACHE_DIR") == "/tmp/test_cache"
     """
-    env_vars = {
-        "HF_TOKEN": "test_token_123",
-        "VIDEO_TOOLS_CACHE_DIR": "/tmp/test_cache",
-        "VIDEO_TOOLS_TEMP_DIR": "/tmp/test_temp",
-        "VIDEO_TOOLS_KEEP_TEMP": "true"
-    }
-
-    for key, value in env_vars.items():
-        monkeypatch.setenv(key, value)
+    setenv = monkeypatch.setenv
+    for key, value in _MOCK_ENV:
+        setenv(key, value)
 
-    return env_vars
+    return dict(_MOCK_ENV)
 
 
 @pytest.fixture
@@ -158,42 +220,49 @@ def clean_env_vars(monkeypatch):
         ...     config = load_config()
         ...     assert config.processing.temp_dir == "/tmp/video-tools"
     """
-    env_vars_to_remove = [
-        "HF_TOKEN",
-        "VIDEO_TOOLS_CACHE_DIR",
-        "VIDEO_TOOLS_TEMP_DIR",
-        "VIDEO_TOOLS_KEEP_TEMP"
-    ]
+    delenv = monkeypatch.delenv
+    for var in _CLEAN_VARS:
+        delenv(var, raising=False)
 
-    for var in env_vars_to_remove:
-        monkeypatch.delenv(var, raising=False)
 
-
-@pytest.fixture
-def sample_video_files(temp_dir):
+@pytest.fixture(scope="session")
+def sample_video_files(shared_temp_dir):
     """
     Create multiple sample video files with different extensions.
 
+    Files are created once per session (read-only). The mapping is shared
+    by every test that requests it, so it is returned as a read-only view.
+
     Args:
-        temp_dir: Temporary directory fixture
+        shared_temp_dir: Session-wide temporary directory fixture
 
     Returns:
-        Dict[str, str]: Dictionary mapping extension to file path
+        Mapping[str, str]: Read-only mapping from extension to file path
 
     Example:
         >>> def test_multi_format(sample_video_files):
         ...     assert "mp4" in sample_video_files
         ...     assert Path(sample_video_files["mp4"]).exists()
     """
-    extensions = ["mp4", "mov", "avi", "mkv", "webm"]
-    files = {}
+    files = {ext: str(shared_temp_dir / f"test_video.{ext}") for ext in VIDEO_EXTS}
 
-    for ext in extensions:
-        file_path = temp_dir / f"test_video.{ext}"
-        file_path.touch()
-        files[ext] = str(file_path)
+    for file_path in files.values():
+        # Create the empty file without Path.touch()'s extra utime/stat
+        os.close(os.open(file_path, os.O_CREAT | os.O_WRONLY, 0o644))
 
-    return files
+    return MappingProxyType(files)
+
+
+def make_aged_file(path, age_hours: float) -> None:
+    """
+    Create an empty file whose mtime is age_hours in the past.
+
+    One create plus one utime, instead of Path.touch() followed by
+    os.utime().
+    """
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
 
 
 @pytest.fixture
@@ -241,10 +310,63 @@ def mock_config_dict():
     }
 
 
+@pytest.fixture(scope="session")
+def baseline_config(shared_temp_dir):
+    """
+    A load_config() result built once per session from a clean environment.
+
+    Pydantic validation of the full config is the expensive part of
+    load_config(); tests that just need a config object derive variants
+    with ``model_copy(update=...)`` instead of re-validating. Treat it as
+    read-only. Tests of load_config() itself should still call it.
+
+    Returns:
+        VideoToolsConfig: Default configuration with temp_dir under shared_temp_dir
+    """
+    from video_tools_mcp.config.models import load_config
+
+    with pytest.MonkeyPatch.context() as mp:
+        for var in _CLEAN_VARS:
+            mp.delenv(var, raising=False)
+        mp.setenv("VIDEO_TOOLS_TEMP_DIR", str(shared_temp_dir / "video-tools"))
+        return load_config()
+
+
 # ============================================
 # Integration Test Fixtures (Phase 6)
 # ============================================
 
+# Persistent model cache shared by every test run on this machine
+MODEL_CACHE_DIR = Path.home() / ".cache" / "video-tools-tests"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _persistent_model_cache():
+    """
+    Point HuggingFace and video-tools model caches at a persistent directory.
+
+    Models downloaded by one pytest run are reused by the next instead of
+    being re-resolved from an ephemeral location. Variables that are already
+    set are left alone, and CI_EPHEMERAL=1 disables the redirection entirely.
+
+    Result caches are turned off with VIDEO_TOOLS_NO_CACHE=1 either way, so
+    integration tests always exercise the real pipeline rather than results
+    persisted by an earlier run.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("VIDEO_TOOLS_NO_CACHE", "1")
+
+        if os.getenv("CI_EPHEMERAL") != "1":
+            for var, path in (
+                ("HF_HOME", MODEL_CACHE_DIR / "huggingface"),
+                ("XDG_CACHE_HOME", MODEL_CACHE_DIR),
+                ("VIDEO_TOOLS_CACHE_DIR", MODEL_CACHE_DIR / "video-tools"),
+            ):
+                if var not in os.environ:
+                    mp.setenv(var, str(path))
+        yield
+
+
 # Test video paths - these match the download script filenames
 FIXTURES_DIR = Path(__file__).parent / "fixtures" / "videos"
 
@@ -267,36 +389,55 @@ LONG_PRESENTATION = FIXTURES_DIR / "long_883s_david_rose_ted.mp4"
 EDGE_4K = FIXTURES_DIR / "edge_888s_sintel_2048p.mp4"
 
 
+_VIDEO_MAP = {
+    "short_tutorial": SHORT_TUTORIAL,
+    "short_history": SHORT_HISTORY,
+    "medium_ted_talk": MEDIUM_TED_TALK,
+    "long_tutorial": LONG_TUTORIAL,
+    "multi_speaker_2": MULTI_SPEAKER_2,
+    "multi_speaker_3": MULTI_SPEAKER_3,
+    "visual_short": VISUAL_SHORT,
+    "visual_effects": VISUAL_EFFECTS,
+    "long_presentation": LONG_PRESENTATION,
+    "edge_4k": EDGE_4K,
+}
+_EXPECTED_NAMES = frozenset(path.name for path in _VIDEO_MAP.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _available_video_names() -> FrozenSet[str]:
+    """Names of the files in FIXTURES_DIR, read with a single scandir."""
+    if not FIXTURES_DIR.is_dir():
+        return frozenset()
+    with os.scandir(FIXTURES_DIR) as entries:
+        return frozenset(entry.name for entry in entries if entry.is_file())
+
+
+def video_available(video_path: Path) -> bool:
+    """Check whether a fixture video has been downloaded."""
+    return video_path.name in _available_video_names()
+
+
 def videos_available() -> Dict[str, bool]:
     """Check which test videos are available."""
-    return {
-        "short_tutorial": SHORT_TUTORIAL.exists(),
-        "short_history": SHORT_HISTORY.exists(),
-        "medium_ted_talk": MEDIUM_TED_TALK.exists(),
-        "long_tutorial": LONG_TUTORIAL.exists(),
-        "multi_speaker_2": MULTI_SPEAKER_2.exists(),
-        "multi_speaker_3": MULTI_SPEAKER_3.exists(),
-        "visual_short": VISUAL_SHORT.exists(),
-        "visual_effects": VISUAL_EFFECTS.exists(),
-        "long_presentation": LONG_PRESENTATION.exists(),
-        "edge_4k": EDGE_4K.exists(),
-    }
+    available = _available_video_names()
+    return {key: path.name in available for key, path in _VIDEO_MAP.items()}
 
 
 def any_videos_available() -> bool:
     """Check if at least one test video is available."""
-    return any(videos_available().values())
+    return bool(_available_video_names() & _EXPECTED_NAMES)
 
 
 def all_videos_available() -> bool:
     """Check if all test videos are available."""
-    return all(videos_available().values())
+    return _EXPECTED_NAMES <= _available_video_names()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def require_short_video():
     """Fixture that requires a short test video."""
-    if not SHORT_TUTORIAL.exists():
+    if not video_available(SHORT_TUTORIAL):
         pytest.skip(
             f"Short test video not found: {SHORT_TUTORIAL.name}. "
             "Download with: python scripts/download_test_videos.py --video short_tutorial"
@@ -304,10 +445,10 @@ def require_short_video():
     return SHORT_TUTORIAL
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def require_multi_speaker_video():
     """Fixture that requires a multi-speaker video."""
-    if not MULTI_SPEAKER_2.exists():
+    if not video_available(MULTI_SPEAKER_2):
         pytest.skip(
             f"Multi-speaker video not found: {MULTI_SPEAKER_2.name}. "
             "Download with: python scripts/download_test_videos.py --video interview_2speaker"
@@ -315,10 +456,10 @@ def require_multi_speaker_video():
     return MULTI_SPEAKER_2
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def require_visual_video():
     """Fixture that requires a visual content video."""
-    if not VISUAL_SHORT.exists():
+    if not video_available(VISUAL_SHORT):
         pytest.skip(
             f"Visual test video not found: {VISUAL_SHORT.name}. "
             "Download with: python scripts/download_test_videos.py --video visual_short"
@@ -326,7 +467,7 @@ def require_visual_video():
     return VISUAL_SHORT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def require_any_video():
     """Fixture that requires at least one test video."""
     if not any_videos_available():
@@ -335,13 +476,30 @@ def require_any_video():
         )
     # Return the first available video
     for video_path in [SHORT_TUTORIAL, SHORT_HISTORY, MEDIUM_TED_TALK, VISUAL_SHORT]:
-        if video_path.exists():
+        if video_available(video_path):
             return video_path
     pytest.skip("No test videos found")
 
 
+def _pin_xdist_worker_gpu() -> None:
+    """
+    Give each pytest-xdist worker its own GPU when several are visible.
+
+    Workers load their own copy of the diarization models (session fixtures
+    are per worker), so spreading them across devices avoids several
+    workers contending for one GPU. Must run before torch initializes CUDA.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER", "")
+    devices = [d for d in os.getenv("CUDA_VISIBLE_DEVICES", "").split(",") if d.strip()]
+    if not worker.startswith("gw") or len(devices) < 2:
+        return
+    os.environ["CUDA_VISIBLE_DEVICES"] = devices[int(worker[2:]) % len(devices)]
+
+
 def pytest_configure(config):
     """Pytest configuration hook."""
+    _pin_xdist_worker_gpu()
+
     # Register custom markers
     config.addinivalue_line(
         "markers", "requires_videos: mark test as requiring test videos"
@@ -352,3 +510,19 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "benchmark: mark test as performance benchmark"
     )
+    config.addinivalue_line(
+        "markers", "workflow: mark test as a multi-tool workflow (safe to run under pytest-xdist)"
+    )
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep tests on one pytest-xdist worker with --dist loadgroup"
+    )
+    config.addinivalue_line(
+        "markers", "serial: timing-sensitive test; run without pytest-xdist (-m serial)"
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Release the integration helpers' parse caches."""
+    helpers = sys.modules.get("tests.integration.helpers")
+    if helpers is not None:
+        helpers.clear_caches()
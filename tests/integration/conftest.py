@@ -0,0 +1,254 @@
+"""
+Shared fixtures for integration tests.
+
+Session-scoped fixtures here do expensive, read-only preparation once
+(e.g. decoding fixture videos) so individual tests only pay for the
+stage they actually exercise.
+"""
+
+import functools
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Pre-extracted 16 kHz mono WAVs of the fixture videos (see fixture_audio)
+AUDIO_FIXTURES_DIR = Path(__file__).parent.parent / "fixtures" / "audio"
+
+
+@pytest.fixture(scope="session")
+def visual_video_frames(require_visual_video, tmp_path_factory):
+    """
+    Frames of the visual test video, extracted once per sample interval.
+
+    Returns a function ``get(sample_interval)`` that returns the list of
+    FrameMetadata for that interval, extracting on first use. Pass the
+    result as ``precomputed_frames`` to ``server._extract_smart_screenshots``
+    in tests that only vary deduplication/AI settings. Treat the frames as
+    read-only; they are shared across tests.
+    """
+    from video_tools_mcp.processing.frame_extraction import FrameExtractor
+
+    extractor = FrameExtractor(quality=95)
+    bundles = {}
+
+    def get(sample_interval: int):
+        if sample_interval not in bundles:
+            bundles[sample_interval] = extractor.extract_frames_at_interval(
+                require_visual_video,
+                output_dir=tmp_path_factory.mktemp(f"visual_frames_{sample_interval}s"),
+                sample_interval=float(sample_interval)
+            )
+        return bundles[sample_interval]
+
+    return get
+
+
+@pytest.fixture
+def read_artifact():
+    """
+    Read a test output file once, as bytes.
+
+    Returns a function ``read(path)`` that stats the file (raising
+    FileNotFoundError if it is missing, so no separate existence check is
+    needed) and returns its contents, re-reading only when the file's
+    mtime or size changes.
+    """
+    cache = {}
+
+    def read(path) -> bytes:
+        st = os.stat(path)
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        if key not in cache:
+            cache[key] = Path(path).read_bytes()
+        return cache[key]
+
+    return read
+
+
+def _warm_torch_device(device: str) -> None:
+    """
+    Initialize the GPU context and kernel selection before any test is timed.
+
+    The first convolution on a fresh CUDA/MPS context pays for context
+    creation, cuDNN heuristics and the caching allocator; a tiny dummy
+    forward here keeps that out of the first diarization test's RTF.
+    """
+    import torch
+
+    device_type = device.split(":")[0]
+    if device_type == "cuda" and torch.cuda.is_available():
+        synchronize = torch.cuda.synchronize
+    elif device_type == "mps" and torch.backends.mps.is_available():
+        synchronize = torch.mps.synchronize
+    else:
+        return
+
+    with torch.inference_mode():
+        x = torch.randn(1, 80, 1600, device=device)
+        torch.nn.Conv1d(80, 512, 5).to(device)(x)
+    synchronize()
+
+
+@pytest.fixture(scope="session")
+def diarization_pipeline(require_any_video):
+    """
+    Pyannote and Parakeet models, loaded once for the whole session.
+
+    Both model managers are process-wide singletons, so once loaded here
+    every ``transcribe_with_speakers`` call reuses them instead of paying
+    the load on whichever test happens to run first. The pipeline's GPU is
+    warmed up as well. Skips (rather than failing every diarization test)
+    when no HuggingFace token is available.
+
+    Returns:
+        The loaded PyannoteModel
+    """
+    from video_tools_mcp.models.parakeet import ParakeetModel
+    from video_tools_mcp.models.pyannote import PyannoteModel
+
+    pyannote = PyannoteModel()
+    try:
+        pyannote.ensure_loaded()
+    except ValueError as e:
+        pytest.skip(f"Pyannote pipeline unavailable: {e}")
+
+    ParakeetModel().ensure_loaded()
+    _warm_torch_device(pyannote._model_config.device)
+    return pyannote
+
+
+@pytest.fixture(scope="class")
+def diarized_outputs(require_multi_speaker_video, diarization_pipeline, fixture_audio):
+    """
+    transcribe_with_speakers results for the multi-speaker video in every format.
+
+    The tool is called once per output format, but ``server._diarize_video``
+    is memoized for the duration of the fixture, so transcription and
+    diarization run once and only the output writing differs.
+
+    Returns:
+        Dict mapping "srt" / "json" / "txt" to the tool's result dict
+    """
+    from video_tools_mcp import server
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(server, "_diarize_video", functools.lru_cache(maxsize=None)(server._diarize_video))
+        return {
+            output_format: server.transcribe_with_speakers.fn(
+                video_path=str(require_multi_speaker_video),
+                output_format=output_format,
+                audio_path=fixture_audio(require_multi_speaker_video)
+            )
+            for output_format in ("srt", "json", "txt")
+        }
+
+
+@pytest.fixture(scope="session")
+def speaker_transcript(diarization_pipeline, fixture_audio, tmp_path_factory):
+    """
+    Memoized transcribe_with_speakers for tests that only post-process output.
+
+    Returns a function ``get(video_path, dest_dir, output_format="srt",
+    num_speakers=None, min_speakers=None, max_speakers=None)``. The first
+    call for a given video and parameter set runs the tool and stores the
+    transcript in a session directory; every call copies that transcript
+    into ``dest_dir`` and returns the tool's result with ``transcript_path``
+    pointing at the copy, so tests that rewrite it cannot affect each other.
+    """
+    from video_tools_mcp import server
+
+    store_dir = tmp_path_factory.mktemp("speaker_transcripts")
+
+    @functools.lru_cache(maxsize=None)
+    def canonical(video_path, output_format, num_speakers, min_speakers, max_speakers):
+        result = server.transcribe_with_speakers.fn(
+            video_path=video_path,
+            output_format=output_format,
+            num_speakers=num_speakers,
+            min_speakers=min_speakers,
+            max_speakers=max_speakers,
+            audio_path=fixture_audio(video_path)
+        )
+        stored = Path(tempfile.mkdtemp(dir=store_dir)) / Path(result["transcript_path"]).name
+        shutil.copy(result["transcript_path"], stored)
+        return {**result, "transcript_path": str(stored)}
+
+    def get(video_path, dest_dir, output_format="srt", num_speakers=None,
+            min_speakers=None, max_speakers=None):
+        result = canonical(
+            str(Path(video_path).resolve()), output_format,
+            num_speakers, min_speakers, max_speakers
+        )
+        transcript_path = Path(dest_dir) / Path(result["transcript_path"]).name
+        shutil.copy(result["transcript_path"], transcript_path)
+        return {**result, "transcript_path": str(transcript_path)}
+
+    return get
+
+
+def _extract_fixture_audio(video_paths) -> None:
+    """
+    Extract 16 kHz mono WAVs for several videos with a single ffmpeg process.
+
+    One invocation with an input and an output per video amortizes process
+    start-up and codec initialization across all of them. WAVs are written
+    under a temporary name and renamed once complete.
+    """
+    import ffmpeg
+
+    jobs = [
+        (AUDIO_FIXTURES_DIR / f"{Path(video).stem}.partial.wav",
+         AUDIO_FIXTURES_DIR / f"{Path(video).stem}.wav",
+         video)
+        for video in video_paths
+    ]
+    outputs = [
+        ffmpeg.input(str(video)).audio.output(
+            str(partial), acodec='pcm_s16le', ar=16000, ac=1, format='wav'
+        )
+        for partial, _, video in jobs
+    ]
+
+    AUDIO_FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    ffmpeg.merge_outputs(*outputs).overwrite_output().run(quiet=True)
+
+    for partial, wav, _ in jobs:
+        partial.replace(wav)
+
+
+@pytest.fixture(scope="session")
+def fixture_audio():
+    """
+    16 kHz mono WAV for a fixture video, extracted on first use.
+
+    Returns a function ``get(video_path) -> str``. The first miss extracts
+    WAVs for every downloaded diarization video in one ffmpeg run. WAVs are
+    kept in tests/fixtures/audio/ across runs, so tests can pass them as
+    ``audio_path`` to ``transcribe_with_speakers`` and skip ffmpeg entirely.
+    """
+    from tests.conftest import (
+        LONG_PRESENTATION,
+        MULTI_SPEAKER_2,
+        MULTI_SPEAKER_3,
+        SHORT_TUTORIAL,
+        video_available
+    )
+
+    def wav_for(video_path) -> Path:
+        return AUDIO_FIXTURES_DIR / f"{Path(video_path).stem}.wav"
+
+    def get(video_path) -> str:
+        wav_path = wav_for(video_path)
+        if not wav_path.exists():
+            candidates = (SHORT_TUTORIAL, MULTI_SPEAKER_2, MULTI_SPEAKER_3, LONG_PRESENTATION)
+            missing = {Path(video_path)} | {
+                video for video in candidates
+                if video_available(video) and not wav_for(video).exists()
+            }
+            _extract_fixture_audio(sorted(missing))
+        return str(wav_path)
+
+    return get
@@ -1,11 +1,40 @@
 """Shared utilities for integration tests."""
 
+import functools
 import json
+import os
 import re
 from pathlib import Path
 from typing import List, Dict, Any
 
 
+# Speaker prefixes: generated labels ("SPEAKER_00:") and renamed ones ("Alice:")
+_SPEAKER_UPPER = re.compile(r'^([A-Z_0-9]+):')
+_SPEAKER_ANY = re.compile(r'^([A-Za-z_0-9]+):')
+
+# One or more blank lines between SRT cues
+_CUE_SEPARATOR = re.compile(r'(?:\r?\n[ \t]*){2,}')
+
+# Compiled SRT cue grammar, matched against each blank-line separated block
+# so a malformed cue is skipped on its own: a number line, a timestamp line
+# and one or more text lines
+_SRT_CUE = re.compile(
+    r"\d+[ \t]*\r?\n"
+    r"(\d+:\d{2}:\d{2},\d{3})[ \t]*-->[ \t]*(\d+:\d{2}:\d{2},\d{3})[^\r\n]*\r?\n"
+    r"(\S.*(?:\r?\n.*)*)"
+)
+
+# Required keys in extract_smart_screenshots metadata
+_REQUIRED_TOP = frozenset([
+    "video_path", "extraction_prompt", "sample_interval",
+    "similarity_threshold", "max_screenshots", "output_dir",
+    "total_frames_extracted", "duplicates_removed",
+    "frames_evaluated", "screenshots_kept", "processing_time",
+    "screenshots"
+])
+_REQUIRED_SHOT = frozenset(["filename", "path", "timestamp", "caption"])
+
+
 def validate_srt_format(srt_path: str) -> bool:
     """
     Validate SRT file format and structure.
@@ -19,45 +48,125 @@ def validate_srt_format(srt_path: str) -> bool:
     Returns:
         True if valid SRT format, False otherwise
     """
-    path = Path(srt_path)
-    if not path.exists():
-        return False
-
+    # Every cue must be well-formed (see parse_srt_once)
     try:
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-
-        if not content:
-            return False
-
-        # Check for basic SRT structure
-        blocks = content.split('\n\n')
-        for i, block in enumerate(blocks, 1):
-            lines = block.strip().split('\n')
-            if len(lines) < 3:
-                return False
-            # Validate sequence number, timestamp, and text
-            if not lines[0].strip().isdigit():
-                return False
-            if '-->' not in lines[1]:
-                return False
-            if not lines[2].strip():
-                return False
-
-        return True
-    except Exception:
+        return parse_srt_once(srt_path)["valid"]
+    except OSError:
         return False
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_cached(srt_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse, validate and collect speaker labels from one read of an SRT file.
+
+    Every SRT helper reads through this cache; mtime and size in the key
+    invalidate rewritten files. Malformed cues are skipped and only mark
+    the file invalid.
+    """
+    from video_tools_mcp.utils.srt_utils import parse_timestamp
+
+    with open(srt_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    segments = []
+    malformed = 0
+    for block in _CUE_SEPARATOR.split(content.strip()):
+        cue = _SRT_CUE.fullmatch(block.strip())
+        if cue is None:
+            malformed += 1
+            continue
+        start, end, text = cue.groups()
+        segments.append({
+            'start': parse_timestamp(start),
+            'end': parse_timestamp(end),
+            'text': text.replace('\r\n', '\n'),
+        })
+
+    upper = set()
+    labels = set()
+    for segment in segments:
+        text = segment['text']
+        match = _SPEAKER_ANY.match(text)
+        if match:
+            labels.add(match.group(1))
+            if _SPEAKER_UPPER.match(text):
+                upper.add(match.group(1))
+
+    return {
+        "segments": segments,
+        "valid": bool(segments) and not malformed,
+        "labels": frozenset(labels),
+        "upper_labels": frozenset(upper),
+    }
+
+
+def _parse(srt_path: str) -> Dict[str, Any]:
+    """Look up the cached parse of an SRT file by its current mtime and size."""
+    st = os.stat(srt_path)
+    return _parse_cached(srt_path, st.st_mtime_ns, st.st_size)
+
+
 def parse_srt_file(srt_path: str) -> List[Dict[str, Any]]:
     """
     Parse SRT file into structured segments.
 
+    Results are cached per (path, mtime, size); treat them as read-only.
+
     Returns:
-        List of dicts with keys: index, start, end, text
+        List of dicts with keys: start, end, text
     """
-    from video_tools_mcp.utils.srt_utils import parse_srt_file as parse
-    return parse(srt_path)
+    return _parse(srt_path)["segments"]
+
+
+def parse_srt_once(srt_path: str) -> Dict[str, Any]:
+    """
+    Validate an SRT file and collect its speaker labels in one read.
+
+    Shares the cached parse with the other SRT helpers, so tests that need
+    several checks do not read the file again.
+
+    Returns:
+        Dict with keys:
+            valid: Whether every cue in the file is well-formed SRT
+            labels: Frozenset of speaker labels ("SPEAKER_00", "Alice", ...)
+            num_segments: Number of well-formed subtitle cues
+    """
+    parsed = _parse(srt_path)
+    return {
+        "valid": parsed["valid"],
+        "labels": parsed["labels"],
+        "num_segments": len(parsed["segments"]),
+    }
+
+
+def clear_caches() -> None:
+    """Drop cached SRT parses (called at the end of the test session)."""
+    _parse_cached.cache_clear()
+
+
+def write_srt_from_segments(segments: List[Dict[str, Any]], output_path: str) -> str:
+    """
+    Write speaker segments as SRT, the same way transcribe_with_speakers does.
+
+    Returns:
+        Path to the written SRT file
+    """
+    from video_tools_mcp.utils.srt_utils import write_srt_file
+    return write_srt_file(segments, output_path)
+
+
+def write_txt_from_segments(segments: List[Dict[str, Any]], output_path: str) -> str:
+    """
+    Write speaker segments as plain text, the same way transcribe_with_speakers does.
+
+    Returns:
+        Path to the written TXT file
+    """
+    with open(output_path, 'w') as f:
+        for seg in segments:
+            f.write(f"{seg['text']}\n")
+    return output_path
 
 
 def count_speakers_in_srt(srt_path: str) -> int:
@@ -69,17 +178,7 @@ def count_speakers_in_srt(srt_path: str) -> int:
     Returns:
         Number of unique speakers
     """
-    segments = parse_srt_file(srt_path)
-    speakers = set()
-
-    for segment in segments:
-        text = segment.get('text', '')
-        # Extract speaker label (e.g., "SPEAKER_00:", "Alice:")
-        match = re.match(r'^([A-Z_0-9]+):', text)
-        if match:
-            speakers.add(match.group(1))
-
-    return len(speakers)
+    return len(_parse(srt_path)["upper_labels"])
 
 
 def extract_speaker_labels(srt_path: str) -> List[str]:
@@ -89,17 +188,7 @@ def extract_speaker_labels(srt_path: str) -> List[str]:
     Returns:
         Sorted list of speaker names (e.g., ["SPEAKER_00", "SPEAKER_01"])
     """
-    segments = parse_srt_file(srt_path)
-    speakers = set()
-
-    for segment in segments:
-        text = segment.get('text', '')
-        # Match speaker prefix (letters, numbers, underscores followed by colon)
-        match = re.match(r'^([A-Za-z_0-9]+):', text)
-        if match:
-            speakers.add(match.group(1))
-
-    return sorted(list(speakers))
+    return sorted(_parse(srt_path)["labels"])
 
 
 def validate_json_transcript(json_path: str, required_fields: List[str]) -> bool:
@@ -152,24 +241,17 @@ def validate_screenshot_metadata(metadata_path: str) -> Dict[str, bool]:
         with open(metadata_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        required_top_level = [
-            "video_path", "extraction_prompt", "sample_interval",
-            "similarity_threshold", "max_screenshots", "output_dir",
-            "total_frames_extracted", "duplicates_removed",
-            "frames_evaluated", "screenshots_kept", "processing_time",
-            "screenshots"
-        ]
-
-        screenshot_required = ["filename", "path", "timestamp", "caption"]
+        screenshots = data.get("screenshots")
 
-        result['has_all_top_level_fields'] = all(k in data for k in required_top_level)
-        result['screenshots_is_list'] = isinstance(data.get("screenshots"), list)
-        result['screenshots_not_empty'] = len(data.get("screenshots", [])) > 0
+        result['has_all_top_level_fields'] = _REQUIRED_TOP.issubset(data)
+        result['screenshots_is_list'] = isinstance(screenshots, list)
+        result['screenshots_not_empty'] = bool(screenshots)
 
         if result['screenshots_is_list'] and result['screenshots_not_empty']:
+            # Stops at the first screenshot missing a required key
             result['all_screenshots_valid'] = all(
-                all(k in shot for k in screenshot_required)
-                for shot in data["screenshots"]
+                isinstance(shot, dict) and _REQUIRED_SHOT.issubset(shot)
+                for shot in screenshots
             )
 
         return result
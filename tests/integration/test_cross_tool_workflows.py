@@ -9,6 +9,11 @@ Tests realistic use cases that combine multiple MCP tools:
 Uses real video files from tests/fixtures/videos/
 """
 
+import json
+import logging
+import re
+import shutil
+
 import pytest
 from pathlib import Path
 
@@ -20,15 +25,80 @@ rename_speakers = server.rename_speakers.fn
 extract_smart_screenshots = server.extract_smart_screenshots.fn
 from tests.integration.helpers import (
     extract_speaker_labels,
+    parse_srt_file,
     assert_file_exists,
-    validate_screenshot_metadata
+    validate_screenshot_metadata,
+    validate_srt_format,
+    write_srt_from_segments,
+    write_txt_from_segments
 )
 
+logger = logging.getLogger(__name__)
+
+# Generic speaker label left at the start of a line
+_GENERIC = re.compile(r'(?m)^(SPEAKER_\d+):')
+
+
+@pytest.fixture(scope="module")
+def diarized_transcript(require_multi_speaker_video):
+    """
+    Run transcription + diarization once (JSON output) for the module.
+
+    Returns:
+        Tuple of (tool result dict, parsed JSON transcript)
+    """
+    result = transcribe_with_speakers(
+        video_path=str(require_multi_speaker_video),
+        output_format="json"
+    )
+    with open(result["transcript_path"], 'r') as f:
+        transcript = json.load(f)
+    return result, transcript
+
+
+@pytest.fixture(scope="module")
+def baseline_diarized_srt(require_multi_speaker_video):
+    """
+    Run transcription + diarization once (SRT output) for the module.
+
+    Tests must not modify the returned file; use diarized_srt_copy instead.
+
+    Returns:
+        Tuple of (path to SRT transcript, tool result dict)
+    """
+    result = transcribe_with_speakers(
+        video_path=str(require_multi_speaker_video),
+        output_format="srt"
+    )
+    return Path(result["transcript_path"]), result
+
+
+@pytest.fixture
+def diarized_srt_copy(baseline_diarized_srt, temp_dir):
+    """
+    Copy the shared SRT transcript into this test's temp_dir.
+
+    Returns:
+        Tuple of (path to the private SRT copy, tool result dict)
+    """
+    baseline_path, result = baseline_diarized_srt
+    work_path = temp_dir / "work.speakers.srt"
+    shutil.copyfile(baseline_path, work_path)
+    return str(work_path), result
 
+
+@pytest.mark.workflow
+@pytest.mark.xdist_group("workflows")
 class TestMultiToolWorkflows:
-    """Test workflows that combine multiple tools."""
+    """
+    Test workflows that combine multiple tools.
+
+    Each test writes only to its own temp_dir. The class is kept in one
+    xdist group so the module-scoped transcripts are produced once:
+    pytest tests/integration -n auto --dist loadgroup -m workflow
+    """
 
-    def test_workflow_transcribe_and_rename(self, require_multi_speaker_video, temp_dir):
+    def test_workflow_transcribe_and_rename(self, diarized_srt_copy):
         """
         Test complete workflow: transcribe with speakers -> rename speakers.
 
@@ -36,26 +106,19 @@ class TestMultiToolWorkflows:
         1. User transcribes a video with speaker diarization
         2. User renames the generic SPEAKER_XX labels to actual names
         """
-        video_path = require_multi_speaker_video
-
-        # Step 1: Transcribe with speaker diarization
-        print("\n=== Step 1: Transcribe with Speakers ===")
-        transcribe_result = transcribe_with_speakers(
-            video_path=str(video_path),
-            output_format="srt"
-        )
-
-        transcript_path = transcribe_result["transcript_path"]
+        # Step 1: Transcribe with speaker diarization (shared module run)
+        logger.debug("Step 1: transcribe with speakers")
+        transcript_path, transcribe_result = diarized_srt_copy
         assert_file_exists(transcript_path, "Initial transcript")
 
         # Verify generic speaker labels
         initial_speakers = extract_speaker_labels(transcript_path)
-        print(f"Initial speakers: {initial_speakers}")
+        logger.debug("Initial speakers: %s", initial_speakers)
         assert all(label.startswith("SPEAKER_") for label in initial_speakers), \
             "Should have generic SPEAKER_XX labels"
 
         # Step 2: Rename speakers to real names
-        print("\n=== Step 2: Rename Speakers ===")
+        logger.debug("Step 2: rename speakers")
         speaker_map = {
             "SPEAKER_00": "Alice",
             "SPEAKER_01": "Bob"
@@ -71,8 +134,8 @@ class TestMultiToolWorkflows:
         assert_file_exists(renamed_path, "Renamed transcript")
 
         # Verify changes
-        print(f"Replacements made: {rename_result['replacements_made']}")
-        print(f"Speakers renamed: {rename_result['speakers_renamed']}")
+        logger.debug("Replacements made: %s, speakers renamed: %s",
+                     rename_result['replacements_made'], rename_result['speakers_renamed'])
         assert rename_result["replacements_made"] > 0, "Should have made replacements"
 
         # Read final output and verify
@@ -84,24 +147,19 @@ class TestMultiToolWorkflows:
             "Final transcript should contain renamed speakers"
 
         # Should NOT contain generic labels at start of lines
-        lines = [line for line in final_content.split('\n') if ':' in line and '-->' not in line]
-        speaker_prefixes = [line.split(':')[0].strip() for line in lines if line.strip()]
-        generic_prefixes = [p for p in speaker_prefixes if p.startswith("SPEAKER_")]
-
-        print(f"\nFinal speaker prefixes (first 10): {speaker_prefixes[:10]}")
-        assert len(generic_prefixes) == 0, \
-            f"Should not have SPEAKER_XX prefixes after renaming, found: {generic_prefixes[:5]}"
+        generic = _GENERIC.search(final_content)
+        assert generic is None, \
+            f"Should not have SPEAKER_XX prefixes after renaming, found: {generic.group(1)}"
 
         # Backup should exist
         assert rename_result["backup_path"] is not None, "Should have backup"
         assert Path(rename_result["backup_path"]).exists(), "Backup file should exist"
 
-        print("\n=== Workflow Complete ===")
-        print(f"✓ Transcribed with {transcribe_result['speakers_detected']} speakers")
-        print(f"✓ Renamed {len(rename_result['speakers_renamed'])} speaker labels")
-        print(f"✓ Output: {renamed_path}")
+        logger.debug("Workflow complete: %s speakers, %d labels renamed, output %s",
+                     transcribe_result['speakers_detected'],
+                     len(rename_result['speakers_renamed']), renamed_path)
 
-    def test_workflow_transcribe_multiple_formats(self, require_multi_speaker_video, temp_dir):
+    def test_workflow_transcribe_multiple_formats(self, diarized_transcript, temp_dir):
         """
         Test workflow: generate transcript in multiple formats.
 
@@ -109,64 +167,51 @@ class TestMultiToolWorkflows:
         - SRT for subtitle files
         - JSON for programmatic access
         - TXT for reading/editing
-        """
-        video_path = require_multi_speaker_video
-
-        print("\n=== Generating Multiple Format Outputs ===")
 
-        # Generate SRT
-        print("Generating SRT...")
-        srt_result = transcribe_with_speakers(
-            video_path=str(video_path),
-            output_format="srt"
-        )
-        srt_path = srt_result["transcript_path"]
-        assert_file_exists(srt_path, "SRT transcript")
-        assert srt_path.endswith(".speakers.srt")
+        The diarization pipeline runs once (JSON); SRT and TXT are
+        re-serialized from the same segments the way the server writes them.
+        """
+        json_result, transcript = diarized_transcript
 
-        # Generate JSON
-        print("Generating JSON...")
-        json_result = transcribe_with_speakers(
-            video_path=str(video_path),
-            output_format="json"
-        )
+        # JSON comes straight from the tool
         json_path = json_result["transcript_path"]
         assert_file_exists(json_path, "JSON transcript")
         assert json_path.endswith(".speakers.json")
 
+        segments = transcript["segments"]
+
+        # Generate SRT
+        srt_path = write_srt_from_segments(segments, str(temp_dir / "work.speakers.srt"))
+        assert_file_exists(srt_path, "SRT transcript")
+        assert validate_srt_format(srt_path), f"Invalid SRT format: {srt_path}"
+
         # Generate TXT
-        print("Generating TXT...")
-        txt_result = transcribe_with_speakers(
-            video_path=str(video_path),
-            output_format="txt"
-        )
-        txt_path = txt_result["transcript_path"]
+        txt_path = write_txt_from_segments(segments, str(temp_dir / "work.speakers.txt"))
         assert_file_exists(txt_path, "TXT transcript")
-        assert txt_path.endswith(".speakers.txt")
 
         # Verify consistency across formats
-        print("\n=== Verifying Consistency ===")
-
-        # All should have same speaker count
-        assert srt_result["speakers_detected"] == json_result["speakers_detected"], \
-            "SRT and JSON should report same speaker count"
-        assert json_result["speakers_detected"] == txt_result["speakers_detected"], \
-            "JSON and TXT should report same speaker count"
-
-        # All should have same duration
-        assert abs(srt_result["duration"] - json_result["duration"]) < 1.0, \
+        # JSON payload should agree with the tool's result
+        assert transcript["num_speakers"] == json_result["speakers_detected"], \
+            "JSON file and tool result should report same speaker count"
+        assert transcript["speakers"] == json_result["speakers"], \
+            "Speaker lists should match across formats"
+        assert abs(transcript["duration"] - json_result["duration"]) < 1.0, \
             "Duration should be consistent across formats"
 
-        # All should have same speakers list
-        assert srt_result["speakers"] == json_result["speakers"], \
-            "Speaker lists should match across formats"
+        # SRT should carry every segment and the same speakers
+        assert len(parse_srt_file(srt_path)) == json_result["num_segments"], \
+            "SRT should contain every segment"
+        assert set(extract_speaker_labels(srt_path)) <= set(json_result["speakers"]), \
+            "SRT speakers should match JSON speakers"
+
+        # TXT should have no SRT timestamps
+        with open(txt_path, 'r') as f:
+            assert "-->" not in f.read(), "Plain text should not contain SRT timestamps"
 
-        print(f"✓ Generated 3 formats: SRT, JSON, TXT")
-        print(f"✓ Speakers detected: {srt_result['speakers_detected']}")
-        print(f"✓ Duration: {srt_result['duration']:.1f}s")
-        print(f"✓ All formats consistent")
+        logger.debug("Generated SRT, JSON and TXT: %s speakers, %.1fs",
+                     json_result['speakers_detected'], json_result['duration'])
 
-    def test_workflow_full_pipeline(self, require_multi_speaker_video, temp_dir):
+    def test_workflow_full_pipeline(self, require_multi_speaker_video, diarized_srt_copy):
         """
         Test complete pipeline: transcribe + rename + extract screenshots.
 
@@ -179,31 +224,23 @@ class TestMultiToolWorkflows:
         """
         video_path = require_multi_speaker_video
 
-        print("\n=== Full Processing Pipeline ===")
-
-        # Step 1: Transcribe with speakers
-        print("\nStep 1: Transcribing video with speaker diarization...")
-        transcribe_result = transcribe_with_speakers(
-            video_path=str(video_path),
-            output_format="srt"
-        )
-        assert_file_exists(transcribe_result["transcript_path"], "Transcript")
-        print(f"✓ Transcribed: {transcribe_result['speakers_detected']} speakers, " \
-              f"{transcribe_result['num_segments']} segments")
+        # Step 1: Transcribe with speakers (shared module run)
+        transcript_path, transcribe_result = diarized_srt_copy
+        assert_file_exists(transcript_path, "Transcript")
+        logger.debug("Transcribed: %s speakers, %s segments",
+                     transcribe_result['speakers_detected'], transcribe_result['num_segments'])
 
         # Step 2: Rename speakers
-        print("\nStep 2: Renaming speakers to real names...")
         rename_result = rename_speakers(
-            srt_path=transcribe_result["transcript_path"],
+            srt_path=transcript_path,
             speaker_map={"SPEAKER_00": "Interviewer", "SPEAKER_01": "Candidate"},
             create_backup=True
         )
         assert_file_exists(rename_result["output_path"], "Renamed transcript")
-        print(f"✓ Renamed: {rename_result['replacements_made']} replacements, " \
-              f"{len(rename_result['speakers_renamed'])} speakers")
+        logger.debug("Renamed: %s replacements, %d speakers",
+                     rename_result['replacements_made'], len(rename_result['speakers_renamed']))
 
         # Step 3: Extract key screenshots
-        print("\nStep 3: Extracting key screenshots...")
         screenshot_result = extract_smart_screenshots(
             video_path=str(video_path),
             sample_interval=10,  # Every 10 seconds
@@ -211,19 +248,10 @@ class TestMultiToolWorkflows:
         )
         assert screenshot_result["total_extracted"] > 0, "Should extract screenshots"
         assert_file_exists(screenshot_result["metadata_path"], "Screenshot metadata")
-        print(f"✓ Screenshots: {screenshot_result['total_extracted']} extracted, " \
-              f"{screenshot_result['duplicates_removed']} duplicates removed")
-
-        # Verify all outputs exist
-        print("\n=== Pipeline Complete ===")
-        print(f"✓ Transcript: {rename_result['output_path']}")
-        print(f"✓ Screenshots: {len(screenshot_result['screenshots'])} files")
-        print(f"✓ Metadata: {screenshot_result['metadata_path']}")
-        print(f"✓ Backup: {rename_result['backup_path']}")
+        logger.debug("Screenshots: %s extracted, %s duplicates removed",
+                     screenshot_result['total_extracted'], screenshot_result['duplicates_removed'])
 
         # Verify screenshot metadata is valid
         validation = validate_screenshot_metadata(screenshot_result["metadata_path"])
         assert validation["exists"], "Metadata should exist"
         assert validation["has_all_top_level_fields"], "Metadata should be complete"
-
-        print("\n✅ Full pipeline executed successfully!")
@@ -9,6 +9,10 @@ Tests the extract_smart_screenshots MCP tool with:
 - Output management
 
 Uses real video files from tests/fixtures/videos/
+
+Tests sharing the session-scoped visual_video_frames fixture are grouped on
+one pytest-xdist worker; the slow Tears of Steel test runs on its own:
+    pytest tests/integration -n 4 --dist loadgroup
 """
 
 import pytest
@@ -19,6 +23,8 @@ from video_tools_mcp import server
 
 # Extract actual function from MCP tool
 extract_smart_screenshots = server.extract_smart_screenshots.fn
+# Same pipeline, accepting frames pre-extracted by the visual_video_frames fixture
+extract_from_frames = server._extract_smart_screenshots
 from tests.integration.helpers import (
     validate_screenshot_metadata,
     assert_file_exists,
@@ -26,6 +32,7 @@ from tests.integration.helpers import (
 )
 
 
+@pytest.mark.xdist_group("visual_video")
 class TestBasicScreenshotExtraction:
     """Test basic screenshot extraction functionality."""
 
@@ -77,6 +84,7 @@ class TestBasicScreenshotExtraction:
         assert result["duplicates_removed"] >= 0, "Duplicates removed should be >= 0"
 
     @pytest.mark.slow
+    @pytest.mark.xdist_group("tears_steel")
     def test_extract_screenshots_tears_steel(self, temp_dir):
         """Test screenshot extraction on longer visual video (Tears of Steel)."""
         video_path = Path("tests/fixtures/videos/visual_734s_tears_steel_1080p.mp4")
@@ -109,21 +117,24 @@ class TestBasicScreenshotExtraction:
         print(f"Video: {video_path.name}")
         print(f"Duration: ~734s (12:14)")
         print(f"Processing Time: {processing_time:.1f}s")
+        print(f"Decoder: {result['decoder_backend']}")
         print(f"Screenshots Extracted: {result['total_extracted']}")
         print(f"Duplicates Removed: {result['duplicates_removed']}")
         print(f"Speed: ~{processing_time/result['total_extracted']:.1f}s per screenshot")
 
 
+@pytest.mark.xdist_group("visual_video")
 class TestDeduplicationAndConfig:
     """Test deduplication and configuration options."""
 
-    def test_deduplication_threshold_strict(self, require_visual_video, temp_dir):
+    def test_deduplication_threshold_strict(self, require_visual_video, visual_video_frames, temp_dir):
         """Test with stricter deduplication threshold (keeps more similar frames)."""
         video_path = require_visual_video
 
         # Use stricter threshold (0.95 = only remove very similar frames)
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(3),
             sample_interval=3,
             similarity_threshold=0.95,  # Stricter
             max_screenshots=15
@@ -138,13 +149,14 @@ class TestDeduplicationAndConfig:
         print(f"Extracted: {result['total_extracted']}")
         print(f"Duplicates Removed: {result['duplicates_removed']}")
 
-    def test_deduplication_threshold_loose(self, require_visual_video, temp_dir):
+    def test_deduplication_threshold_loose(self, require_visual_video, visual_video_frames, temp_dir):
         """Test with looser deduplication threshold (removes more similar frames)."""
         video_path = require_visual_video
 
         # Use looser threshold (0.85 = more aggressive deduplication)
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(3),
             sample_interval=3,
             similarity_threshold=0.85,  # Looser
             max_screenshots=15
@@ -158,15 +170,16 @@ class TestDeduplicationAndConfig:
         print(f"Extracted: {result['total_extracted']}")
         print(f"Duplicates Removed: {result['duplicates_removed']}")
 
-    def test_max_screenshots_limit(self, require_visual_video, temp_dir):
+    def test_max_screenshots_limit(self, require_visual_video, visual_video_frames, temp_dir):
         """Test that max_screenshots limit is respected."""
         video_path = require_visual_video
 
         # Set low limit
         max_limit = 5
 
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(2),
             sample_interval=2,  # Frequent sampling
             max_screenshots=max_limit
         )
@@ -198,15 +211,17 @@ class TestDeduplicationAndConfig:
         print(f"Duplicates Removed: {result['duplicates_removed']}")
 
 
+@pytest.mark.xdist_group("visual_video")
 class TestMetadataAndOutputs:
     """Test metadata generation and output management."""
 
-    def test_screenshot_metadata_structure(self, require_visual_video, temp_dir):
+    def test_screenshot_metadata_structure(self, require_visual_video, visual_video_frames, temp_dir):
         """Test that metadata.json has correct structure and all required fields."""
         video_path = require_visual_video
 
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(5),
             max_screenshots=10
         )
 
@@ -248,12 +263,13 @@ class TestMetadataAndOutputs:
                     assert field in screenshot, \
                         f"Screenshot entry missing required field: {field}"
 
-    def test_screenshot_captions_generated(self, require_visual_video, temp_dir):
+    def test_screenshot_captions_generated(self, require_visual_video, visual_video_frames, temp_dir):
         """Test that AI-generated captions are present and non-empty."""
         video_path = require_visual_video
 
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(5),
             max_screenshots=5
         )
 
@@ -273,14 +289,15 @@ class TestMetadataAndOutputs:
             print(f"Caption: {caption}")
             print(f"Timestamp: {screenshot['timestamp']:.1f}s")
 
-    def test_custom_extraction_prompt(self, require_visual_video, temp_dir):
+    def test_custom_extraction_prompt(self, require_visual_video, visual_video_frames, temp_dir):
         """Test extraction with custom AI prompt."""
         video_path = require_visual_video
 
         custom_prompt = "Select frames that show character movement or action scenes."
 
-        result = extract_smart_screenshots(
+        result = extract_from_frames(
             video_path=str(video_path),
+            precomputed_frames=visual_video_frames(5),
             extraction_prompt=custom_prompt,
             max_screenshots=8
         )
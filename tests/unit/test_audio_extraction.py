@@ -11,10 +11,10 @@ Note: All ffmpeg operations are mocked to avoid requiring real video files.
 """
 
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock, call
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, call
 
 import pytest
-import ffmpeg
 
 from video_tools_mcp.processing.audio_extraction import (
     extract_audio,
@@ -27,203 +27,157 @@ from video_tools_mcp.utils.file_utils import (
 )
 
 
-class TestExtractAudio:
-    """Test cases for extract_audio() function."""
-
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg')
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    @patch('video_tools_mcp.processing.audio_extraction.load_config')
-    def test_extract_audio_valid_video_creates_wav_file(
-        self, mock_load_config, mock_validate, mock_ffmpeg, temp_dir
+# Canonical ffprobe stream entries; get_audio_info() only reads them
+_AUDIO_STREAM = {
+    'codec_type': 'audio',
+    'duration': '125.50',
+    'sample_rate': '16000',
+    'channels': 1,
+    'codec_name': 'pcm_s16le'
+}
+_AUDIO_STREAM_NO_DURATION = {k: v for k, v in _AUDIO_STREAM.items() if k != 'duration'}
+_VIDEO_STREAM = {'codec_type': 'video'}
+
+
+class _FakeFFmpegError(Exception):
+    """Stand-in for ffmpeg.Error on the mocked ffmpeg module."""
+
+    def __init__(self, *args, stderr=None):
+        super().__init__(*args)
+        self.stderr = stderr
+
+
+class _FakeOutputPath:
+    """Path stand-in for extract_audio(): answers exists() without touching disk."""
+
+    def __init__(self, path, exists: bool):
+        self._path = str(path)
+        self._exists = exists
+
+    def __fspath__(self):
+        return self._path
+
+    def __str__(self):
+        return self._path
+
+    @property
+    def parent(self):
+        return self
+
+    def mkdir(self, parents=False, exist_ok=False):
+        pass
+
+    def exists(self):
+        return self._exists
+
+    def stat(self):
+        return SimpleNamespace(st_size=0)
+
+
+@pytest.fixture
+def mock_config(temp_dir):
+    """Minimal stand-in for load_config()'s result; only processing.temp_dir is read."""
+    return SimpleNamespace(processing=SimpleNamespace(temp_dir=str(temp_dir)))
+
+
+@pytest.fixture
+def audio_mocks(temp_dir, mock_config):
+    """
+    Patch extract_audio()'s collaborators once per test.
+
+    Defaults describe a successful extraction into temp_dir/audio_test.wav.
+    No file is written: extract_audio()'s Path is replaced by _FakeOutputPath,
+    whose exists() returns output_exists. Tests reconfigure the mocks as needed.
+
+    Yields:
+        SimpleNamespace with ffmpeg, validate, load_config, generate_temp_filename,
+        stream, output_path and output_exists
+    """
+    stream = object()
+    mocks = SimpleNamespace(
+        # spec_set: only the calls extract_audio() makes, no auto-created children
+        ffmpeg=Mock(spec_set=["input", "output", "overwrite_output", "compile", "run", "Error"]),
+        validate=Mock(return_value=True),
+        load_config=Mock(return_value=mock_config),
+        generate_temp_filename=Mock(),
+        stream=stream,
+        output_path=str(temp_dir / "audio_test.wav"),
+        output_exists=True
+    )
+
+    mocks.ffmpeg.input.return_value = stream
+    mocks.ffmpeg.output.return_value = stream
+    mocks.ffmpeg.overwrite_output.return_value = stream
+    mocks.ffmpeg.compile.return_value = ["ffmpeg"]
+    mocks.ffmpeg.run.return_value = None
+    mocks.ffmpeg.Error = _FakeFFmpegError
+    mocks.generate_temp_filename.return_value = mocks.output_path
+
+    # One patcher: the module is resolved once and all attributes restored together
+    with patch.multiple(
+        "video_tools_mcp.processing.audio_extraction",
+        Path=lambda path: _FakeOutputPath(path, exists=mocks.output_exists),
+        ffmpeg=mocks.ffmpeg,
+        validate_video_path=mocks.validate,
+        load_config=mocks.load_config,
+        generate_temp_filename=mocks.generate_temp_filename
     ):
-        """Test that audio extraction succeeds with valid video file."""
-        # Setup mocks
-        mock_validate.return_value = True
-
-        # Mock config
-        mock_config = MagicMock()
-        mock_config.processing.temp_dir = str(temp_dir)
-        mock_load_config.return_value = mock_config
+        yield mocks
 
-        # Mock ffmpeg chain
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-        mock_ffmpeg.run.return_value = None
 
-        # Create output file to simulate successful extraction
-        with patch('video_tools_mcp.processing.audio_extraction.generate_temp_filename') as mock_gen:
-            output_path = str(temp_dir / "audio_test.wav")
-            mock_gen.return_value = output_path
+class TestExtractAudio:
+    """Test cases for extract_audio() function."""
 
-            # Create the file that ffmpeg would create
-            Path(output_path).touch()
+    @pytest.mark.parametrize("kwargs,expected_rate", [
+        ({}, 16000),
+        ({"output_path": "custom_audio.wav"}, 16000),
+        ({"sample_rate": 44100}, 44100),
+    ], ids=["default", "custom_output_path", "custom_sample_rate"])
+    def test_extract_audio_succeeds(self, audio_mocks, temp_dir, kwargs, expected_rate):
+        """Test successful extraction with default and custom output path / sample rate."""
+        if "output_path" in kwargs:
+            kwargs = {**kwargs, "output_path": str(temp_dir / kwargs["output_path"])}
+        expected_output = kwargs.get("output_path", audio_mocks.output_path)
 
-            result = extract_audio("/path/to/video.mp4")
+        result = extract_audio("/path/to/video.mp4", **kwargs)
 
         # Verify result
-        assert result == output_path
-        assert Path(output_path).exists()
+        assert result == expected_output
+
+        # A temp filename is only generated without an explicit output path
+        assert audio_mocks.generate_temp_filename.called == ("output_path" not in kwargs)
 
         # Verify ffmpeg was called correctly
-        mock_ffmpeg.input.assert_called_once_with("/path/to/video.mp4")
-        mock_ffmpeg.run.assert_called_once()
+        audio_mocks.ffmpeg.input.assert_called_once_with("/path/to/video.mp4")
+        audio_mocks.ffmpeg.run.assert_called_once()
+        assert audio_mocks.ffmpeg.output.call_args[1]['ar'] == expected_rate
 
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    def test_extract_audio_invalid_video_raises_error(self, mock_validate):
+    def test_extract_audio_invalid_video_raises_error(self, audio_mocks):
         """Test that invalid video path raises VideoProcessingError."""
-        mock_validate.return_value = False
+        audio_mocks.validate.return_value = False
 
         with pytest.raises(VideoProcessingError) as exc_info:
             extract_audio("/path/to/invalid.mp4")
 
         assert "Invalid video file" in str(exc_info.value)
 
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg')
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    def test_extract_audio_custom_output_path(
-        self, mock_validate, mock_ffmpeg, temp_dir
-    ):
-        """Test that custom output path is respected."""
-        mock_validate.return_value = True
-
-        # Mock ffmpeg chain
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-        mock_ffmpeg.run.return_value = None
-
-        # Custom output path
-        custom_output = str(temp_dir / "custom_audio.wav")
-
-        # Create the output file
-        Path(custom_output).touch()
-
-        result = extract_audio(
-            "/path/to/video.mp4",
-            output_path=custom_output
-        )
-
-        assert result == custom_output
-        assert Path(custom_output).exists()
-
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg')
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    @patch('video_tools_mcp.processing.audio_extraction.load_config')
-    def test_extract_audio_custom_sample_rate(
-        self, mock_load_config, mock_validate, mock_ffmpeg, temp_dir
-    ):
-        """Test that custom sample rate is passed to ffmpeg."""
-        mock_validate.return_value = True
-
-        # Mock config
-        mock_config = MagicMock()
-        mock_config.processing.temp_dir = str(temp_dir)
-        mock_load_config.return_value = mock_config
-
-        # Mock ffmpeg chain
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-        mock_ffmpeg.run.return_value = None
-
-        # Create output file
-        with patch('video_tools_mcp.processing.audio_extraction.generate_temp_filename') as mock_gen:
-            output_path = str(temp_dir / "audio_test.wav")
-            mock_gen.return_value = output_path
-            Path(output_path).touch()
-
-            extract_audio("/path/to/video.mp4", sample_rate=44100)
-
-        # Verify ffmpeg.output was called with custom sample rate
-        output_call = mock_ffmpeg.output.call_args
-        assert output_call[1]['ar'] == 44100
-
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg')
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    @patch('video_tools_mcp.processing.audio_extraction.load_config')
-    def test_extract_audio_ffmpeg_error_raises_audio_extraction_error(
-        self, mock_load_config, mock_validate, mock_ffmpeg
-    ):
+    def test_extract_audio_ffmpeg_error_raises_audio_extraction_error(self, audio_mocks):
         """Test that FFmpeg errors are wrapped in AudioExtractionError."""
-        mock_validate.return_value = True
-
-        # Mock config
-        mock_config = MagicMock()
-        mock_config.processing.temp_dir = "/tmp"
-        mock_load_config.return_value = mock_config
-
-        # Mock ffmpeg to raise error
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-
-        # Create a custom exception class for mocking ffmpeg.Error
-        class FakeFFmpegError(Exception):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self.stderr = b'FFmpeg error occurred'
-
-        # Create mock ffmpeg error instance
-        mock_error = FakeFFmpegError('FFmpeg error occurred')
-        mock_ffmpeg.run.side_effect = mock_error
-        # Also mock ffmpeg.Error class for the except clause
-        mock_ffmpeg.Error = FakeFFmpegError
+        audio_mocks.ffmpeg.run.side_effect = _FakeFFmpegError(
+            'FFmpeg error occurred', stderr=b'FFmpeg error occurred'
+        )
 
         with pytest.raises(AudioExtractionError) as exc_info:
             extract_audio("/path/to/video.mp4")
 
         assert "Failed to extract audio" in str(exc_info.value) or "Audio extraction failed" in str(exc_info.value)
 
-    @patch('video_tools_mcp.processing.audio_extraction.Path')
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg')
-    @patch('video_tools_mcp.processing.audio_extraction.validate_video_path')
-    @patch('video_tools_mcp.processing.audio_extraction.load_config')
-    def test_extract_audio_missing_output_raises_error(
-        self, mock_load_config, mock_validate, mock_ffmpeg, mock_path_class, temp_dir
-    ):
+    def test_extract_audio_missing_output_raises_error(self, audio_mocks):
         """Test that error is raised if output file is not created."""
-        mock_validate.return_value = True
-
-        # Mock config
-        mock_config = MagicMock()
-        mock_config.processing.temp_dir = str(temp_dir)
-        mock_load_config.return_value = mock_config
-
-        # Mock ffmpeg chain
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-        mock_ffmpeg.run.return_value = None
-
-        # Create a custom exception class that doesn't conflict with AudioExtractionError
-        class FakeFFmpegError(Exception):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self.stderr = None
-
-        # Mock ffmpeg.Error class with something that won't catch our AudioExtractionError
-        mock_ffmpeg.Error = FakeFFmpegError
-
-        # Mock Path to return a non-existent file
-        mock_output_path = MagicMock()
-        mock_output_path.exists.return_value = False  # File doesn't exist
-        mock_path_class.return_value = mock_output_path
-
-        # Don't create output file (simulating ffmpeg failure without error)
-        with patch('video_tools_mcp.processing.audio_extraction.generate_temp_filename') as mock_gen:
-            output_path = str(temp_dir / "audio_test.wav")
-            mock_gen.return_value = output_path
-
-            # Don't create the file
-
-            with pytest.raises(AudioExtractionError) as exc_info:
-                extract_audio("/path/to/video.mp4")
+        # Simulate ffmpeg finishing without error but without an output file
+        audio_mocks.output_exists = False
+        with pytest.raises(AudioExtractionError) as exc_info:
+            extract_audio("/path/to/video.mp4")
 
         assert "output file not found" in str(exc_info.value)
 
@@ -235,17 +189,7 @@ class TestGetAudioInfo:
     def test_get_audio_info_returns_correct_data(self, mock_probe, mock_audio_path):
         """Test that audio info is correctly extracted from probe."""
         # Mock probe result
-        mock_probe.return_value = {
-            'streams': [
-                {
-                    'codec_type': 'audio',
-                    'duration': '125.50',
-                    'sample_rate': '16000',
-                    'channels': 1,
-                    'codec_name': 'pcm_s16le'
-                }
-            ]
-        }
+        mock_probe.return_value = {'streams': [_AUDIO_STREAM]}
 
         info = get_audio_info(mock_audio_path)
 
@@ -259,17 +203,8 @@ class TestGetAudioInfo:
         """Test that duration can be extracted from format section."""
         # Mock probe result with duration in format instead of stream
         mock_probe.return_value = {
-            'format': {
-                'duration': '90.25'
-            },
-            'streams': [
-                {
-                    'codec_type': 'audio',
-                    'sample_rate': '16000',
-                    'channels': 1,
-                    'codec_name': 'pcm_s16le'
-                }
-            ]
+            'format': {'duration': '90.25'},
+            'streams': [_AUDIO_STREAM_NO_DURATION]
         }
 
         info = get_audio_info(mock_audio_path)
@@ -289,28 +224,20 @@ class TestGetAudioInfo:
     def test_get_audio_info_no_audio_stream_raises_error(self, mock_probe, mock_audio_path):
         """Test that error is raised when no audio stream is found."""
         # Mock probe result with no audio streams
-        mock_probe.return_value = {
-            'streams': [
-                {
-                    'codec_type': 'video'
-                }
-            ]
-        }
+        mock_probe.return_value = {'streams': [_VIDEO_STREAM]}
 
         with pytest.raises(AudioExtractionError) as exc_info:
             get_audio_info(mock_audio_path)
 
         assert "No audio stream found" in str(exc_info.value)
 
-    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg.probe')
+    @patch('video_tools_mcp.processing.audio_extraction.ffmpeg', spec_set=["probe", "Error"])
     def test_get_audio_info_ffmpeg_error_raises_audio_extraction_error(
-        self, mock_probe, mock_audio_path
+        self, mock_ffmpeg, mock_audio_path
     ):
         """Test that FFmpeg probe errors are wrapped properly."""
-        # Create mock ffmpeg error
-        mock_error = ffmpeg.Error('ffprobe', 'stdout', b'Probe error')
-        mock_error.stderr = b'Probe error'
-        mock_probe.side_effect = mock_error
+        mock_ffmpeg.Error = _FakeFFmpegError
+        mock_ffmpeg.probe.side_effect = _FakeFFmpegError('ffprobe', stderr=b'Probe error')
 
         with pytest.raises(AudioExtractionError) as exc_info:
             get_audio_info(mock_audio_path)
@@ -368,24 +295,16 @@ class TestCleanupAudioFile:
 
         assert result is False
 
-    def test_cleanup_audio_file_permission_error_returns_false(self, temp_dir):
-        """Test that permission errors are handled gracefully."""
-        audio_file = temp_dir / "test_audio.wav"
-        audio_file.touch()
-
-        # Mock unlink to raise PermissionError
-        with patch.object(Path, 'unlink', side_effect=PermissionError("Access denied")):
-            result = cleanup_audio_file(str(audio_file))
-
-        assert result is False
-
-    def test_cleanup_audio_file_os_error_returns_false(self, temp_dir):
-        """Test that OS errors are handled gracefully."""
+    @pytest.mark.parametrize("error", [
+        PermissionError("Access denied"),
+        OSError("Disk error"),
+    ], ids=["permission_error", "os_error"])
+    def test_cleanup_audio_file_unlink_error_returns_false(self, temp_dir, error):
+        """Test that permission and OS errors from unlink are handled gracefully."""
         audio_file = temp_dir / "test_audio.wav"
         audio_file.touch()
 
-        # Mock unlink to raise OSError
-        with patch.object(Path, 'unlink', side_effect=OSError("Disk error")):
+        with patch.object(Path, 'unlink', side_effect=error):
             result = cleanup_audio_file(str(audio_file))
 
         assert result is False
@@ -10,7 +10,9 @@ Tests cover:
 """
 
 import os
-from pathlib import Path
+import re
+import subprocess
+import sys
 
 import pytest
 from pydantic import ValidationError
@@ -27,17 +29,27 @@ from video_tools_mcp.config.models import (
 )
 
 
+def assert_fields(config, **expected):
+    """Assert that each named field of config has the expected value."""
+    actual = {name: getattr(config, name) for name in expected}
+    assert actual == expected
+
+
 class TestParakeetConfig:
     """Test cases for ParakeetConfig model."""
 
     def test_default_values(self):
         """Test that ParakeetConfig initializes with correct defaults."""
-        config = ParakeetConfig()
-
-        assert config.model_id == "mlx-community/parakeet-tdt-0.6b-v3"
-        assert config.chunk_duration == 120.0
-        assert config.overlap_duration == 15.0
-        assert config.language == "en"
+        # Defaults are not re-validated, so model_construct() yields the same values
+        config = ParakeetConfig.model_construct()
+
+        assert_fields(
+            config,
+            model_id="mlx-community/parakeet-tdt-0.6b-v3",
+            chunk_duration=120.0,
+            overlap_duration=15.0,
+            language="en"
+        )
 
     def test_custom_values(self):
         """Test ParakeetConfig accepts custom values."""
@@ -48,31 +60,19 @@ class TestParakeetConfig:
             language="es"
         )
 
-        assert config.model_id == "custom-model"
-        assert config.chunk_duration == 60.0
-        assert config.overlap_duration == 10.0
-        assert config.language == "es"
-
-    def test_negative_chunk_duration_raises_error(self):
-        """Test that negative chunk_duration is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ParakeetConfig(chunk_duration=-10.0)
-
-        assert "Duration must be positive" in str(exc_info.value)
-
-    def test_zero_chunk_duration_raises_error(self):
-        """Test that zero chunk_duration is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ParakeetConfig(chunk_duration=0.0)
-
-        assert "Duration must be positive" in str(exc_info.value)
-
-    def test_negative_overlap_duration_raises_error(self):
-        """Test that negative overlap_duration is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ParakeetConfig(overlap_duration=-5.0)
+        assert_fields(
+            config, model_id="custom-model", chunk_duration=60.0, overlap_duration=10.0, language="es"
+        )
 
-        assert "Duration must be positive" in str(exc_info.value)
+    @pytest.mark.parametrize("field,value", [
+        ("chunk_duration", -10.0),
+        ("chunk_duration", 0.0),
+        ("overlap_duration", -5.0),
+    ], ids=["negative_chunk", "zero_chunk", "negative_overlap"])
+    def test_non_positive_duration_raises_error(self, field, value):
+        """Test that non-positive chunk/overlap durations are rejected."""
+        with pytest.raises(ValidationError, match="Duration must be positive"):
+            ParakeetConfig(**{field: value})
 
 
 class TestPyannoteConfig:
@@ -80,12 +80,15 @@ class TestPyannoteConfig:
 
     def test_default_values(self):
         """Test that PyannoteConfig initializes with correct defaults."""
-        config = PyannoteConfig()
-
-        assert config.model_id == "pyannote/speaker-diarization-3.1"
-        assert config.device == "mps"
-        assert config.min_duration == 0.5
-        assert config.hf_token is None
+        config = PyannoteConfig.model_construct()
+
+        assert_fields(
+            config,
+            model_id="pyannote/speaker-diarization-3.1",
+            device="mps",
+            min_duration=0.5,
+            hf_token=None
+        )
 
     def test_custom_values_with_token(self):
         """Test PyannoteConfig accepts custom values including HF token."""
@@ -96,24 +99,15 @@ class TestPyannoteConfig:
             hf_token="hf_test123"
         )
 
-        assert config.model_id == "custom-diarization"
-        assert config.device == "cuda"
-        assert config.min_duration == 1.0
-        assert config.hf_token == "hf_test123"
-
-    def test_negative_min_duration_raises_error(self):
-        """Test that negative min_duration is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            PyannoteConfig(min_duration=-0.5)
-
-        assert "Minimum duration must be positive" in str(exc_info.value)
-
-    def test_zero_min_duration_raises_error(self):
-        """Test that zero min_duration is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            PyannoteConfig(min_duration=0.0)
+        assert_fields(
+            config, model_id="custom-diarization", device="cuda", min_duration=1.0, hf_token="hf_test123"
+        )
 
-        assert "Minimum duration must be positive" in str(exc_info.value)
+    @pytest.mark.parametrize("value", [-0.5, 0.0], ids=["negative", "zero"])
+    def test_non_positive_min_duration_raises_error(self, value):
+        """Test that non-positive min_duration is rejected."""
+        with pytest.raises(ValidationError, match="Minimum duration must be positive"):
+            PyannoteConfig(min_duration=value)
 
 
 class TestQwenVLConfig:
@@ -121,12 +115,15 @@ class TestQwenVLConfig:
 
     def test_default_values(self):
         """Test that QwenVLConfig initializes with correct defaults."""
-        config = QwenVLConfig()
-
-        assert config.model_id == "mlx-community/Qwen2-VL-8B-Instruct-8bit"
-        assert config.max_tokens == 512
-        assert config.temperature == 0.7
-        assert config.fps == 1.0
+        config = QwenVLConfig.model_construct()
+
+        assert_fields(
+            config,
+            model_id="mlx-community/Qwen2-VL-8B-Instruct-8bit",
+            max_tokens=512,
+            temperature=0.7,
+            fps=1.0
+        )
 
     def test_custom_values(self):
         """Test QwenVLConfig accepts custom values."""
@@ -137,53 +134,24 @@ class TestQwenVLConfig:
             fps=2.0
         )
 
-        assert config.model_id == "custom-vl-model"
-        assert config.max_tokens == 1024
-        assert config.temperature == 0.5
-        assert config.fps == 2.0
-
-    def test_negative_max_tokens_raises_error(self):
-        """Test that negative max_tokens is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            QwenVLConfig(max_tokens=-100)
-
-        assert "Max tokens must be positive" in str(exc_info.value)
-
-    def test_zero_max_tokens_raises_error(self):
-        """Test that zero max_tokens is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            QwenVLConfig(max_tokens=0)
-
-        assert "Max tokens must be positive" in str(exc_info.value)
-
-    def test_temperature_below_range_raises_error(self):
-        """Test that temperature below 0.0 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            QwenVLConfig(temperature=-0.1)
-
-        assert "Temperature must be between 0.0 and 2.0" in str(exc_info.value)
-
-    def test_temperature_above_range_raises_error(self):
-        """Test that temperature above 2.0 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            QwenVLConfig(temperature=2.5)
-
-        assert "Temperature must be between 0.0 and 2.0" in str(exc_info.value)
-
-    def test_temperature_at_boundaries(self):
+        assert_fields(config, model_id="custom-vl-model", max_tokens=1024, temperature=0.5, fps=2.0)
+
+    @pytest.mark.parametrize("field,value,message", [
+        ("max_tokens", -100, "Max tokens must be positive"),
+        ("max_tokens", 0, "Max tokens must be positive"),
+        ("temperature", -0.1, "Temperature must be between 0.0 and 2.0"),
+        ("temperature", 2.5, "Temperature must be between 0.0 and 2.0"),
+        ("fps", -1.0, "FPS must be positive"),
+    ], ids=["negative_max_tokens", "zero_max_tokens", "temperature_below", "temperature_above", "negative_fps"])
+    def test_invalid_value_raises_error(self, field, value, message):
+        """Test that out-of-range max_tokens, temperature and fps are rejected."""
+        with pytest.raises(ValidationError, match=re.escape(message)):
+            QwenVLConfig(**{field: value})
+
+    @pytest.mark.parametrize("temperature", [0.0, 2.0])
+    def test_temperature_at_boundaries(self, temperature):
         """Test that temperature at 0.0 and 2.0 is accepted."""
-        config_min = QwenVLConfig(temperature=0.0)
-        config_max = QwenVLConfig(temperature=2.0)
-
-        assert config_min.temperature == 0.0
-        assert config_max.temperature == 2.0
-
-    def test_negative_fps_raises_error(self):
-        """Test that negative fps is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            QwenVLConfig(fps=-1.0)
-
-        assert "FPS must be positive" in str(exc_info.value)
+        assert QwenVLConfig(temperature=temperature).temperature == temperature
 
 
 class TestProcessingConfig:
@@ -191,11 +159,9 @@ class TestProcessingConfig:
 
     def test_default_values(self):
         """Test that ProcessingConfig initializes with correct defaults."""
-        config = ProcessingConfig()
+        config = ProcessingConfig.model_construct()
 
-        assert config.keep_temp_files is False
-        assert config.temp_dir == "/tmp/video-tools"
-        assert config.cache_dir is None
+        assert_fields(config, keep_temp_files=False, temp_dir="/tmp/video-tools", cache_dir=None)
 
     def test_custom_values(self):
         """Test ProcessingConfig accepts custom values."""
@@ -205,22 +171,21 @@ class TestProcessingConfig:
             cache_dir="/custom/cache"
         )
 
-        assert config.keep_temp_files is True
-        assert config.temp_dir == "/custom/temp"
-        assert config.cache_dir == "/custom/cache"
+        assert_fields(config, keep_temp_files=True, temp_dir="/custom/temp", cache_dir="/custom/cache")
 
-    def test_path_expansion_with_tilde(self, monkeypatch):
+    def test_path_expansion_with_tilde(self, home_dir):
         """Test that ~ is expanded to home directory in paths."""
-        # Get actual home directory
-        home = str(Path.home())
-
         config = ProcessingConfig(
             temp_dir="~/temp",
             cache_dir="~/cache"
         )
 
-        assert config.temp_dir == f"{home}/temp"
-        assert config.cache_dir == f"{home}/cache"
+        assert config.temp_dir == f"{home_dir}/temp"
+        assert config.cache_dir == f"{home_dir}/cache"
+
+    def test_path_expansion_bare_tilde(self, home_dir):
+        """Test that a bare ~ expands to the home directory itself."""
+        assert ProcessingConfig(temp_dir="~").temp_dir == home_dir
 
     def test_path_expansion_with_none(self):
         """Test that None cache_dir is handled correctly."""
@@ -234,11 +199,9 @@ class TestScreenshotConfig:
 
     def test_default_values(self):
         """Test that ScreenshotConfig initializes with correct defaults."""
-        config = ScreenshotConfig()
+        config = ScreenshotConfig.model_construct()
 
-        assert config.default_interval == 5
-        assert config.default_similarity == 0.90
-        assert config.jpeg_quality == 95
+        assert_fields(config, default_interval=5, default_similarity=0.90, jpeg_quality=95)
 
     def test_custom_values(self):
         """Test ScreenshotConfig accepts custom values."""
@@ -248,44 +211,19 @@ class TestScreenshotConfig:
             jpeg_quality=90
         )
 
-        assert config.default_interval == 10
-        assert config.default_similarity == 0.85
-        assert config.jpeg_quality == 90
-
-    def test_negative_interval_raises_error(self):
-        """Test that negative interval is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ScreenshotConfig(default_interval=-5)
-
-        assert "Interval must be positive" in str(exc_info.value)
-
-    def test_similarity_below_range_raises_error(self):
-        """Test that similarity below 0.0 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ScreenshotConfig(default_similarity=-0.1)
-
-        assert "Similarity threshold must be between 0.0 and 1.0" in str(exc_info.value)
-
-    def test_similarity_above_range_raises_error(self):
-        """Test that similarity above 1.0 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ScreenshotConfig(default_similarity=1.5)
-
-        assert "Similarity threshold must be between 0.0 and 1.0" in str(exc_info.value)
-
-    def test_jpeg_quality_below_range_raises_error(self):
-        """Test that JPEG quality below 0 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ScreenshotConfig(jpeg_quality=-10)
+        assert_fields(config, default_interval=10, default_similarity=0.85, jpeg_quality=90)
 
-        assert "JPEG quality must be between 0 and 100" in str(exc_info.value)
-
-    def test_jpeg_quality_above_range_raises_error(self):
-        """Test that JPEG quality above 100 is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            ScreenshotConfig(jpeg_quality=110)
-
-        assert "JPEG quality must be between 0 and 100" in str(exc_info.value)
+    @pytest.mark.parametrize("field,value,message", [
+        ("default_interval", -5, "Interval must be positive"),
+        ("default_similarity", -0.1, "Similarity threshold must be between 0.0 and 1.0"),
+        ("default_similarity", 1.5, "Similarity threshold must be between 0.0 and 1.0"),
+        ("jpeg_quality", -10, "JPEG quality must be between 0 and 100"),
+        ("jpeg_quality", 110, "JPEG quality must be between 0 and 100"),
+    ], ids=["negative_interval", "similarity_below", "similarity_above", "quality_below", "quality_above"])
+    def test_invalid_value_raises_error(self, field, value, message):
+        """Test that out-of-range interval, similarity and JPEG quality are rejected."""
+        with pytest.raises(ValidationError, match=re.escape(message)):
+            ScreenshotConfig(**{field: value})
 
 
 class TestTranscriptionConfig:
@@ -293,25 +231,20 @@ class TestTranscriptionConfig:
 
     def test_default_values(self):
         """Test that TranscriptionConfig initializes with correct defaults."""
-        config = TranscriptionConfig()
+        config = TranscriptionConfig.model_construct()
 
         assert config.default_format == "srt"
 
-    def test_valid_formats(self):
+    @pytest.mark.parametrize("fmt", ["srt", "vtt", "txt", "json"])
+    def test_valid_formats(self, fmt):
         """Test that all valid formats are accepted."""
-        valid_formats = ["srt", "vtt", "txt", "json"]
-
-        for fmt in valid_formats:
-            config = TranscriptionConfig(default_format=fmt)
-            assert config.default_format == fmt
+        assert TranscriptionConfig(default_format=fmt).default_format == fmt
 
     def test_invalid_format_raises_error(self):
         """Test that invalid format is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="Format must be one of"):
             TranscriptionConfig(default_format="invalid")
 
-        assert "Format must be one of" in str(exc_info.value)
-
     def test_format_case_insensitive(self):
         """Test that format is converted to lowercase."""
         config = TranscriptionConfig(default_format="SRT")
@@ -324,7 +257,8 @@ class TestVideoToolsConfig:
 
     def test_default_values(self):
         """Test that VideoToolsConfig initializes with all sub-configs."""
-        config = VideoToolsConfig()
+        # default_factory still builds each sub-config
+        config = VideoToolsConfig.model_construct()
 
         # Verify all sub-configs exist with defaults
         assert isinstance(config.parakeet, ParakeetConfig)
@@ -347,6 +281,29 @@ class TestVideoToolsConfig:
         assert config.processing.keep_temp_files is True
 
 
+class TestDeferredSchemaBuild:
+    """Test that config validator schemas are built lazily."""
+
+    def test_import_does_not_build_schemas(self):
+        """Test that importing the config module leaves every schema unbuilt."""
+        code = (
+            "from video_tools_mcp.config import models\n"
+            "classes = [models.ParakeetConfig, models.PyannoteConfig, models.QwenVLConfig,\n"
+            "           models.ProcessingConfig, models.ScreenshotConfig,\n"
+            "           models.TranscriptionConfig, models.VideoToolsConfig]\n"
+            "assert not any(c.__pydantic_complete__ for c in classes)\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_first_use_builds_schema(self):
+        """Test that a forced rebuild completes and validation still applies."""
+        VideoToolsConfig.model_rebuild(force=True)
+
+        assert VideoToolsConfig.__pydantic_complete__
+        with pytest.raises(ValidationError):
+            VideoToolsConfig(processing={"temp_dir": 123})
+
+
 class TestLoadConfig:
     """Test cases for load_config() function."""
 
@@ -363,6 +320,19 @@ class TestLoadConfig:
         assert config.processing.temp_dir == str(temp_dir)
         assert config.processing.keep_temp_files is False
 
+    def test_baseline_config_matches_defaults(self, baseline_config):
+        """Test that the shared session config is an unmodified default load_config()."""
+        assert baseline_config.pyannote.hf_token is None
+        assert baseline_config.processing.cache_dir is None
+        assert baseline_config.processing.keep_temp_files is False
+        assert baseline_config.parakeet == ParakeetConfig()
+
+        derived = baseline_config.model_copy(update={
+            "processing": baseline_config.processing.model_copy(update={"keep_temp_files": True})
+        })
+        assert derived.processing.keep_temp_files is True
+        assert baseline_config.processing.keep_temp_files is False
+
     def test_load_config_with_env_vars(self, temp_dir, monkeypatch):
         """Test load_config() respects environment variables."""
         # Set environment variables
@@ -382,10 +352,10 @@ class TestLoadConfig:
         assert config.processing.temp_dir == str(test_temp_dir)
         assert config.processing.keep_temp_files is True
 
-    def test_load_config_creates_cache_dir(self, temp_dir, monkeypatch):
+    def test_load_config_creates_cache_dir(self, fake_temp_dir, monkeypatch):
         """Test load_config() creates cache directory if specified."""
-        test_cache_dir = temp_dir / "new_cache"
-        test_temp_dir = temp_dir / "temp"
+        test_cache_dir = fake_temp_dir / "new_cache"
+        test_temp_dir = fake_temp_dir / "temp"
 
         monkeypatch.setenv("VIDEO_TOOLS_CACHE_DIR", str(test_cache_dir))
         monkeypatch.setenv("VIDEO_TOOLS_TEMP_DIR", str(test_temp_dir))
@@ -399,9 +369,9 @@ class TestLoadConfig:
         assert test_cache_dir.exists()
         assert test_cache_dir.is_dir()
 
-    def test_load_config_creates_temp_dir(self, temp_dir, monkeypatch):
+    def test_load_config_creates_temp_dir(self, fake_temp_dir, monkeypatch):
         """Test load_config() creates temp directory."""
-        test_temp_dir = temp_dir / "new_temp"
+        test_temp_dir = fake_temp_dir / "new_temp"
 
         monkeypatch.setenv("VIDEO_TOOLS_TEMP_DIR", str(test_temp_dir))
 
@@ -0,0 +1,97 @@
+"""
+Unit tests for chunked diarization merging (processing/diarization_merge.py).
+
+Tests cover:
+- Hungarian matching of chunk speakers to known centroids
+- New speakers below the similarity threshold
+- Speaker cap enforcement
+- Relabeling and time offsets across chunks
+"""
+
+import numpy as np
+import pytest
+
+from video_tools_mcp.processing.diarization_merge import (
+    assign_chunk_speakers,
+    merge_chunk_diarizations
+)
+
+
+A = [1.0, 0.0, 0.0]
+B = [0.0, 1.0, 0.0]
+C = [0.0, 0.0, 1.0]
+
+
+class TestAssignChunkSpeakers:
+    """Test matching chunk centroids to known speakers."""
+
+    def test_first_chunk_gets_new_indices(self):
+        """With no known speakers every chunk speaker is new."""
+        assert assign_chunk_speakers(np.zeros((0, 3)), np.array([A, B])) == [0, 1]
+
+    def test_matches_by_similarity_not_order(self):
+        """Chunk speakers are matched to the most similar known centroid."""
+        known = np.array([A, B])
+        chunk = np.array([[0.1, 0.9, 0.0], [0.9, 0.1, 0.0]])
+        assert assign_chunk_speakers(known, chunk) == [1, 0]
+
+    def test_dissimilar_speaker_is_new(self):
+        """A speaker below the threshold gets the next free index."""
+        known = np.array([A, B])
+        assert assign_chunk_speakers(known, np.array([B, C])) == [1, 2]
+
+    def test_max_speakers_forces_match(self):
+        """At the speaker cap a dissimilar speaker takes its best match."""
+        known = np.array([A, B])
+        chunk = np.array([[0.1, 0.0, 1.0]])
+        assert assign_chunk_speakers(known, chunk, max_speakers=2) == [0]
+
+
+class TestMergeChunkDiarizations:
+    """Test stitching chunk diarizations together."""
+
+    @pytest.fixture
+    def chunks(self):
+        """Two chunks sharing speaker B, with A in the first and C in the second."""
+        return [
+            {
+                "offset": 0.0,
+                "segments": [
+                    {"start": 0.0, "end": 2.0, "speaker": "SPEAKER_00"},
+                    {"start": 2.0, "end": 4.0, "speaker": "SPEAKER_01"},
+                ],
+                "labels": ["SPEAKER_00", "SPEAKER_01"],
+                "embeddings": np.array([A, B]),
+            },
+            {
+                "offset": 300.0,
+                "segments": [
+                    {"start": 0.0, "end": 1.0, "speaker": "SPEAKER_00"},
+                    {"start": 1.0, "end": 3.0, "speaker": "SPEAKER_01"},
+                ],
+                "labels": ["SPEAKER_00", "SPEAKER_01"],
+                "embeddings": np.array([[0.05, 0.95, 0.0], C]),
+            },
+        ]
+
+    def test_links_speakers_across_chunks(self, chunks):
+        """Shared speakers keep one label and new ones get the next label."""
+        result = merge_chunk_diarizations(chunks)
+
+        assert result["num_speakers"] == 3
+        assert result["speakers"] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"]
+        assert [s["speaker"] for s in result["segments"]] == [
+            "SPEAKER_00", "SPEAKER_01", "SPEAKER_01", "SPEAKER_02"
+        ]
+
+    def test_offsets_segment_times(self, chunks):
+        """Segments from later chunks are shifted by the chunk offset."""
+        result = merge_chunk_diarizations(chunks)
+
+        assert result["segments"][2]["start"] == pytest.approx(300.0)
+        assert result["segments"][3]["end"] == pytest.approx(303.0)
+
+    def test_respects_max_speakers(self, chunks):
+        """The merged result never exceeds max_speakers."""
+        result = merge_chunk_diarizations(chunks, max_speakers=2)
+        assert result["num_speakers"] == 2
@@ -8,16 +8,21 @@ Tests cover:
 - Disk space checking
 - Temporary filename generation
 - Temporary file cleanup
+- JSON output
 """
 
+import json
 import os
+import shutil
 import time
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 
 import pytest
 import ffmpeg
 
+from tests.conftest import VIDEO_EXTS, make_aged_file
+from video_tools_mcp.utils import file_utils
 from video_tools_mcp.utils.file_utils import (
     validate_video_path,
     ensure_output_directory,
@@ -25,11 +30,21 @@ from video_tools_mcp.utils.file_utils import (
     check_disk_space,
     generate_temp_filename,
     cleanup_temp_files,
+    write_json,
     VideoProcessingError,
     AudioExtractionError
 )
 
 
+# Canned ffmpeg.probe results; get_video_duration() only reads them
+_PROBE_FORMAT_DURATION = {'format': {'duration': '125.50'}, 'streams': []}
+_PROBE_STREAM_DURATION = {
+    'format': {},
+    'streams': [{'codec_type': 'video', 'duration': '90.25'}]
+}
+_PROBE_NO_DURATION = {'format': {}, 'streams': []}
+
+
 class TestValidateVideoPath:
     """Test cases for validate_video_path() function."""
 
@@ -39,17 +54,17 @@ class TestValidateVideoPath:
 
         assert result is True
 
-    def test_validate_video_path_missing_file_returns_false(self, temp_dir):
+    def test_validate_video_path_missing_file_returns_false(self, shared_temp_dir):
         """Test that a non-existent file path returns False."""
-        missing_path = str(temp_dir / "missing_video.mp4")
+        missing_path = str(shared_temp_dir / "missing_video.mp4")
 
         result = validate_video_path(missing_path)
 
         assert result is False
 
-    def test_validate_video_path_directory_returns_false(self, temp_dir):
+    def test_validate_video_path_directory_returns_false(self, shared_temp_dir):
         """Test that a directory path returns False."""
-        result = validate_video_path(str(temp_dir))
+        result = validate_video_path(str(shared_temp_dir))
 
         assert result is False
 
@@ -62,11 +77,10 @@ class TestValidateVideoPath:
 
         assert result is False
 
-    def test_validate_video_path_accepts_all_video_extensions(self, sample_video_files):
+    @pytest.mark.parametrize("ext", sorted(VIDEO_EXTS))
+    def test_validate_video_path_accepts_all_video_extensions(self, sample_video_files, ext):
         """Test that all supported video extensions are accepted."""
-        for ext, file_path in sample_video_files.items():
-            result = validate_video_path(file_path)
-            assert result is True, f"Extension .{ext} should be valid"
+        assert validate_video_path(sample_video_files[ext]) is True
 
     def test_validate_video_path_case_insensitive_extension(self, temp_dir):
         """Test that video extension check is case-insensitive."""
@@ -81,9 +95,9 @@ class TestValidateVideoPath:
 class TestEnsureOutputDirectory:
     """Test cases for ensure_output_directory() function."""
 
-    def test_ensure_output_directory_creates_new_directory(self, temp_dir):
+    def test_ensure_output_directory_creates_new_directory(self, fake_temp_dir):
         """Test that new directory is created successfully."""
-        new_dir = temp_dir / "output" / "nested" / "directory"
+        new_dir = fake_temp_dir / "output" / "nested" / "directory"
 
         # Directory shouldn't exist yet
         assert not new_dir.exists()
@@ -94,9 +108,9 @@ class TestEnsureOutputDirectory:
         assert new_dir.exists()
         assert new_dir.is_dir()
 
-    def test_ensure_output_directory_existing_directory_succeeds(self, temp_dir):
+    def test_ensure_output_directory_existing_directory_succeeds(self, fake_temp_dir):
         """Test that function succeeds if directory already exists."""
-        existing_dir = temp_dir / "existing"
+        existing_dir = fake_temp_dir / "existing"
         existing_dir.mkdir()
 
         # Should not raise error
@@ -104,9 +118,9 @@ class TestEnsureOutputDirectory:
 
         assert existing_dir.exists()
 
-    def test_ensure_output_directory_file_exists_raises_error(self, temp_dir):
+    def test_ensure_output_directory_file_exists_raises_error(self, fake_temp_dir):
         """Test that ValueError or OSError is raised if path is an existing file."""
-        file_path = temp_dir / "file.txt"
+        file_path = fake_temp_dir / "file.txt"
         file_path.touch()
 
         # The function raises OSError which wraps the original ValueError
@@ -120,49 +134,32 @@ class TestEnsureOutputDirectory:
 class TestGetVideoDuration:
     """Test cases for get_video_duration() function."""
 
+    @pytest.fixture(autouse=True)
+    def _probe(self, monkeypatch):
+        """Replace ffmpeg.probe; tests set self.probe's return_value or side_effect."""
+        self.probe = Mock()
+        monkeypatch.setattr(ffmpeg, 'probe', self.probe)
+
     def test_get_video_duration_from_format(self):
         """Test extracting duration from format section of probe."""
-        mock_probe_result = {
-            'format': {
-                'duration': '125.50'
-            },
-            'streams': []
-        }
-
-        with patch('ffmpeg.probe', return_value=mock_probe_result):
-            duration = get_video_duration("/path/to/video.mp4")
+        self.probe.return_value = _PROBE_FORMAT_DURATION
+        duration = get_video_duration("/path/to/video.mp4")
 
         assert duration == 125.50
 
     def test_get_video_duration_from_stream(self):
         """Test extracting duration from video stream when format doesn't have it."""
-        mock_probe_result = {
-            'format': {},
-            'streams': [
-                {
-                    'codec_type': 'video',
-                    'duration': '90.25'
-                }
-            ]
-        }
-
-        with patch('ffmpeg.probe', return_value=mock_probe_result):
-            duration = get_video_duration("/path/to/video.mp4")
+        self.probe.return_value = _PROBE_STREAM_DURATION
+        duration = get_video_duration("/path/to/video.mp4")
 
         assert duration == 90.25
 
     def test_get_video_duration_no_duration_raises_error(self):
         """Test that VideoProcessingError is raised when no duration found."""
-        mock_probe_result = {
-            'format': {},
-            'streams': []
-        }
+        self.probe.return_value = _PROBE_NO_DURATION
 
-        with patch('ffmpeg.probe', return_value=mock_probe_result):
-            with pytest.raises(VideoProcessingError) as exc_info:
-                get_video_duration("/path/to/video.mp4")
-
-        assert "Could not determine video duration" in str(exc_info.value)
+        with pytest.raises(VideoProcessingError, match="Could not determine video duration"):
+            get_video_duration("/path/to/video.mp4")
 
     def test_get_video_duration_ffmpeg_error_raises_error(self):
         """Test that FFmpeg errors are properly handled."""
@@ -170,32 +167,30 @@ class TestGetVideoDuration:
         mock_error = ffmpeg.Error('ffmpeg', 'stdout', b'Error reading file')
         mock_error.stderr = b'Error reading file'
 
-        with patch('ffmpeg.probe', side_effect=mock_error):
-            with pytest.raises(VideoProcessingError) as exc_info:
-                get_video_duration("/path/to/video.mp4")
+        self.probe.side_effect = mock_error
 
-        assert "Failed to probe video" in str(exc_info.value)
+        with pytest.raises(VideoProcessingError, match="Failed to probe video"):
+            get_video_duration("/path/to/video.mp4")
 
 
 class TestCheckDiskSpace:
     """Test cases for check_disk_space() function."""
 
-    def test_check_disk_space_sufficient_space_returns_true(self, temp_dir):
+    def test_check_disk_space_sufficient_space_returns_true(self, shared_temp_dir):
         """Test that True is returned when sufficient space is available."""
         # Request very small amount (0.001 GB = 1 MB)
-        result = check_disk_space(str(temp_dir), required_gb=0.001)
+        result = check_disk_space(str(shared_temp_dir), required_gb=0.001)
 
         assert result is True
 
-    def test_check_disk_space_insufficient_space_returns_false(self, temp_dir):
+    def test_check_disk_space_insufficient_space_returns_false(self, shared_temp_dir, monkeypatch):
         """Test that False is returned when insufficient space."""
         # Mock disk_usage to return low free space
-        mock_usage = MagicMock()
-        mock_usage.free = 1024 * 1024 * 100  # 100 MB in bytes
+        mock_usage = Mock(free=1024 * 1024 * 100)  # 100 MB in bytes
+        monkeypatch.setattr(shutil, 'disk_usage', lambda path: mock_usage)
 
-        with patch('shutil.disk_usage', return_value=mock_usage):
-            # Request 1 GB, but only 100 MB available
-            result = check_disk_space(str(temp_dir), required_gb=1.0)
+        # Request 1 GB, but only 100 MB available
+        result = check_disk_space(str(shared_temp_dir), required_gb=1.0)
 
         assert result is False
 
@@ -209,10 +204,13 @@ class TestCheckDiskSpace:
 
         assert result is True
 
-    def test_check_disk_space_error_returns_false(self):
+    def test_check_disk_space_error_returns_false(self, monkeypatch):
         """Test that errors during check return False for safety."""
-        with patch('shutil.disk_usage', side_effect=OSError("Disk error")):
-            result = check_disk_space("/invalid/path", required_gb=1.0)
+        def failing_disk_usage(path):
+            raise OSError("Disk error")
+
+        monkeypatch.setattr(shutil, 'disk_usage', failing_disk_usage)
+        result = check_disk_space("/invalid/path", required_gb=1.0)
 
         assert result is False
 
@@ -230,13 +228,13 @@ class TestGenerateTempFilename:
         # Should have 8-character unique ID
         assert len(filename) == len("audio_") + 8 + len(".wav")
 
-    def test_generate_temp_filename_with_directory(self, temp_dir):
+    def test_generate_temp_filename_with_directory(self, shared_temp_dir):
         """Test generating temp filename with directory path."""
-        full_path = generate_temp_filename("video", ".mp4", str(temp_dir))
+        full_path = generate_temp_filename("video", ".mp4", str(shared_temp_dir))
 
         # Check it's a full path
         path = Path(full_path)
-        assert path.parent == temp_dir
+        assert path.parent == shared_temp_dir
         assert path.name.startswith("video_")
         assert path.name.endswith(".mp4")
 
@@ -257,61 +255,58 @@ class TestGenerateTempFilename:
         # All filenames should be unique
         assert len(filenames) == 10
 
-    def test_generate_temp_filename_exception_fallback(self):
+    def test_generate_temp_filename_exception_fallback(self, monkeypatch):
         """Test fallback to timestamp-based name on error."""
-        # Mock uuid4 to raise exception
-        with patch('uuid.uuid4', side_effect=Exception("UUID error")):
-            filename = generate_temp_filename("test", ".tmp")
+        # Make id generation fail
+        def failing_new_id():
+            raise Exception("UUID error")
+
+        monkeypatch.setattr(file_utils, '_new_id', failing_new_id)
+        filename = generate_temp_filename("test", ".tmp")
 
-            # Should still return a valid filename using timestamp
-            assert filename.startswith("test_")
-            assert filename.endswith(".tmp")
+        # Should still return a valid filename using a millisecond timestamp
+        assert filename.startswith("test_")
+        assert filename.endswith(".tmp")
+        assert filename[len("test_"):-len(".tmp")].isdigit()
 
 
 class TestCleanupTempFiles:
     """Test cases for cleanup_temp_files() function."""
 
-    def test_cleanup_temp_files_removes_old_files(self, temp_dir):
+    def test_cleanup_temp_files_removes_old_files(self, fake_temp_dir):
         """Test that old files are deleted."""
-        # Create test files with old timestamps
-        old_file1 = temp_dir / "old_file1.tmp"
-        old_file2 = temp_dir / "old_file2.tmp"
-        old_file1.touch()
-        old_file2.touch()
-
-        # Set modification time to 48 hours ago
-        old_time = time.time() - (48 * 3600)
-        os.utime(old_file1, (old_time, old_time))
-        os.utime(old_file2, (old_time, old_time))
+        # Create test files modified 48 hours ago
+        old_file1 = fake_temp_dir / "old_file1.tmp"
+        old_file2 = fake_temp_dir / "old_file2.tmp"
+        make_aged_file(old_file1, age_hours=48)
+        make_aged_file(old_file2, age_hours=48)
 
         # Run cleanup for files older than 24 hours
-        count = cleanup_temp_files(str(temp_dir), max_age_hours=24)
+        count = cleanup_temp_files(str(fake_temp_dir), max_age_hours=24)
 
         # Both old files should be deleted
         assert count == 2
         assert not old_file1.exists()
         assert not old_file2.exists()
 
-    def test_cleanup_temp_files_keeps_recent_files(self, temp_dir):
+    def test_cleanup_temp_files_keeps_recent_files(self, fake_temp_dir):
         """Test that recent files are kept."""
         # Create recent file
-        recent_file = temp_dir / "recent_file.tmp"
+        recent_file = fake_temp_dir / "recent_file.tmp"
         recent_file.touch()
 
         # Run cleanup for files older than 24 hours
-        count = cleanup_temp_files(str(temp_dir), max_age_hours=24)
+        count = cleanup_temp_files(str(fake_temp_dir), max_age_hours=24)
 
         # Recent file should still exist
         assert count == 0
         assert recent_file.exists()
 
     def test_cleanup_temp_files_mixed_ages(self, temp_dir):
-        """Test cleanup with mix of old and recent files."""
+        """Test cleanup with mix of old and recent files (on the real filesystem)."""
         # Create old file
         old_file = temp_dir / "old_file.tmp"
-        old_file.touch()
-        old_time = time.time() - (48 * 3600)
-        os.utime(old_file, (old_time, old_time))
+        make_aged_file(old_file, age_hours=48)
 
         # Create recent file
         recent_file = temp_dir / "recent_file.tmp"
@@ -325,72 +320,98 @@ class TestCleanupTempFiles:
         assert not old_file.exists()
         assert recent_file.exists()
 
-    def test_cleanup_temp_files_nonexistent_directory_returns_zero(self, temp_dir):
+    def test_cleanup_temp_files_nonexistent_directory_returns_zero(self, fake_temp_dir):
         """Test that cleanup returns 0 for non-existent directory."""
-        missing_dir = temp_dir / "missing"
+        missing_dir = fake_temp_dir / "missing"
 
         count = cleanup_temp_files(str(missing_dir), max_age_hours=24)
 
         assert count == 0
 
-    def test_cleanup_temp_files_ignores_subdirectories(self, temp_dir):
+    def test_cleanup_temp_files_ignores_subdirectories(self, fake_temp_dir):
         """Test that subdirectories are not deleted."""
         # Create old subdirectory
-        old_subdir = temp_dir / "old_subdir"
+        old_subdir = fake_temp_dir / "old_subdir"
         old_subdir.mkdir()
         old_time = time.time() - (48 * 3600)
         os.utime(old_subdir, (old_time, old_time))
 
         # Run cleanup
-        count = cleanup_temp_files(str(temp_dir), max_age_hours=24)
+        count = cleanup_temp_files(str(fake_temp_dir), max_age_hours=24)
 
         # Directory should still exist (only files are deleted)
         assert count == 0
         assert old_subdir.exists()
 
-    def test_cleanup_temp_files_continues_on_individual_error(self, temp_dir):
+    def test_cleanup_temp_files_continues_on_individual_error(self, temp_dir, monkeypatch):
         """Test that cleanup continues even if one file deletion fails."""
-        # Create test files
+        # Create two old test files
         file1 = temp_dir / "file1.tmp"
         file2 = temp_dir / "file2.tmp"
-        file1.touch()
-        file2.touch()
-
-        # Make both files old
-        old_time = time.time() - (48 * 3600)
-        os.utime(file1, (old_time, old_time))
-        os.utime(file2, (old_time, old_time))
+        make_aged_file(file1, age_hours=48)
+        make_aged_file(file2, age_hours=48)
 
         # Mock unlink to fail for first file but succeed for second
-        original_unlink = Path.unlink
+        original_unlink = os.unlink
         call_count = [0]
 
-        def mock_unlink(self, *args, **kwargs):
+        def mock_unlink(path, *args, **kwargs):
             call_count[0] += 1
             if call_count[0] == 1:
                 raise PermissionError("Mock permission denied")
-            return original_unlink(self, *args, **kwargs)
+            return original_unlink(path, *args, **kwargs)
 
-        with patch.object(Path, 'unlink', mock_unlink):
-            count = cleanup_temp_files(str(temp_dir), max_age_hours=24)
+        monkeypatch.setattr(os, 'unlink', mock_unlink)
+        count = cleanup_temp_files(str(temp_dir), max_age_hours=24)
 
         # Should have tried to delete both but only succeeded with one
         assert count == 1
 
+    @pytest.mark.parametrize("num_files", [100, 1000])
+    def test_cleanup_temp_files_many_files(self, fake_temp_dir, num_files):
+        """Test cleanup of a large directory of old files next to a recent one."""
+        for i in range(num_files):
+            make_aged_file(fake_temp_dir / f"old_{i}.tmp", age_hours=48)
+        recent_file = fake_temp_dir / "recent.tmp"
+        make_aged_file(recent_file, age_hours=0)
+
+        count = cleanup_temp_files(str(fake_temp_dir), max_age_hours=24)
+
+        assert count == num_files
+        assert [p.name for p in fake_temp_dir.iterdir()] == ["recent.tmp"]
+
+
+class TestWriteJson:
+    """Test cases for write_json() function."""
+
+    def test_write_json_round_trips(self, temp_dir):
+        """Test that written data reads back unchanged."""
+        data = {"screenshots": [{"filename": "a.jpg", "timestamp": 1.5}], "caption": "Café"}
+        output = temp_dir / "metadata.json"
+
+        write_json(str(output), data)
+
+        with open(output, "r", encoding="utf-8") as f:
+            assert json.load(f) == data
+
+    def test_write_json_is_indented(self, temp_dir):
+        """Test that output is human-readable (one key per line)."""
+        output = temp_dir / "metadata.json"
+
+        write_json(str(output), {"a": 1, "b": 2})
+
+        assert len(output.read_text().splitlines()) == 4
+
 
 class TestExceptions:
     """Test custom exception classes."""
 
     def test_video_processing_error_can_be_raised(self):
         """Test that VideoProcessingError can be raised and caught."""
-        with pytest.raises(VideoProcessingError) as exc_info:
+        with pytest.raises(VideoProcessingError, match="Test error message"):
             raise VideoProcessingError("Test error message")
 
-        assert "Test error message" in str(exc_info.value)
-
     def test_audio_extraction_error_can_be_raised(self):
         """Test that AudioExtractionError can be raised and caught."""
-        with pytest.raises(AudioExtractionError) as exc_info:
+        with pytest.raises(AudioExtractionError, match="Test audio error"):
             raise AudioExtractionError("Test audio error")
-
-        assert "Test audio error" in str(exc_info.value)
@@ -0,0 +1,111 @@
+"""
+Unit tests for frame extraction helpers (processing/frame_extraction.py).
+
+Tests cover:
+- Adaptive timestamp selection from thumbnail differences
+- Decoder backend validation
+- Frame timestamps of single-pass extraction
+"""
+
+import shutil
+import subprocess
+
+import pytest
+from PIL import Image
+
+from video_tools_mcp.processing.frame_extraction import (
+    FrameExtractor,
+    select_adaptive_timestamps
+)
+
+
+class TestSelectAdaptiveTimestamps:
+    """Test cases for select_adaptive_timestamps()."""
+
+    def test_static_video_falls_back_to_max_gap(self):
+        """Test that a static scene is still sampled every max_gap seconds."""
+        timestamps = select_adaptive_timestamps(
+            [0.0] * 40, step=1.0, min_gap=1.0, max_gap=10.0
+        )
+
+        assert timestamps == [0.0, 10.0, 20.0, 30.0, 40.0]
+
+    def test_scene_change_is_selected(self):
+        """Test that a spike above the rolling mean selects that position."""
+        diffs = [1.0] * 10 + [20.0] + [1.0] * 5
+
+        timestamps = select_adaptive_timestamps(
+            diffs, step=1.0, min_gap=1.0, max_gap=100.0
+        )
+
+        assert 11.0 in timestamps
+
+    def test_min_gap_suppresses_close_changes(self):
+        """Test that changes closer than min_gap are not all selected."""
+        diffs = [1.0] * 8 + [20.0, 40.0, 80.0]
+
+        timestamps = select_adaptive_timestamps(
+            diffs, step=1.0, min_gap=3.0, max_gap=100.0
+        )
+
+        assert all(b - a >= 3.0 for a, b in zip(timestamps, timestamps[1:]))
+
+    def test_always_starts_at_zero(self):
+        """Test that the first frame is always sampled."""
+        assert select_adaptive_timestamps([], step=1.0, min_gap=1.0, max_gap=5.0) == [0.0]
+
+
+class TestFrameExtractorInit:
+    """Test cases for FrameExtractor construction."""
+
+    def test_cpu_backend(self):
+        """Test that an explicit backend is kept."""
+        assert FrameExtractor(decoder_backend="cpu").decoder_backend == "cpu"
+
+    def test_auto_backend_resolves(self):
+        """Test that auto resolves to a concrete backend."""
+        assert FrameExtractor().decoder_backend in ("cpu", "videotoolbox")
+
+    def test_unknown_backend_raises(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError, match="Unknown decoder backend"):
+            FrameExtractor(decoder_backend="nvdec")
+
+
+@pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg/ffprobe not installed"
+)
+class TestSinglePassTimestamps:
+    """Test that single-pass frames match the timestamps they are labeled with."""
+
+    def test_frames_match_seeked_frames(self, tmp_path):
+        """Frames from the fps filter are the ones seeking to each timestamp returns."""
+        # 10 fps clip whose brightness rises with the frame number
+        video_path = tmp_path / "ramp.mp4"
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-f", "lavfi",
+                "-i", "nullsrc=s=64x64:r=10:d=20,geq=lum='16+N':cb=128:cr=128",
+                "-pix_fmt", "yuv420p", str(video_path)
+            ],
+            check=True,
+            capture_output=True
+        )
+
+        extractor = FrameExtractor(decoder_backend="cpu")
+        frames = extractor.extract_frames_at_interval(
+            video_path, output_dir=tmp_path / "single", sample_interval=5.0
+        )
+        seeked = extractor._extract_by_seeking(
+            video_path, tmp_path / "seek", [frame.timestamp for frame in frames]
+        )
+
+        def brightness(path):
+            with Image.open(path) as img:
+                return sum(img.convert("L").getdata()) / (64 * 64)
+
+        assert [frame.timestamp for frame in frames] == [0.0, 5.0, 10.0, 15.0]
+        for frame, expected in zip(frames, seeked):
+            # Adjacent frames differ by ~1 level; half an interval off is ~25
+            assert abs(brightness(frame.frame_path) - brightness(expected.frame_path)) < 3
@@ -0,0 +1,178 @@
+"""
+Unit tests for perceptual hash utilities (utils/image_utils.py).
+
+Tests cover:
+- pHash parity with imagehash
+- Threshold to Hamming cutoff conversion
+- Vectorized Hamming distances
+- Frame deduplication
+- BK-tree nearest-duplicate lookup
+"""
+
+import random
+
+import imagehash
+import numpy as np
+import pytest
+from PIL import Image
+
+from video_tools_mcp.utils.image_utils import (
+    HammingBKTree,
+    calculate_similarity,
+    compute_phash,
+    deduplicate_frames,
+    hamming_cutoff,
+    hamming_distances,
+    hash_to_int
+)
+
+
+@pytest.fixture
+def frame_paths(temp_dir):
+    """Noisy variations of a few base images, written as PNG frames."""
+    rng = np.random.default_rng(0)
+    bases = [rng.integers(0, 255, (64, 64, 3)) for _ in range(4)]
+    paths = []
+
+    for i in range(24):
+        noisy = bases[i % 4] + rng.integers(-40, 40, (64, 64, 3))
+        path = temp_dir / f"frame_{i:03d}.png"
+        Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(path)
+        paths.append(path)
+
+    return paths
+
+
+class TestComputePhash:
+    """Test cases for compute_phash()."""
+
+    @pytest.mark.parametrize("hash_size", [8, 16])
+    def test_matches_imagehash_phash(self, frame_paths, hash_size):
+        """Test that the matrix DCT gives the same hash as imagehash.phash."""
+        for path in frame_paths:
+            expected = imagehash.phash(Image.open(path), hash_size=hash_size)
+            assert compute_phash(path, hash_size=hash_size) == expected
+
+    def test_missing_file_raises(self, temp_dir):
+        """Test that a missing image raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            compute_phash(temp_dir / "missing.png")
+
+
+class TestHammingCutoff:
+    """Test cases for hamming_cutoff()."""
+
+    def test_default_threshold_maps_to_six_bits(self):
+        """Test that 0.90 similarity allows 6 differing bits of 64."""
+        assert hamming_cutoff(0.90) == 6
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.5, 0.75, 0.8, 0.9, 0.95, 1.0])
+    def test_matches_calculate_similarity(self, threshold):
+        """Test that the cutoff agrees with calculate_similarity() at every distance."""
+        cutoff = hamming_cutoff(threshold)
+
+        for distance in range(65):
+            similarity = 1.0 - (distance / 64)
+            assert (distance <= cutoff) == (similarity >= threshold)
+
+
+class TestHammingDistances:
+    """Test cases for hamming_distances()."""
+
+    def test_pairwise_distance_vectorized(self):
+        """Test that vectorized distances equal the scalar XOR/popcount path."""
+        rnd = random.Random(42)
+        hashes = [rnd.getrandbits(64) for _ in range(200)]
+        array = np.array(hashes, dtype=np.uint64)
+
+        for value in hashes[:20] + [0, (1 << 64) - 1]:
+            expected = [(value ^ h).bit_count() for h in hashes]
+            assert hamming_distances(array, value).tolist() == expected
+
+    def test_empty_array(self):
+        """Test that an empty array yields no distances."""
+        assert hamming_distances(np.empty(0, dtype=np.uint64), 123).size == 0
+
+
+class TestDeduplicateFrames:
+    """Test cases for deduplicate_frames()."""
+
+    def test_empty_input(self):
+        """Test that no frames gives no output."""
+        assert deduplicate_frames([]) == ([], [])
+
+    @pytest.mark.parametrize("threshold", [0.7, 0.8, 0.9, 0.95])
+    def test_matches_pairwise_similarity(self, frame_paths, threshold):
+        """Test that results match a direct calculate_similarity() scan."""
+        hashes = {path: compute_phash(path) for path in frame_paths}
+        expected_kept = []
+        for path in frame_paths:
+            if not any(
+                calculate_similarity(hashes[path], hashes[kept]) >= threshold
+                for kept in expected_kept
+            ):
+                expected_kept.append(path)
+
+        kept, removed = deduplicate_frames(frame_paths, threshold=threshold)
+
+        assert kept == expected_kept
+        assert len(kept) + len(removed) == len(frame_paths)
+
+    def test_lower_threshold_removes_more(self, frame_paths):
+        """Test that a looser threshold never keeps more frames."""
+        strict, _ = deduplicate_frames(frame_paths, threshold=0.95)
+        loose, _ = deduplicate_frames(frame_paths, threshold=0.70)
+
+        assert len(loose) <= len(strict)
+
+    def test_hash_to_int_round_trip(self, frame_paths):
+        """Test that packed hashes keep the same Hamming distance."""
+        h1, h2 = compute_phash(frame_paths[0]), compute_phash(frame_paths[1])
+
+        assert (hash_to_int(h1) ^ hash_to_int(h2)).bit_count() == h1 - h2
+
+
+class TestHammingBKTree:
+    """Test cases for HammingBKTree."""
+
+    def test_find_matches_linear_scan(self):
+        """Test that tree lookups agree with a brute-force earliest-match scan."""
+        rnd = random.Random(7)
+        hashes = [rnd.getrandbits(64) for _ in range(300)]
+        # Add near-duplicates so some queries hit
+        hashes += [h ^ (1 << rnd.randrange(64)) for h in hashes[:50]]
+
+        tree = HammingBKTree()
+        for index, value in enumerate(hashes):
+            tree.add(value, index)
+
+        for query in hashes[250:] + [rnd.getrandbits(64) for _ in range(20)]:
+            for cutoff in (0, 3, 6, 20):
+                expected = next(
+                    (i for i, h in enumerate(hashes) if (query ^ h).bit_count() <= cutoff),
+                    None
+                )
+                assert tree.find(query, cutoff) == expected
+
+        assert len(tree) == len(hashes)
+
+    def test_empty_tree(self):
+        """Test that an empty tree finds nothing."""
+        assert HammingBKTree().find(0, 64) is None
+
+    def test_deduplicate_uses_tree_above_min_size(self, temp_dir, monkeypatch):
+        """Test that switching to the BK-tree does not change dedup results."""
+        import video_tools_mcp.utils.image_utils as image_utils
+
+        rng = np.random.default_rng(3)
+        paths = []
+        for i in range(12):
+            path = temp_dir / f"tree_{i:03d}.png"
+            Image.fromarray(rng.integers(0, 255, (32, 32, 3)).astype(np.uint8)).save(path)
+            paths.append(path)
+        paths += paths[:4]
+
+        expected = deduplicate_frames(paths, threshold=0.9)
+        monkeypatch.setattr(image_utils, "BKTREE_MIN_SIZE", 2)
+
+        assert deduplicate_frames(paths, threshold=0.9) == expected
@@ -10,13 +10,69 @@ Tests cover:
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 
 from video_tools_mcp.models.model_manager import ModelManager
 from video_tools_mcp.models.parakeet import ParakeetModel
 from video_tools_mcp.models.pyannote import PyannoteModel
 from video_tools_mcp.models.qwen_vl import QwenVLModel
 
+# Keys the stub results must contain
+_PARAKEET_KEYS = frozenset({"text", "segments", "language", "duration"})
+_TRANSCRIPT_SEGMENT_KEYS = frozenset({"start", "end", "text"})
+_PYANNOTE_KEYS = frozenset({"segments", "speakers", "num_speakers"})
+_SPEAKER_SEGMENT_KEYS = frozenset({"start", "end", "speaker"})
+_QWEN_FRAME_KEYS = frozenset({"analysis", "confidence", "tokens_used"})
+_QWEN_CAPABILITY_KEYS = frozenset({"max_image_size", "supported_formats", "context_window", "features"})
+
+# Message of the failure injected by the ensure_loaded error test
+_LOAD_ERROR_MESSAGE = "Load failed"
+
+
+@pytest.fixture(scope="module")
+def parakeet():
+    """The ParakeetModel singleton."""
+    return ParakeetModel()
+
+
+@pytest.fixture(scope="module")
+def pyannote():
+    """The PyannoteModel singleton."""
+    return PyannoteModel()
+
+
+@pytest.fixture(scope="module")
+def qwen_vl():
+    """The QwenVLModel singleton."""
+    return QwenVLModel()
+
+
+@pytest.fixture
+def fresh_pyannote_singleton(monkeypatch):
+    """
+    Let the next PyannoteModel() build a new instance.
+
+    Gives PyannoteModel its own empty instance registry for the test, so the
+    shared registry (and the module's pyannote singleton) is untouched.
+    """
+    monkeypatch.setattr(PyannoteModel, "_instances", {})
+
+
+@pytest.fixture(autouse=True)
+def _reset_models(parakeet, pyannote, qwen_vl):
+    """Start each test with unloaded models; restore model IDs a test changed."""
+    models = (parakeet, pyannote, qwen_vl)
+    model_ids = [model.model_id for model in models]
+
+    for model in models:
+        model.is_loaded = False
+        model.load_error = None
+
+    yield
+
+    for model, model_id in zip(models, model_ids):
+        model.model_id = model_id
+
 
 class TestModelManagerSingleton:
     """Test cases for ModelManager singleton pattern."""
@@ -60,138 +116,125 @@ class TestModelManagerSingleton:
 class TestModelManagerLifecycle:
     """Test cases for ModelManager lifecycle methods."""
 
-    def test_model_manager_initial_state(self):
+    def test_model_manager_initial_state(self, parakeet):
         """Test that new model starts in unloaded state."""
-        model = ParakeetModel()
-
-        # Reset state for test (since singleton persists)
-        model.is_loaded = False
-        model.load_error = None
-
-        assert model.is_loaded is False
-        assert model.load_error is None
+        assert parakeet.is_loaded is False
+        assert parakeet.load_error is None
 
-    def test_ensure_loaded_calls_load_when_not_loaded(self):
+    def test_ensure_loaded_calls_load_when_not_loaded(self, parakeet, monkeypatch):
         """Test that ensure_loaded() loads unloaded model."""
-        model = ParakeetModel()
-        model.is_loaded = False
+        calls = []
+        monkeypatch.setattr(parakeet, 'load', lambda: calls.append(1))
 
-        # Mock the load method
-        with patch.object(model, 'load') as mock_load:
-            model.ensure_loaded()
+        parakeet.ensure_loaded()
 
-            mock_load.assert_called_once()
+        assert len(calls) == 1
 
-    def test_ensure_loaded_skips_load_when_already_loaded(self):
+    def test_ensure_loaded_skips_load_when_already_loaded(self, parakeet, monkeypatch):
         """Test that ensure_loaded() skips loading for already loaded model."""
-        model = ParakeetModel()
-        model.is_loaded = True
+        parakeet.is_loaded = True
+        calls = []
+        monkeypatch.setattr(parakeet, 'load', lambda: calls.append(1))
 
-        # Mock the load method
-        with patch.object(model, 'load') as mock_load:
-            model.ensure_loaded()
+        parakeet.ensure_loaded()
 
-            mock_load.assert_not_called()
+        assert calls == []
 
-    def test_ensure_loaded_handles_load_error(self):
+    def test_ensure_loaded_handles_load_error(self, parakeet, monkeypatch):
         """Test that ensure_loaded() properly handles load errors."""
-        model = ParakeetModel()
-        model.is_loaded = False
+        def failing_load():
+            raise RuntimeError(_LOAD_ERROR_MESSAGE)
+
+        monkeypatch.setattr(parakeet, 'load', failing_load)
 
-        # Mock load to raise exception
-        with patch.object(model, 'load', side_effect=RuntimeError("Load failed")):
-            with pytest.raises(RuntimeError):
-                model.ensure_loaded()
+        with pytest.raises(RuntimeError):
+            parakeet.ensure_loaded()
 
-            # Error message should be recorded
-            assert model.load_error is not None
-            assert "Load failed" in model.load_error
-            assert model.is_loaded is False
+        # Error message should be recorded
+        assert parakeet.load_error is not None
+        assert _LOAD_ERROR_MESSAGE in parakeet.load_error
+        assert parakeet.is_loaded is False
 
-    def test_status_returns_correct_state(self):
+    def test_status_returns_correct_state(self, parakeet):
         """Test that status() returns current model state."""
-        model = ParakeetModel()
-        model.is_loaded = False
-        model.load_error = None
-        model.model_id = "test-model"
+        parakeet.model_id = "test-model"
 
-        status = model.status()
+        status = parakeet.status()
 
         assert status["model_id"] == "test-model"
         assert status["is_loaded"] is False
         assert status["load_error"] is None
 
-    def test_status_includes_error_when_present(self):
+    def test_status_includes_error_when_present(self, parakeet):
         """Test that status() includes error message when set."""
-        model = ParakeetModel()
-        model.load_error = "Test error message"
+        parakeet.load_error = "Test error message"
 
-        status = model.status()
+        status = parakeet.status()
 
         assert status["load_error"] == "Test error message"
 
 
-class TestParakeetModel:
-    """Test cases for ParakeetModel stub implementation."""
+_MODEL_DEFAULT_IDS = [
+    pytest.param(ParakeetModel, "mlx-community/parakeet-tdt-0.6b-v3", id="parakeet"),
+    pytest.param(PyannoteModel, "pyannote/speaker-diarization-3.1", id="pyannote"),
+    pytest.param(QwenVLModel, "mlx-community/Qwen2-VL-8B-Instruct-8bit", id="qwen_vl"),
+]
+
 
-    def test_parakeet_model_initialization(self):
-        """Test that ParakeetModel initializes with correct defaults."""
-        model = ParakeetModel()
+class TestModelStubs:
+    """Test cases shared by the Parakeet, Pyannote and Qwen VL stub models."""
 
-        assert model.model_id == "mlx-community/parakeet-tdt-0.6b-v3"
+    @pytest.mark.parametrize("model_cls,expected_id", _MODEL_DEFAULT_IDS)
+    def test_model_initialization(self, model_cls, expected_id):
+        """Test that each model initializes with its default model ID."""
+        assert model_cls().model_id == expected_id
 
-    def test_parakeet_load_sets_loaded_flag(self):
+    @pytest.mark.parametrize("model_cls,expected_id", _MODEL_DEFAULT_IDS)
+    def test_load_sets_loaded_flag(self, model_cls, expected_id):
         """Test that load() sets is_loaded to True."""
-        model = ParakeetModel()
-        model.is_loaded = False
+        model = model_cls()
 
         model.load()
 
         assert model.is_loaded is True
 
-    def test_parakeet_unload_clears_loaded_flag(self):
+    @pytest.mark.parametrize("model_cls,expected_id", _MODEL_DEFAULT_IDS)
+    def test_unload_clears_loaded_flag(self, model_cls, expected_id):
         """Test that unload() sets is_loaded to False."""
-        model = ParakeetModel()
+        model = model_cls()
         model.is_loaded = True
 
         model.unload()
 
         assert model.is_loaded is False
 
-    def test_parakeet_transcribe_returns_stub_data(self):
-        """Test that transcribe() returns placeholder data in Phase 1."""
-        model = ParakeetModel()
 
-        result = model.transcribe("/path/to/audio.wav", language="en")
+class TestParakeetModel:
+    """Test cases for ParakeetModel stub implementation."""
+
+    def test_parakeet_transcribe_returns_stub_data(self, parakeet):
+        """Test that transcribe() returns placeholder data in Phase 1."""
+        result = parakeet.transcribe("/path/to/audio.wav", language="en")
 
         # Verify stub response structure
-        assert "text" in result
-        assert "segments" in result
-        assert "language" in result
-        assert "duration" in result
+        assert _PARAKEET_KEYS <= result.keys()
 
         # Verify language is passed through
         assert result["language"] == "en"
 
         # Verify segments structure
         assert len(result["segments"]) > 0
-        assert "start" in result["segments"][0]
-        assert "end" in result["segments"][0]
-        assert "text" in result["segments"][0]
+        assert _TRANSCRIPT_SEGMENT_KEYS <= result["segments"][0].keys()
 
-    def test_parakeet_transcribe_custom_language(self):
+    def test_parakeet_transcribe_custom_language(self, parakeet):
         """Test that transcribe() accepts custom language parameter."""
-        model = ParakeetModel()
-
-        result = model.transcribe("/path/to/audio.wav", language="es")
+        result = parakeet.transcribe("/path/to/audio.wav", language="es")
 
         assert result["language"] == "es"
 
-    def test_parakeet_get_supported_languages_returns_list(self):
+    def test_parakeet_get_supported_languages_returns_list(self, parakeet):
         """Test that get_supported_languages() returns list of languages."""
-        model = ParakeetModel()
-
-        languages = model.get_supported_languages()
+        languages = parakeet.get_supported_languages()
 
         # Should return list of language codes
         assert isinstance(languages, list)
@@ -203,65 +246,31 @@ class TestParakeetModel:
 class TestPyannoteModel:
     """Test cases for PyannoteModel stub implementation."""
 
-    def test_pyannote_model_initialization(self):
-        """Test that PyannoteModel initializes with correct defaults."""
-        model = PyannoteModel()
-
-        assert model.model_id == "pyannote/speaker-diarization-3.1"
-
-    def test_pyannote_load_sets_loaded_flag(self):
-        """Test that load() sets is_loaded to True."""
-        model = PyannoteModel()
-        model.is_loaded = False
-
-        model.load()
-
-        assert model.is_loaded is True
-
-    def test_pyannote_unload_clears_loaded_flag(self):
-        """Test that unload() sets is_loaded to False."""
-        model = PyannoteModel()
-        model.is_loaded = True
-
-        model.unload()
-
-        assert model.is_loaded is False
-
-    def test_pyannote_diarize_returns_stub_data(self):
+    def test_pyannote_diarize_returns_stub_data(self, pyannote):
         """Test that diarize() returns placeholder data in Phase 1."""
-        model = PyannoteModel()
-
-        result = model.diarize("/path/to/audio.wav")
+        result = pyannote.diarize("/path/to/audio.wav")
 
         # Verify stub response structure
-        assert "segments" in result
-        assert "speakers" in result
-        assert "num_speakers" in result
+        assert _PYANNOTE_KEYS <= result.keys()
 
         # Verify default 2 speakers
         assert result["num_speakers"] == 2
 
         # Verify segments structure
         assert len(result["segments"]) > 0
-        assert "start" in result["segments"][0]
-        assert "end" in result["segments"][0]
-        assert "speaker" in result["segments"][0]
+        assert _SPEAKER_SEGMENT_KEYS <= result["segments"][0].keys()
 
-    def test_pyannote_diarize_respects_num_speakers(self):
+    def test_pyannote_diarize_respects_num_speakers(self, pyannote):
         """Test that diarize() uses num_speakers parameter."""
-        model = PyannoteModel()
-
-        result = model.diarize("/path/to/audio.wav", num_speakers=3)
+        result = pyannote.diarize("/path/to/audio.wav", num_speakers=3)
 
         assert result["num_speakers"] == 3
         assert len(result["speakers"]) == 3
 
-    def test_pyannote_diarize_with_speaker_range(self):
+    def test_pyannote_diarize_with_speaker_range(self, pyannote):
         """Test that diarize() accepts min/max speaker parameters."""
-        model = PyannoteModel()
-
         # Should not raise error
-        result = model.diarize(
+        result = pyannote.diarize(
             "/path/to/audio.wav",
             min_speakers=1,
             max_speakers=5
@@ -270,32 +279,28 @@ class TestPyannoteModel:
         # Stub should still return data
         assert "num_speakers" in result
 
-    def test_pyannote_verify_token_with_token(self):
+    def test_pyannote_verify_token_with_token(self, baseline_config, fresh_pyannote_singleton):
         """Test that verify_token() returns True when token exists."""
-        # Mock config to have a token
-        with patch('video_tools_mcp.models.pyannote.load_config') as mock_config:
-            mock_cfg = MagicMock()
-            mock_cfg.pyannote.hf_token = "test_token_123"
-            mock_config.return_value = mock_cfg
+        # Config with a token, derived without re-validating
+        config = baseline_config.model_copy(update={
+            "pyannote": baseline_config.pyannote.model_copy(update={"hf_token": "test_token_123"})
+        })
 
+        with patch('video_tools_mcp.models.pyannote.load_config', return_value=config):
             # Create new instance with mocked config
-            PyannoteModel._instances = {}  # Clear singleton
             model = PyannoteModel()
 
             result = model.verify_token()
 
             assert result is True
 
-    def test_pyannote_verify_token_without_token(self):
+    def test_pyannote_verify_token_without_token(self, baseline_config, fresh_pyannote_singleton):
         """Test that verify_token() returns False when token is None."""
-        # Mock config to have no token
-        with patch('video_tools_mcp.models.pyannote.load_config') as mock_config:
-            mock_cfg = MagicMock()
-            mock_cfg.pyannote.hf_token = None
-            mock_config.return_value = mock_cfg
-
-            # Clear singleton and create new instance
-            PyannoteModel._instances = {}
+        # The baseline config is built from a clean environment, so it has no token
+        assert baseline_config.pyannote.hf_token is None
+
+        with patch('video_tools_mcp.models.pyannote.load_config', return_value=baseline_config):
+            # Create new instance with mocked config
             model = PyannoteModel()
 
             result = model.verify_token()
@@ -306,53 +311,23 @@ class TestPyannoteModel:
 class TestQwenVLModel:
     """Test cases for QwenVLModel stub implementation."""
 
-    def test_qwen_vl_model_initialization(self):
-        """Test that QwenVLModel initializes with correct defaults."""
-        model = QwenVLModel()
-
-        assert model.model_id == "mlx-community/Qwen2-VL-8B-Instruct-8bit"
-
-    def test_qwen_vl_load_sets_loaded_flag(self):
-        """Test that load() sets is_loaded to True."""
-        model = QwenVLModel()
-        model.is_loaded = False
-
-        model.load()
-
-        assert model.is_loaded is True
-
-    def test_qwen_vl_unload_clears_loaded_flag(self):
-        """Test that unload() sets is_loaded to False."""
-        model = QwenVLModel()
-        model.is_loaded = True
-
-        model.unload()
-
-        assert model.is_loaded is False
-
-    def test_qwen_vl_analyze_frame_returns_stub_data(self):
+    def test_qwen_vl_analyze_frame_returns_stub_data(self, qwen_vl):
         """Test that analyze_frame() returns placeholder data in Phase 1."""
-        model = QwenVLModel()
-
-        result = model.analyze_frame(
+        result = qwen_vl.analyze_frame(
             "/path/to/frame.jpg",
             prompt="Describe this image"
         )
 
         # Verify stub response structure
-        assert "analysis" in result
-        assert "confidence" in result
-        assert "tokens_used" in result
+        assert _QWEN_FRAME_KEYS <= result.keys()
 
         # Stub should include prompt in response
         assert "Describe this image" in result["analysis"]
 
-    def test_qwen_vl_analyze_frame_custom_parameters(self):
+    def test_qwen_vl_analyze_frame_custom_parameters(self, qwen_vl):
         """Test that analyze_frame() accepts custom max_tokens and temperature."""
-        model = QwenVLModel()
-
         # Should not raise error
-        result = model.analyze_frame(
+        result = qwen_vl.analyze_frame(
             "/path/to/frame.jpg",
             prompt="Test prompt",
             max_tokens=1024,
@@ -362,12 +337,10 @@ class TestQwenVLModel:
         # Stub should still return data
         assert "analysis" in result
 
-    def test_qwen_vl_analyze_frames_batch_returns_list(self):
+    def test_qwen_vl_analyze_frames_batch_returns_list(self, qwen_vl):
         """Test that analyze_frames_batch() returns list of results."""
-        model = QwenVLModel()
-
         image_paths = ["/frame1.jpg", "/frame2.jpg", "/frame3.jpg"]
-        results = model.analyze_frames_batch(
+        results = qwen_vl.analyze_frames_batch(
             image_paths,
             prompt="Describe the scene"
         )
@@ -378,21 +351,14 @@ class TestQwenVLModel:
 
         # Each result should have expected structure
         for result in results:
-            assert "analysis" in result
-            assert "confidence" in result
-            assert "tokens_used" in result
+            assert _QWEN_FRAME_KEYS <= result.keys()
 
-    def test_qwen_vl_get_model_capabilities_returns_dict(self):
+    def test_qwen_vl_get_model_capabilities_returns_dict(self, qwen_vl):
         """Test that get_model_capabilities() returns capability info."""
-        model = QwenVLModel()
-
-        capabilities = model.get_model_capabilities()
+        capabilities = qwen_vl.get_model_capabilities()
 
         # Verify expected fields
-        assert "max_image_size" in capabilities
-        assert "supported_formats" in capabilities
-        assert "context_window" in capabilities
-        assert "features" in capabilities
+        assert _QWEN_CAPABILITY_KEYS <= capabilities.keys()
 
         # Verify types
         assert isinstance(capabilities["supported_formats"], list)
@@ -403,47 +369,15 @@ class TestQwenVLModel:
 class TestModelManagerProperties:
     """Test cases for ModelManager property accessors."""
 
-    def test_model_id_getter(self):
-        """Test that model_id property can be retrieved."""
-        model = ParakeetModel()
-        model._model_id = "test-model-id"
-
-        assert model.model_id == "test-model-id"
-
-    def test_model_id_setter(self):
-        """Test that model_id property can be set."""
-        model = ParakeetModel()
-
-        model.model_id = "new-model-id"
-
-        assert model._model_id == "new-model-id"
-
-    def test_is_loaded_getter(self):
-        """Test that is_loaded property can be retrieved."""
-        model = ParakeetModel()
-        model._is_loaded = True
-
-        assert model.is_loaded is True
-
-    def test_is_loaded_setter(self):
-        """Test that is_loaded property can be set."""
-        model = ParakeetModel()
-
-        model.is_loaded = False
-
-        assert model._is_loaded is False
-
-    def test_load_error_getter(self):
-        """Test that load_error property can be retrieved."""
-        model = ParakeetModel()
-        model._load_error = "Test error"
-
-        assert model.load_error == "Test error"
-
-    def test_load_error_setter(self):
-        """Test that load_error property can be set."""
-        model = ParakeetModel()
-
-        model.load_error = "New error"
-
-        assert model._load_error == "New error"
+    @pytest.mark.parametrize("attr,private,first,second", [
+        ("model_id", "_model_id", "test-model-id", "new-model-id"),
+        ("is_loaded", "_is_loaded", True, False),
+        ("load_error", "_load_error", "Test error", "New error"),
+    ], ids=["model_id", "is_loaded", "load_error"])
+    def test_property_roundtrip(self, parakeet, attr, private, first, second):
+        """Test that each property reads and writes its private attribute."""
+        setattr(parakeet, private, first)
+        assert getattr(parakeet, attr) == first
+
+        setattr(parakeet, attr, second)
+        assert getattr(parakeet, private) == second
@@ -0,0 +1,176 @@
+"""
+Unit tests for the screenshot extraction cache (utils/screenshot_cache.py).
+
+Tests cover:
+- Cache key stability and sensitivity
+- Store / restore round trip
+- Hard-linking restored files, with a copy fallback
+- Eviction beyond MAX_CACHE_ENTRIES
+- VIDEO_TOOLS_SCREENSHOT_CACHE / VIDEO_TOOLS_NO_CACHE toggles
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from video_tools_mcp.utils import screenshot_cache
+from video_tools_mcp.utils.screenshot_cache import (
+    cache_enabled,
+    get_screenshot_cache_dir,
+    load_cached_screenshots,
+    screenshot_cache_key,
+    store_screenshots
+)
+
+
+@pytest.fixture
+def cache_dir(temp_dir, monkeypatch):
+    """Point the screenshot cache at a per-test directory."""
+    monkeypatch.setenv("VIDEO_TOOLS_CACHE_DIR", str(temp_dir / "cache"))
+    return temp_dir / "cache" / "screenshots"
+
+
+@pytest.fixture
+def video_file(temp_dir):
+    """Small file standing in for a video."""
+    path = temp_dir / "video.mp4"
+    path.write_bytes(b"\x00" * 4096)
+    return path
+
+
+def _store_single(key, source_dir):
+    """Cache a one-screenshot set taken from source_dir."""
+    source_dir.mkdir()
+    (source_dir / "screenshot_00001.jpg").write_bytes(b"jpeg")
+    store_screenshots(key, {
+        "output_dir": str(source_dir),
+        "screenshots": [{
+            "filename": "screenshot_00001.jpg",
+            "path": str(source_dir / "screenshot_00001.jpg"),
+            "timestamp": 0.0,
+            "caption": "A frame"
+        }]
+    })
+
+
+class TestScreenshotCacheKey:
+    """Test cases for screenshot_cache_key()."""
+
+    def test_same_inputs_give_same_key(self, video_file):
+        """Test that the key is deterministic."""
+        key1 = screenshot_cache_key(video_file, sample_interval=5, similarity_threshold=0.9)
+        key2 = screenshot_cache_key(video_file, similarity_threshold=0.9, sample_interval=5)
+
+        assert key1 == key2
+
+    def test_different_params_give_different_key(self, video_file):
+        """Test that extraction parameters are part of the key."""
+        key1 = screenshot_cache_key(video_file, sample_interval=5)
+        key2 = screenshot_cache_key(video_file, sample_interval=3)
+
+        assert key1 != key2
+
+    def test_modified_video_gives_different_key(self, video_file):
+        """Test that rewriting the video invalidates the key."""
+        key1 = screenshot_cache_key(video_file, sample_interval=5)
+        video_file.write_bytes(b"\x01" * 8192)
+        key2 = screenshot_cache_key(video_file, sample_interval=5)
+
+        assert key1 != key2
+
+
+class TestScreenshotCacheRoundTrip:
+    """Test cases for store_screenshots() / load_cached_screenshots()."""
+
+    def test_cache_dir_uses_video_tools_cache_dir(self, cache_dir):
+        """Test that VIDEO_TOOLS_CACHE_DIR controls the cache location."""
+        assert get_screenshot_cache_dir() == cache_dir
+
+    def test_miss_returns_none(self, cache_dir, temp_dir):
+        """Test that an unknown key is a cache miss."""
+        assert load_cached_screenshots("missing", temp_dir) is None
+
+    def test_restore_copies_files_and_rewrites_paths(self, cache_dir, temp_dir):
+        """Test that a stored set is restored into a new output directory."""
+        source_dir = temp_dir / "first"
+        source_dir.mkdir()
+        (source_dir / "screenshot_00001.jpg").write_bytes(b"jpeg")
+        metadata = {
+            "output_dir": str(source_dir),
+            "screenshots": [{
+                "filename": "screenshot_00001.jpg",
+                "path": str(source_dir / "screenshot_00001.jpg"),
+                "timestamp": 0.0,
+                "caption": "A frame"
+            }]
+        }
+
+        store_screenshots("abc", metadata)
+
+        output_dir = temp_dir / "second"
+        output_dir.mkdir()
+        restored = load_cached_screenshots("abc", output_dir)
+
+        assert restored is not None
+        assert restored["output_dir"] == str(output_dir)
+        restored_path = Path(restored["screenshots"][0]["path"])
+        assert restored_path.parent == output_dir
+        assert restored_path.read_bytes() == b"jpeg"
+
+    def test_restore_hard_links_files(self, cache_dir, temp_dir):
+        """Test that restored screenshots share the cached file's inode."""
+        _store_single("abc", temp_dir / "first")
+        output_dir = temp_dir / "second"
+        output_dir.mkdir()
+
+        restored = load_cached_screenshots("abc", output_dir)
+
+        restored_path = Path(restored["screenshots"][0]["path"])
+        cached_path = cache_dir / "abc" / "screenshot_00001.jpg"
+        assert os.path.samefile(restored_path, cached_path)
+
+    def test_restore_falls_back_to_copy(self, cache_dir, temp_dir, monkeypatch):
+        """Test that screenshots are copied when hard links are unsupported."""
+        _store_single("abc", temp_dir / "first")
+        output_dir = temp_dir / "second"
+        output_dir.mkdir()
+
+        def no_link(src, dst):
+            raise OSError("Invalid cross-device link")
+
+        monkeypatch.setattr(os, "link", no_link)
+        restored = load_cached_screenshots("abc", output_dir)
+
+        restored_path = Path(restored["screenshots"][0]["path"])
+        assert restored_path.read_bytes() == b"jpeg"
+        assert not os.path.samefile(restored_path, cache_dir / "abc" / "screenshot_00001.jpg")
+
+    def test_store_evicts_oldest_entries(self, cache_dir, temp_dir, monkeypatch):
+        """Test that only the newest MAX_CACHE_ENTRIES sets are kept."""
+        monkeypatch.setattr(screenshot_cache, "MAX_CACHE_ENTRIES", 2)
+        for age, key in enumerate(["old", "mid"]):
+            _store_single(key, temp_dir / key)
+            os.utime(cache_dir / key, (1000 + age, 1000 + age))
+
+        _store_single("new", temp_dir / "new")
+
+        assert sorted(p.name for p in cache_dir.iterdir()) == ["mid", "new"]
+
+    def test_cache_is_opt_in(self, monkeypatch):
+        """Test that the cache stays off unless VIDEO_TOOLS_SCREENSHOT_CACHE=1."""
+        monkeypatch.delenv("VIDEO_TOOLS_SCREENSHOT_CACHE", raising=False)
+        monkeypatch.delenv("VIDEO_TOOLS_NO_CACHE", raising=False)
+        assert cache_enabled() is False
+
+        monkeypatch.setenv("VIDEO_TOOLS_SCREENSHOT_CACHE", "1")
+        assert cache_enabled() is True
+
+    def test_no_cache_env_disables_cache(self, monkeypatch):
+        """Test that VIDEO_TOOLS_NO_CACHE=1 turns caching off."""
+        monkeypatch.setenv("VIDEO_TOOLS_SCREENSHOT_CACHE", "1")
+        monkeypatch.delenv("VIDEO_TOOLS_NO_CACHE", raising=False)
+        assert cache_enabled() is True
+
+        monkeypatch.setenv("VIDEO_TOOLS_NO_CACHE", "1")
+        assert cache_enabled() is False
@@ -0,0 +1,79 @@
+"""
+Unit tests for speaker clustering (processing/speaker_clustering.py).
+
+Tests cover:
+- Eigengap speaker-count selection
+- Fixed cluster counts
+- Bounds on the selected count
+- Degenerate inputs
+- GMM-BIC speaker count estimation
+"""
+
+import numpy as np
+import pytest
+
+from video_tools_mcp.processing.speaker_clustering import (
+    estimate_num_speakers_bic,
+    spectral_cluster_embeddings
+)
+
+
+def make_speakers(num_speakers, per_speaker=30, dim=64, noise=0.2, seed=0):
+    """Embeddings drawn around num_speakers random centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(num_speakers, dim))
+    return np.concatenate([
+        centre + noise * rng.normal(size=(per_speaker, dim)) for centre in centres
+    ])
+
+
+class TestSpectralClusterEmbeddings:
+    """Test spectral clustering of speaker embeddings."""
+
+    @pytest.mark.parametrize("num_speakers", [2, 3, 4])
+    def test_eigengap_finds_speaker_count(self, num_speakers):
+        """Well-separated speakers are counted and grouped correctly."""
+        labels = spectral_cluster_embeddings(make_speakers(num_speakers), max_clusters=8)
+
+        assert labels.max() + 1 == num_speakers
+        for i in range(num_speakers):
+            assert len(set(labels[i * 30:(i + 1) * 30])) == 1
+
+    def test_fixed_num_clusters(self):
+        """num_clusters overrides the eigengap estimate."""
+        labels = spectral_cluster_embeddings(make_speakers(3), num_clusters=2)
+        assert labels.max() + 1 == 2
+
+    def test_min_clusters_bound(self):
+        """The selected count never drops below min_clusters."""
+        labels = spectral_cluster_embeddings(make_speakers(2), min_clusters=3, max_clusters=8)
+        assert labels.max() + 1 >= 3
+
+    def test_single_embedding(self):
+        """A single embedding forms a single cluster."""
+        labels = spectral_cluster_embeddings(np.ones((1, 16)))
+        assert labels.tolist() == [0]
+
+
+class TestEstimateNumSpeakersBic:
+    """Test GMM-BIC speaker count estimation."""
+
+    @pytest.mark.parametrize("num_speakers", [2, 3, 4])
+    def test_picks_true_count_in_range(self, num_speakers):
+        """The lowest-BIC count matches the number of generating speakers."""
+        embeddings = make_speakers(num_speakers, per_speaker=40, dim=192, noise=0.3)
+        assert estimate_num_speakers_bic(embeddings, 2, 5) == num_speakers
+
+    @pytest.mark.parametrize("num_speakers", [3, 4, 5])
+    def test_recovers_count_from_few_noisy_segments(self, num_speakers):
+        """High-dimensional, noisy embeddings with few segments don't collapse to the minimum."""
+        embeddings = make_speakers(num_speakers, per_speaker=12, dim=256, noise=1.5)
+        assert estimate_num_speakers_bic(embeddings, 2, 6) == num_speakers
+
+    def test_equal_bounds_skip_fitting(self):
+        """A range of one count returns it directly."""
+        assert estimate_num_speakers_bic(make_speakers(3), 2, 2) == 2
+
+    def test_clamped_to_embedding_count(self):
+        """Never returns more speakers than embeddings."""
+        assert estimate_num_speakers_bic(np.eye(3), 4, 6) == 3
@@ -1,33 +1,547 @@
+import atexit
+import functools
 import os
 import subprocess
+import threading
 import logging
 import json
+import math
+import multiprocessing
+import queue
 import re
+import shutil
+import struct
+import sys
+import tempfile
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 import time
 import humanize
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib parser
+    orjson = None
+
+try:
+    import av
+except ImportError:  # optional: prep falls back to the ffmpeg CLI
+    av = None
+
+# Threads per prep encode; several narrower software encodes running side by
+# side keep more cores busy than one wide encode
+FFMPEG_THREADS = 4
+
+# Hardware H.264 encoders in order of preference, with their quality flags.
+# libx264 is the software fallback when none of them work on this machine.
+H264_ENCODER_ARGS = {
+    'h264_nvenc': ['-preset', 'p5', '-rc', 'vbr', '-cq', '19', '-b:v', '0'],
+    'h264_videotoolbox': ['-q:v', '55'],
+    'libx264': ['-preset', 'medium', '-crf', '17', '-profile:v', 'high444'],
+}
+
+# Concurrent NVENC sessions allowed by default; consumer GPUs refuse more
+# than a handful and fail with OpenEncodeSessionEx errors
+NVENC_MAX_SESSIONS = 3
+
+# Minimum seconds between progress line redraws
+PROGRESS_INTERVAL = 0.1
+
+# macOS fcntl command for read-ahead advice; not exported by the fcntl module
+F_RDADVISE = 44
+
+# Splits a filename into digit and non-digit runs for natural sorting
+_DIGITS = re.compile(r'(\d+)')
+
+# Concurrent ffprobe processes; probing is spawn-latency bound, not CPU bound
+PROBE_WORKERS = 8
+
+# Source video bitrate at or above which libx264 keeps CRF 17; each halving
+# below it raises the CRF by one, up to 23, since low-bitrate sources hold
+# little detail worth preserving
+CRF_REFERENCE_BITRATE = 8_000_000
+
+# Clips longer than this many seconds use a faster libx264 preset
+LONG_CLIP_SECONDS = 600
+
+# H264_ENCODER_ARGS as PyAV codec options, for encoders PyAV can drive
+# in-process. VideoToolbox's -q:v has no plain codec option, so it always
+# goes through the ffmpeg CLI.
+PYAV_ENCODER_OPTIONS = {
+    'h264_nvenc': {'preset': 'p5', 'rc': 'vbr', 'cq': '19', 'b': '0'},
+    'libx264': {'preset': 'medium', 'crf': '17', 'profile': 'high444'},
+}
+
+logger = logging.getLogger(__name__)
+
+# Limits concurrent encodes across prep workers; set by _init_prep_worker
+_encode_slots = None
+
+
+def _detect_h264_encoder() -> str:
+    """Return the first hardware H.264 encoder that works here, else libx264.
+
+    An encoder being compiled into ffmpeg does not mean the GPU is present,
+    so each candidate is also tried on a single blank frame.
+    """
+    try:
+        listing = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                 capture_output=True, text=True).stdout
+    except OSError:
+        return 'libx264'
+
+    for encoder in H264_ENCODER_ARGS:
+        if encoder == 'libx264' or encoder not in listing:
+            continue
+        probe = subprocess.run([
+            'ffmpeg', '-hide_banner', '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256',
+            '-frames:v', '1', '-pix_fmt', 'yuv420p',
+            '-c:v', encoder, '-f', 'null', '-'
+        ], capture_output=True)
+        if probe.returncode == 0:
+            return encoder
+
+    return 'libx264'
+
+
+def _natkey(name: str) -> List:
+    """Sort key that orders video-2.mp4 before video-10.mp4."""
+    return [int(part) if part.isdigit() else part for part in _DIGITS.split(name)]
+
+
+def _get_video_metadata(video_path: Path, st: Optional[os.stat_result] = None) -> Optional[Dict]:
+    """Probe a clip, reusing the result while its size and mtime are unchanged.
+
+    Pass st when the caller already has the file's stat (e.g. from a
+    DirEntry) to skip another stat call. The returned dict is shared with
+    the cache, so callers copy it rather than modifying it.
+    """
+    try:
+        st = st or os.stat(video_path)
+    except OSError as e:
+        logger.error(f"Error getting metadata for {video_path}: {str(e)}")
+        return None
+    return _probe_video_metadata(video_path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_video_metadata(video_path: Path, mtime_ns: int, size: int) -> Optional[Dict]:
+    # mtime_ns and size only key the cache, so a rewritten file is re-probed
+    try:
+        # Get detailed metadata including bit depth
+        result = subprocess.run([
+            'ffprobe',
+            '-v', 'quiet',
+            '-print_format', 'json',
+            '-show_format',
+            '-show_streams',
+            str(video_path)
+        ], capture_output=True)
+
+        if result.returncode != 0:
+            logger.error(f"Error getting metadata for {video_path}")
+            return None
+
+        # orjson parses the raw bytes directly, skipping a decode to str
+        metadata = orjson.loads(result.stdout) if orjson is not None else json.loads(result.stdout)
+        video_stream = next((stream for stream in metadata.get('streams', [])
+                           if stream['codec_type'] == 'video'), None)
+        audio_stream = next((stream for stream in metadata.get('streams', [])
+                           if stream['codec_type'] == 'audio'), None)
+
+        if not video_stream:
+            logger.error(f"No video stream found in {video_path}")
+            return None
+
+        # Extract bit depth and color space information
+        pix_fmt = video_stream.get('pix_fmt', '')
+        bit_depth = 8  # default
+        if 'p10' in pix_fmt:
+            bit_depth = 10
+        elif 'p12' in pix_fmt:
+            bit_depth = 12
+
+        return {
+            'path': str(video_path),
+            'creation_time': metadata.get('format', {}).get('tags', {}).get('creation_time', ''),
+            'duration': float(metadata.get('format', {}).get('duration', 0)),
+            'codec_name': video_stream.get('codec_name'),
+            'frame_rate': video_stream.get('r_frame_rate'),
+            'bit_rate': int(video_stream.get('bit_rate')
+                            or metadata.get('format', {}).get('bit_rate') or 0),
+            'width': video_stream.get('width'),
+            'height': video_stream.get('height'),
+            'has_audio': audio_stream is not None,
+            'audio_codec': audio_stream.get('codec_name') if audio_stream else None,
+            'audio_sample_rate': int(audio_stream.get('sample_rate') or 0) if audio_stream else None,
+            'bit_depth': bit_depth,
+            'pix_fmt': pix_fmt,
+            'size': size
+        }
+    except Exception as e:
+        logger.error(f"Error getting metadata for {video_path}: {str(e)}")
+        return None
+
+
+def _is_concat_ready(metadata: Dict) -> bool:
+    """True when a clip is already the H.264 / yuv420p that prep produces."""
+    return metadata['codec_name'] == 'h264' and metadata['pix_fmt'] == 'yuv420p'
+
+
+def _all_concat_ready(videos: List[Optional[Dict]]) -> bool:
+    """True when every clip is concat-ready and they share one video and
+    audio format, so the concat demuxer can stream-copy the originals as
+    they are."""
+    if not all(videos) or not all(_is_concat_ready(v) for v in videos):
+        return False
+    formats = {(v['codec_name'], v['pix_fmt'], v['frame_rate'], v['width'], v['height'],
+                v['audio_codec'], v['audio_sample_rate'])
+               for v in videos}
+    return len(formats) == 1
+
+
+def _single_pass_ready(videos: List[Optional[Dict]]) -> bool:
+    """True when every clip has audio and they share one frame size, rate
+    and audio format, so the concat filter can join the video without
+    rescaling and the audio can be stream-copied."""
+    if not all(videos) or not all(v['has_audio'] for v in videos):
+        return False
+    formats = {(v['width'], v['height'], v['frame_rate'], v['audio_codec'], v['audio_sample_rate'])
+               for v in videos}
+    return len(formats) == 1
+
+
+def _write_concat_list(videos: List[Dict], file_list_path: Path) -> None:
+    """Write a concat demuxer file list for the clips, in one call as UTF-8."""
+    payload = ''.join(
+        "file '{}'\n".format(video['path'].replace("'", "'\\''"))
+        for video in videos
+    ).encode('utf-8')
+    fd = os.open(file_list_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
+
+def _prep_worker_count(num_videos: int) -> int:
+    """Number of clips to prepare at once, FFMPEG_THREADS cores per encode."""
+    return max(1, min(num_videos, (os.cpu_count() or 1) // FFMPEG_THREADS))
+
+
+def _single_pass_command(videos: List[Dict], encoder: str, output_path: Path,
+                         file_list_path: Path) -> List[str]:
+    """Build one ffmpeg command that encodes and joins every clip with the
+    concat filter, writing the final file without prepped intermediates.
+
+    Only for clips that pass _single_pass_ready. The audio is not decoded:
+    it is stream-copied through the concat demuxer reading file_list_path.
+    """
+    _write_concat_list(videos, file_list_path)
+
+    command = ['ffmpeg']
+    filters = []
+    for idx, video in enumerate(videos):
+        command += ['-hwaccel', 'auto', '-i', video['path']]
+        filters.append(f"[{idx}:v]setsar=1,format=yuv420p[v{idx}]")
+
+    concat_inputs = ''.join(f"[v{idx}]" for idx in range(len(videos)))
+    filters.append(f"{concat_inputs}concat=n={len(videos)}:v=1:a=0[v]")
+
+    command += ['-f', 'concat', '-safe', '0', '-i', str(file_list_path),
+                '-filter_complex', ';'.join(filters), '-map', '[v]',
+                '-map', f'{len(videos)}:a', '-c:a', 'copy',
+                '-c:v', encoder, *H264_ENCODER_ARGS[encoder], '-pix_fmt', 'yuv420p',
+                '-movflags', '+faststart', '-y', str(output_path)]
+    return command
+
+
+class _ProgressLine:
+    """Single-line percentage and ETA display, redrawn at most every
+    PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, label: str, duration: float):
+        self.label = label
+        self.duration = duration
+        self.start_time = time.time()
+        self.last_print = 0.0
+
+    def update(self, seconds_done: float) -> None:
+        if self.duration <= 0:
+            return
+        now = time.monotonic()
+        if now - self.last_print < PROGRESS_INTERVAL:
+            return
+        self.last_print = now
+
+        progress = min(100, seconds_done / self.duration * 100)
+
+        # Calculate ETA
+        elapsed = time.time() - self.start_time
+        if progress > 0:
+            eta = (elapsed / progress) * (100 - progress)
+            eta_str = str(timedelta(seconds=int(eta)))
+        else:
+            eta_str = "Unknown"
+
+        sys.stdout.write(f"\r{self.label}: {progress:.1f}% | ETA: {eta_str}")
+        sys.stdout.flush()
+
+
+def _drain_progress(stream, duration: float, label: str, show_progress: bool) -> None:
+    """Read ffmpeg's -progress key=value lines, printing percentage and ETA.
+
+    Lines are parsed as raw bytes; nothing is decoded. Always reads to EOF
+    so the pipe never fills, even when nothing is shown.
+    """
+    display = _ProgressLine(label, duration) if show_progress else None
+    for line in stream:
+        # out_time_us is "N/A" until the first frame is written
+        if display is None or not line.startswith(b'out_time_us='):
+            continue
+        value = line[len(b'out_time_us='):].strip()
+        if value.isdigit():
+            display.update(int(value) / 1_000_000)
+
+
+def _libx264_tuning(metadata: Dict) -> Dict[str, str]:
+    """Pick libx264 crf and preset for a clip from its bitrate and duration."""
+    src_bitrate = metadata.get('bit_rate') or CRF_REFERENCE_BITRATE
+    crf = max(17, min(23, int(17 + math.log2(max(1, CRF_REFERENCE_BITRATE / src_bitrate)))))
+    preset = 'veryfast' if metadata.get('duration', 0) > LONG_CLIP_SECONDS else 'medium'
+    return {'crf': str(crf), 'preset': preset}
+
+
+def _transcode_with_pyav(video_path: Path, output_path: Path, encoder: str,
+                         options: Dict[str, str], duration: float, show_progress: bool) -> bool:
+    """Re-encode a clip in-process with PyAV, mirroring the ffmpeg CLI prep.
+
+    Decodes the first video stream into the H.264 encoder, copies the first
+    audio stream unchanged and muxes both to MPEG-TS, without spawning
+    ffmpeg. Returns False when PyAV cannot handle the file so the caller
+    can fall back to the CLI.
+    """
+    display = _ProgressLine('Progress', duration) if show_progress else None
+    try:
+        with av.open(str(video_path)) as source, \
+                av.open(str(output_path), 'w', format='mpegts') as target:
+            in_video = source.streams.video[0]
+            in_audio = source.streams.audio[0] if source.streams.audio else None
+
+            # VFR streams and odd containers may report no average rate
+            rate = in_video.average_rate or in_video.guessed_rate
+            if not rate:
+                raise ValueError("no usable frame rate")
+
+            out_video = target.add_stream(encoder, rate=rate)
+            out_video.width = in_video.codec_context.width
+            out_video.height = in_video.codec_context.height
+            out_video.pix_fmt = 'yuv420p'
+            out_video.thread_count = FFMPEG_THREADS
+            out_video.options = options
+            out_audio = target.add_stream_from_template(in_audio) if in_audio else None
+
+            for packet in source.demux(*([in_video, in_audio] if in_audio else [in_video])):
+                if packet.stream is in_video:
+                    for frame in packet.decode():
+                        target.mux(out_video.encode(frame.reformat(format='yuv420p')))
+                        if display is not None and frame.time is not None:
+                            display.update(frame.time)
+                elif packet.dts is not None:
+                    # Demuxer flush packets have no dts and must not be muxed
+                    packet.stream = out_audio
+                    target.mux(packet)
+
+            target.mux(out_video.encode(None))
+        return True
+
+    except Exception as e:
+        # Anything PyAV can't handle is left to the ffmpeg CLI
+        logger.warning(f"PyAV could not transcode {video_path.name}, using ffmpeg: {e}")
+        output_path.unlink(missing_ok=True)
+        return False
+
+
+def _run_ffmpeg(command: List[str], duration: float, label: str,
+                show_progress: bool = True) -> Tuple[int, str]:
+    """Run an ffmpeg command with structured progress reporting.
+
+    Progress arrives on stdout via -progress and is drained on a daemon
+    thread while this thread collects stderr, which -loglevel error keeps
+    down to actual errors. Neither pipe can back up and stall ffmpeg.
+
+    Returns:
+        ffmpeg's exit code and its error output
+    """
+    process = subprocess.Popen(
+        [command[0], '-progress', 'pipe:1', '-nostats', '-loglevel', 'error', *command[1:]],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    reader = threading.Thread(target=_drain_progress,
+                              args=(process.stdout, duration, label, show_progress),
+                              daemon=True)
+    reader.start()
+    errors = process.stderr.read()
+    returncode = process.wait()
+    reader.join()
+    return returncode, errors.decode('utf-8', 'replace').strip()
+
+
+def _prefetch(video_path: Optional[Path]) -> None:
+    """Ask the kernel to start reading a clip into the page cache.
+
+    Best effort: lets a slow external drive fetch the next clip while the
+    current ones encode. Errors and unsupported platforms are ignored.
+    """
+    if video_path is None:
+        return
+    try:
+        fd = os.open(video_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        elif sys.platform == 'darwin':
+            import fcntl
+            # struct radvisory { off_t ra_offset; int ra_count; }
+            count = min(os.fstat(fd).st_size, 2**31 - 1)
+            fcntl.fcntl(fd, F_RDADVISE, struct.pack('qi4x', 0, count))
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _init_prep_worker(log_queue, encode_slots=None) -> None:
+    """Route a prep worker's log records to the parent process's handlers
+    and install the semaphore shared by all workers' encodes."""
+    global _encode_slots
+    _encode_slots = encode_slots
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+
+def _prepare_video_worker(video_path: Path, position: int, total: int, work_dir: Path,
+                          encoder: str = 'libx264', show_progress: bool = True,
+                          metadata: Optional[Dict] = None) -> Optional[Path]:
+    """Prepare video for concatenation with enhanced 10-bit support.
+
+    Module-level so it can run in a ProcessPoolExecutor worker. The
+    per-line progress display is only useful when a single encode runs
+    at a time, so parallel callers turn it off. Output is an Annex-B
+    MPEG-TS file so the prepped clips can be joined with the concat
+    protocol.
+    """
+    try:
+        # The parent has usually probed the source already
+        metadata = metadata or _get_video_metadata(video_path)
+        if not metadata:
+            return None
+
+        # Position keeps clips with the same name from different inputs apart
+        output_path = work_dir / f"prep_{position:04d}_{video_path.name}.ts"
+
+        print(f"\nProcessing video {position}/{total}: {video_path.name}")
+        print(f"Original size: {humanize.naturalsize(metadata['size'])}")
+
+        # libx264 quality and speed are tuned per clip; hardware encoders
+        # keep their fixed settings
+        tuning = _libx264_tuning(metadata) if encoder == 'libx264' else {}
+        encoder_args = (['-preset', tuning['preset'], '-crf', tuning['crf'], '-profile:v', 'high444']
+                        if tuning else H264_ENCODER_ARGS[encoder])
+
+        # Basic conversion that maintains quality while ensuring compatibility,
+        # in-process through PyAV when possible. Every clip is re-encoded,
+        # even ones already in H.264, so the joined stream has one set of
+        # encoder parameters.
+        with _encode_slots or nullcontext():
+            if (av is not None and encoder in PYAV_ENCODER_OPTIONS
+                    and _transcode_with_pyav(video_path, output_path, encoder,
+                                             {**PYAV_ENCODER_OPTIONS[encoder], **tuning},
+                                             metadata.get('duration', 0), show_progress)):
+                returncode, errors = 0, ''
+            else:
+                returncode, errors = _run_ffmpeg([
+                    'ffmpeg',
+                    '-hwaccel', 'auto',
+                    '-i', str(video_path),
+                    '-c:v', encoder,
+                    *encoder_args,
+                    '-pix_fmt', 'yuv420p',
+                    '-c:a', 'copy',
+                    '-threads', str(FFMPEG_THREADS),
+                    '-f', 'mpegts',
+                    '-y',
+                    str(output_path)
+                ], metadata.get('duration', 0), 'Progress', show_progress)
+
+        if returncode != 0:
+            logger.error(f"FFmpeg error processing {video_path}: {errors}")
+            return None
+
+        # Show size comparison
+        if output_path.exists():
+            new_size = os.path.getsize(output_path)
+            print(f"\nProcessed {video_path.name}: {humanize.naturalsize(new_size)}")
+            size_change = new_size - metadata['size']
+            sign = '+' if size_change >= 0 else ''
+            print(f"Size change: {sign}{humanize.naturalsize(size_change)}")
+            return output_path
+        else:
+            logger.error(f"Output file not created: {output_path}")
+            return None
+
+    except Exception as e:
+        logger.error(f"Error preparing video {video_path}: {str(e)}")
+        return None
+
 
 class VideoCombiner:
-    def __init__(self, input_dir: str, output_dir: str, log_dir: str = None):
+    def __init__(self, input_dir: str, output_dir: str, log_dir: str = None,
+                 max_concurrent_encodes: Optional[int] = None):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.log_dir = Path(log_dir) if log_dir else self.output_dir
         self._setup_logging()
         self._setup_directories()
+        self._h264_encoder = _detect_h264_encoder()
+        self.logger.info(f"Using H.264 encoder: {self._h264_encoder}")
+
+        # Hardware encoders cap concurrent sessions; CPU encodes are
+        # already bounded by the prep worker count
+        if max_concurrent_encodes is None:
+            max_concurrent_encodes = (NVENC_MAX_SESSIONS if 'nvenc' in self._h264_encoder
+                                      else os.cpu_count() or 1)
+        self.max_concurrent_encodes = max_concurrent_encodes
 
     def _setup_logging(self):
+        # Callers only enqueue records; a single listener thread does the
+        # actual file/console writes so encodes never block on log I/O
         log_file = self.log_dir / 'video_processing.log'
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.log_handlers = [
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+        for handler in self.log_handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        self.log_listener = QueueListener(log_queue, *self.log_handlers)
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+            format='%(message)s',
+            handlers=[QueueHandler(log_queue)]
         )
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)
         self.logger = logging.getLogger(__name__)
 
     def _setup_directories(self):
@@ -36,129 +550,70 @@ class VideoCombiner:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_video_metadata(self, video_path: Path) -> Optional[Dict]:
-        try:
-            # Get detailed metadata including bit depth
-            result = subprocess.run([
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                str(video_path)
-            ], capture_output=True, text=True)
-
-            if result.returncode != 0:
-                self.logger.error(f"Error getting metadata for {video_path}")
-                return None
+    def _get_video_metadata(self, video_path: Path, st: Optional[os.stat_result] = None) -> Optional[Dict]:
+        return _get_video_metadata(video_path, st)
 
-            metadata = json.loads(result.stdout)
-            video_stream = next((stream for stream in metadata.get('streams', [])
-                               if stream['codec_type'] == 'video'), None)
-
-            if not video_stream:
-                self.logger.error(f"No video stream found in {video_path}")
-                return None
-
-            # Extract bit depth and color space information
-            pix_fmt = video_stream.get('pix_fmt', '')
-            bit_depth = 8  # default
-            if 'p10' in pix_fmt:
-                bit_depth = 10
-            elif 'p12' in pix_fmt:
-                bit_depth = 12
-
-            return {
-                'path': str(video_path),
-                'creation_time': metadata.get('format', {}).get('tags', {}).get('creation_time', ''),
-                'duration': float(metadata.get('format', {}).get('duration', 0)),
-                'codec_name': video_stream.get('codec_name'),
-                'frame_rate': video_stream.get('r_frame_rate'),
-                'bit_depth': bit_depth,
-                'pix_fmt': pix_fmt,
-                'size': os.path.getsize(video_path)
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting metadata for {video_path}: {str(e)}")
-            return None
-
-    def _prepare_video(self, video_path: Path, position: int, total: int) -> Optional[Path]:
+    def _prepare_video(self, video_path: Path, position: int, total: int, work_dir: Path) -> Optional[Path]:
         """Prepare video for concatenation with enhanced 10-bit support."""
+        return _prepare_video_worker(video_path, position, total, work_dir, self._h264_encoder)
+
+    def _prepare_videos(self, video_files: List[Path], originals: List[Optional[Dict]],
+                        work_dir: Path) -> List[Dict]:
+        """Prepare every clip and return metadata for those that succeeded, in input order.
+
+        originals holds the source metadata already probed for each clip;
+        prepped files are written to work_dir.
+        """
+        # Prepare videos in parallel, FFMPEG_THREADS cores per encode
+        workers = _prep_worker_count(len(video_files))
+        prepared: List[Optional[Path]] = [None] * len(video_files)
+
+        # Workers log through a queue so records reach the parent's
+        # file/console handlers whole, whatever the start method
+        log_queue = multiprocessing.Queue()
+        encode_slots = multiprocessing.BoundedSemaphore(self.max_concurrent_encodes)
+        listener = QueueListener(log_queue, *self.log_handlers)
+        listener.start()
         try:
-            metadata = self._get_video_metadata(video_path)
-            if not metadata:
-                return None
-
-            # Create temporary directory if it doesn't exist
-            temp_dir = self.output_dir / 'temp'
-            temp_dir.mkdir(exist_ok=True)
-
-            output_path = temp_dir / f"prep_{video_path.name}"
-            
-            print(f"\nProcessing video {position}/{total}: {video_path.name}")
-            print(f"Original size: {humanize.naturalsize(metadata['size'])}")
-            
-            # Basic conversion that maintains quality while ensuring compatibility
-            process = subprocess.Popen([
-                'ffmpeg',
-                '-i', str(video_path),
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '17',
-                '-profile:v', 'high444',
-                '-pix_fmt', 'yuv420p',
-                '-c:a', 'copy',
-                '-y',
-                str(output_path)
-            ], stderr=subprocess.PIPE, universal_newlines=True)
-
-            # Progress tracking
-            start_time = time.time()
-            duration = metadata.get('duration', 0)
-            
-            while True:
-                line = process.stderr.readline()
-                if not line:
-                    break
-                    
-                # Parse FFmpeg progress
-                time_match = re.search(r'time=(\d+):(\d+):(\d+.\d+)', line)
-                if time_match:
-                    hours, minutes, seconds = map(float, time_match.groups())
-                    current_duration = hours * 3600 + minutes * 60 + seconds
-                    progress = min(100, (current_duration / float(duration)) * 100)
-                    
-                    # Calculate ETA
-                    elapsed = time.time() - start_time
-                    if progress > 0:
-                        eta = (elapsed / progress) * (100 - progress)
-                        eta_str = str(timedelta(seconds=int(eta)))
-                    else:
-                        eta_str = "Unknown"
-                        
-                    print(f"\rProgress: {progress:.1f}% | ETA: {eta_str}", end='')
-
-            if process.wait() != 0:
-                self.logger.error(f"FFmpeg error processing {video_path}")
-                return None
-
-            # Show size comparison
-            if output_path.exists():
-                new_size = os.path.getsize(output_path)
-                print(f"\nProcessed size: {humanize.naturalsize(new_size)}")
-                size_change = new_size - metadata['size']
-                sign = '+' if size_change >= 0 else ''
-                print(f"Size change: {sign}{humanize.naturalsize(size_change)}")
-                return output_path
-            else:
-                self.logger.error(f"Output file not created: {output_path}")
-                return None
-
-        except Exception as e:
-            self.logger.error(f"Error preparing video {video_path}: {str(e)}")
-            return None
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_prep_worker,
+                                     initargs=(log_queue, encode_slots)) as executor:
+                futures = {
+                    executor.submit(_prepare_video_worker, video_path, idx, len(video_files),
+                                    work_dir, self._h264_encoder, workers == 1,
+                                    originals[idx - 1]): idx
+                    for idx, video_path in enumerate(video_files, 1)
+                }
+                # Clips start in submission order; keep the next queued one
+                # prefetched, advancing each time a running clip finishes
+                upcoming = iter(video_files[workers:])
+                _prefetch(next(upcoming, None))
+                for future in as_completed(futures):
+                    prepared[futures[future] - 1] = future.result()
+                    _prefetch(next(upcoming, None))
+        finally:
+            listener.stop()
+
+        # Prep keeps the duration, so reuse the source metadata in input
+        # order rather than probing every output again
+        processed_videos = []
+        for processed_path, source in zip(prepared, originals):
+            if processed_path:
+                source = source or self._get_video_metadata(processed_path)
+                if source:
+                    processed_videos.append({
+                        **source,
+                        'path': str(processed_path),
+                        'size': os.path.getsize(processed_path),
+                        'codec_name': 'h264',
+                        'pix_fmt': 'yuv420p',
+                        'bit_depth': 8,
+                    })
+        return processed_videos
 
     def combine_videos(self, output_filename: str = None) -> Optional[str]:
+        # Intermediates go in a fresh directory owned by this run, so cleanup
+        # never touches anything that was already in output_dir
+        work_dir = Path(tempfile.mkdtemp(prefix='.combine-', dir=self.output_dir))
         try:
             if output_filename is None:
                 date_match = re.search(r'(\d{4})/([^/]+)/(\d+)[^\d/]*$', str(self.input_dir))
@@ -171,77 +626,92 @@ class VideoCombiner:
             if not output_filename.endswith('.mp4'):
                 output_filename += '.mp4'
 
-            video_files = sorted(list(self.input_dir.glob('video-*.mp4')))
+            # One scandir pass finds the clips; each entry's stat is reused
+            # for the metadata cache key instead of stat-ing every file again
+            with os.scandir(self.input_dir) as it:
+                entries = sorted(
+                    (entry for entry in it
+                     if entry.name.startswith('video-') and entry.name.endswith('.mp4')
+                     and entry.is_file()),
+                    key=lambda entry: _natkey(entry.name)
+                )
+            video_files = [Path(entry.path) for entry in entries]
             if not video_files:
                 raise ValueError(f"No video files found in {self.input_dir}")
 
             print(f"\nFound {len(video_files)} videos to process")
             
-            # Process videos and get metadata
-            processed_videos = []
-            total_size = 0
-            
-            for idx, video_path in enumerate(video_files, 1):
-                processed_path = self._prepare_video(video_path, idx, len(video_files))
-                if processed_path:
-                    metadata = self._get_video_metadata(processed_path)
-                    if metadata:
-                        processed_videos.append(metadata)
-                        total_size += metadata['size']
+            # Homogeneous H.264 inputs go straight to the concat step.
+            # Otherwise, when only one encode would run at a time anyway and
+            # the clips have audio and share size, rate and audio format,
+            # encode and join in a single pass with no prepped intermediates.
+            with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(entries))) as executor:
+                originals = list(executor.map(
+                    lambda entry: self._get_video_metadata(Path(entry.path), entry.stat()), entries
+                ))
+            single_pass = prepped = False
+            if _all_concat_ready(originals):
+                print("Inputs already share one H.264 format; skipping prep")
+                processed_videos = originals
+            elif _single_pass_ready(originals) and _prep_worker_count(len(video_files)) == 1:
+                print("Encoding all videos in a single pass")
+                processed_videos = originals
+                single_pass = True
+            else:
+                processed_videos = self._prepare_videos(video_files, originals, work_dir)
+                prepped = True
+            total_size = sum(video['size'] for video in processed_videos)
 
             if not processed_videos:
                 raise ValueError("No valid videos to combine")
 
-            # Create file list for FFmpeg
-            file_list_path = self.output_dir / 'temp_files.txt'
-            with open(file_list_path, 'w', encoding='utf-8') as f:
-                for video in processed_videos:
-                    escaped_path = video['path'].replace("'", "'\\''")
-                    f.write(f"file '{escaped_path}'\n")
-
             output_path = self.output_dir / output_filename
+            file_list_path = work_dir / 'temp_files.txt'
             print(f"\nCombining {len(processed_videos)} videos into {output_filename}")
             print(f"Total input size: {humanize.naturalsize(total_size)}")
 
-            # Combine videos with simpler settings
-            process = subprocess.Popen([
-                'ffmpeg',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', str(file_list_path),
-                '-c', 'copy',  # Just copy streams without re-encoding
-                '-y',
-                str(output_path)
-            ], stderr=subprocess.PIPE, universal_newlines=True)
+            if single_pass:
+                command = _single_pass_command(processed_videos, self._h264_encoder, output_path,
+                                               file_list_path)
+            elif prepped:
+                # Prepped clips are MPEG-TS, which the concat protocol joins
+                # as a plain byte stream with no per-file demuxing
+                concat_url = 'concat:' + '|'.join(video['path'] for video in processed_videos)
+                command = ['ffmpeg', '-i', concat_url, '-c:v', 'copy']
+                # Prep copies each clip's audio as-is, so it can only be
+                # copied again when every clip shares one audio format;
+                # ADTS AAC from the TS then needs converting for mp4
+                audio_formats = {(video.get('audio_codec'), video.get('audio_sample_rate'))
+                                 for video in processed_videos}
+                if len(audio_formats) > 1:
+                    command += ['-c:a', 'aac', '-b:a', '192k']
+                else:
+                    command += ['-c:a', 'copy']
+                    (audio_codec, _), = audio_formats
+                    if audio_codec == 'aac':
+                        command += ['-bsf:a', 'aac_adtstoasc']
+                command += ['-movflags', '+faststart', '-y', str(output_path)]
+            else:
+                # Create file list for FFmpeg
+                _write_concat_list(processed_videos, file_list_path)
+
+                # Combine videos with simpler settings
+                command = [
+                    'ffmpeg',
+                    '-f', 'concat',
+                    '-safe', '0',
+                    '-i', str(file_list_path),
+                    '-c', 'copy',  # Just copy streams without re-encoding
+                    '-y',
+                    str(output_path)
+                ]
 
             # Calculate total duration for progress tracking
             total_duration = sum(float(v.get('duration', 0)) for v in processed_videos)
-            start_time = time.time()
-
-            while True:
-                line = process.stderr.readline()
-                if not line:
-                    break
-                    
-                # Parse FFmpeg progress
-                time_match = re.search(r'time=(\d+):(\d+):(\d+.\d+)', line)
-                if time_match:
-                    hours, minutes, seconds = map(float, time_match.groups())
-                    current_duration = hours * 3600 + minutes * 60 + seconds
-                    progress = min(100, (current_duration / float(total_duration)) * 100)
-                    
-                    # Calculate ETA
-                    elapsed = time.time() - start_time
-                    if progress > 0:
-                        eta = (elapsed / progress) * (100 - progress)
-                        eta_str = str(timedelta(seconds=int(eta)))
-                    else:
-                        eta_str = "Unknown"
-                        
-                    print(f"\rCombining: {progress:.1f}% | ETA: {eta_str}", end='')
-
-            if process.wait() != 0:
-                self.logger.error(f"Error combining videos")
+
+            returncode, errors = _run_ffmpeg(command, total_duration, 'Combining')
+            if returncode != 0:
+                self.logger.error(f"Error combining videos: {errors}")
                 return None
 
             # Show final size comparison
@@ -250,21 +720,16 @@ class VideoCombiner:
             print(f"Size change from total inputs: {humanize.naturalsize(final_size - total_size, signed=True)}")
 
             self.logger.info(f"Successfully combined videos to {output_path}")
-
-            # Clean up
-            file_list_path.unlink()
-            temp_dir = self.output_dir / 'temp'
-            if temp_dir.exists():
-                for file in temp_dir.glob('*'):
-                    file.unlink()
-                temp_dir.rmdir()
-
             return str(output_path)
 
         except Exception as e:
             self.logger.error(f"Error combining videos: {str(e)}")
             return None
 
+        finally:
+            # Clean up intermediates whether or not the combine succeeded
+            shutil.rmtree(work_dir, ignore_errors=True)
+
 
 def main():
     input_dir = "/Volumes/External/2025/May/26th"